@@ -0,0 +1,88 @@
+# benchmark_startup.py
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules the app pulls in, timed individually in a fresh interpreter each
+IMPORTS = ('numpy', 'cv2', 'PIL.ImageTk', 'tkinter', 'torch', 'ultralytics')
+
+# Runs in a child process so every measurement starts from a cold interpreter
+LOAD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import numpy as np
+from config.settings import Settings
+from detection_common.backends import load_backend
+imported = time.perf_counter()
+backend = load_backend(Settings.MODEL_PATH, sys.argv[1], Settings.MODEL_IMAGE_SIZE,
+                       Settings.PARITY_SAMPLE_IMAGE, Settings.PARITY_BOX_TOLERANCE,
+                       Settings.PARITY_CONF_TOLERANCE, sys.argv[2])
+loaded = time.perf_counter()
+frame = np.zeros((Settings.MODEL_IMAGE_SIZE, Settings.MODEL_IMAGE_SIZE, 3), dtype=np.uint8)
+runs = []
+for _ in range(int(sys.argv[3]) + 1):
+    t = time.perf_counter()
+    backend.predict(frame, imgsz=Settings.MODEL_IMAGE_SIZE, verbose=False)
+    runs.append(time.perf_counter() - t)
+print(json.dumps({'import_s': imported - start, 'load_s': loaded - imported,
+                  'first_predict_s': runs[0], 'warm_predict_s': runs[-1],
+                  'total_s': time.perf_counter() - start}))
+"""
+
+def time_import(module):
+    """Seconds a fresh interpreter spends importing one module (None if it is not installed)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return float(proc.stdout) if proc.returncode == 0 else None
+
+def time_load(backend, cache_dir, warmup_runs):
+    """Import, load, first and post-warm-up predict timings from a child process"""
+    proc = subprocess.run([sys.executable, "-c", LOAD_SCRIPT, backend, cache_dir, str(warmup_runs)],
+                          capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "load failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from config.settings import Settings
+
+    parser = argparse.ArgumentParser(description="Measure cold-start cost: imports, model load and warm-up")
+    parser.add_argument("--backend", default=Settings.INFERENCE_BACKEND, help="Inference backend to load")
+    parser.add_argument("--warmup-runs", type=int, default=Settings.WARMUP_RUNS,
+                        help="Dummy inferences before the timed warm predict")
+    parser.add_argument("--output", default=os.path.join(Settings.BASE_DIR, "startup_benchmark.jsonl"),
+                        help="Results are appended here as one JSON line per run")
+    args = parser.parse_args()
+
+    print(f"{'import':<14}{'seconds':>10}")
+    imports = {}
+    for module in IMPORTS:
+        imports[module] = time_import(module)
+        shown = "not installed" if imports[module] is None else f"{imports[module]:.3f}"
+        print(f"{module:<14}{shown:>10}")
+
+    runs = {}
+    with tempfile.TemporaryDirectory() as empty_cache:
+        # An empty cache forces the export (cold); the second run reuses the configured cache (warm)
+        for label, cache_dir in (('cold_cache', empty_cache), ('warm_cache', Settings.MODEL_CACHE_DIR)):
+            if label == 'warm_cache':
+                time_load(args.backend, cache_dir, 0)  # make sure the configured cache is populated
+            runs[label] = time_load(args.backend, cache_dir, args.warmup_runs)
+
+    print(f"\n{'run':<12}{'import':>9}{'load':>9}{'1st pred':>10}{'warm pred':>11}{'total':>9}")
+    for label, run in runs.items():
+        print(f"{label:<12}{run['import_s']:>9.2f}{run['load_s']:>9.2f}{run['first_predict_s']:>10.3f}"
+              f"{run['warm_predict_s']:>11.3f}{run['total_s']:>9.2f}")
+
+    record = {'timestamp': time.time(), 'backend': args.backend, 'imports_s': imports, **runs}
+    with open(args.output, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"\nAppended results to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmark_transport.py
+import argparse
+import multiprocessing
+import threading
+import time
+import numpy as np
+from utils.shared_frames import SharedFrameRing
+
+def busy(ms):
+    """Pure-Python work holding the GIL, standing in for the Python side of inference"""
+    end = time.perf_counter() + ms / 1000
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+def echo_worker(conn, ring_name, slots, slot_bytes):
+    """Reads each frame (from the ring or the pipe), optionally burns CPU, replies with a small tuple"""
+    ring = SharedFrameRing(slots, slot_bytes, ring_name)
+    while True:
+        message = conn.recv()
+        if message[0] == 'stop':
+            break
+        if message[0] == 'ring':
+            frame = ring.view(*message[1])
+        else:
+            frame = message[1]
+        checksum = int(frame[::64, ::64].sum())  # touch the frame so a lazy mapping is paid for
+        busy(message[2])
+        del frame
+        conn.send(('ok', checksum))
+    ring.close()
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def run_transport(mode, frames, busy_ms, slots):
+    """Per-frame round-trip seconds through a worker process, frames sent by `mode`"""
+    context = multiprocessing.get_context('spawn')
+    ring = SharedFrameRing(slots, frames[0].nbytes)
+    conn, child_conn = context.Pipe()
+    worker = context.Process(target=echo_worker, args=(child_conn, ring.name, slots, ring.slot_bytes),
+                             daemon=True)
+    worker.start()
+    child_conn.close()
+    times = []
+    try:
+        for frame in frames:
+            start = time.perf_counter()
+            if mode == 'ring':
+                conn.send(('ring', ring.write(ring.next_slot(), frame), busy_ms))
+            else:
+                conn.send(('pipe', frame, busy_ms))
+            conn.recv()
+            times.append(time.perf_counter() - start)
+        conn.send(('stop',))
+        worker.join()
+    finally:
+        ring.close()
+    return times
+
+def tick_lateness(work, seconds, interval=0.01):
+    """How late a 10 ms timer loop on this thread fires while `work` runs elsewhere (like Tk's after())"""
+    stop = threading.Event()
+    thread = threading.Thread(target=work, args=(stop,), daemon=True)
+    thread.start()
+    lateness = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        target = time.perf_counter() + interval
+        time.sleep(interval)
+        lateness.append(time.perf_counter() - target)
+    stop.set()
+    thread.join()
+    return lateness
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the cost of the inference process hop and its effect on UI-thread latency")
+    parser.add_argument("--width", type=int, default=1280, help="Synthetic frame width")
+    parser.add_argument("--height", type=int, default=720, help="Synthetic frame height")
+    parser.add_argument("--frames", type=int, default=500, help="Frames sent per transport")
+    parser.add_argument("--slots", type=int, default=8, help="Ring buffer slots")
+    parser.add_argument("--busy-ms", type=float, default=30.0,
+                        help="Simulated Python inference work per frame for the responsiveness test")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each responsiveness run")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pool = [rng.integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8) for _ in range(args.slots)]
+    frames = [pool[i % len(pool)] for i in range(args.frames)]
+
+    print(f"Transport of {args.width}x{args.height} frames ({frames[0].nbytes / 1e6:.1f} MB), no inference")
+    print(f"{'transport':<22}{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for mode, label in (('ring', 'shared-memory ring'), ('pipe', 'pickled over pipe')):
+        run_transport(mode, frames[:20], 0, args.slots)  # warm-up: process start, page faults
+        times = run_transport(mode, frames, 0, args.slots)
+        print(f"{label:<22}{1000 * sum(times) / len(times):>9.3f}{1000 * percentile(times, 0.5):>9.3f}"
+              f"{1000 * percentile(times, 0.95):>9.3f}")
+
+    def in_thread(stop):
+        while not stop.is_set():
+            busy(args.busy_ms)
+
+    def in_process(stop):
+        context = multiprocessing.get_context('spawn')
+        ring = SharedFrameRing(args.slots, frames[0].nbytes)
+        conn, child_conn = context.Pipe()
+        worker = context.Process(target=echo_worker, args=(child_conn, ring.name, args.slots, ring.slot_bytes),
+                                 daemon=True)
+        worker.start()
+        child_conn.close()
+        i = 0
+        while not stop.is_set():
+            conn.send(('ring', ring.write(ring.next_slot(), frames[i % len(frames)]), args.busy_ms))
+            conn.recv()
+            i += 1
+        conn.send(('stop',))
+        worker.join()
+        ring.close()
+
+    print(f"\nTimer-loop lateness with {args.busy_ms:.0f} ms of Python work per frame running continuously")
+    print(f"{'inference in':<22}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for label, work in (('idle', lambda stop: stop.wait()), ('thread', in_thread), ('worker process', in_process)):
+        lateness = tick_lateness(work, args.seconds)
+        print(f"{label:<22}{1000 * percentile(lateness, 0.5):>9.2f}{1000 * percentile(lateness, 0.95):>9.2f}"
+              f"{1000 * max(lateness):>9.2f}")
+
+if __name__ == "__main__":
+    main()
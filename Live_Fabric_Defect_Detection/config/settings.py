@@ -13,6 +13,52 @@ class Settings:
         'Printed Circuit Board PCB', 'Remote control', 'Router',
         'Smart Phone', 'USB Flash Drive', 'cable', 'computer mouse', 'internal HDD'
     ]
+    MODEL_IMAGE_SIZE = 640  # inference input size, also used when exporting
+
+    # Inference profiles: input size, detection cap and half precision (used on GPU only)
+    INFERENCE_PROFILES = {
+        'fast': {'imgsz': 320, 'max_det': 50, 'half': True},
+        'balanced': {'imgsz': 480, 'max_det': 100, 'half': True},
+        'accurate': {'imgsz': 640, 'max_det': 300, 'half': True},
+    }
+    INFERENCE_PROFILE = 'accurate'  # starting profile
+    # Adaptive resolution: step profiles down when inference cannot hold the target
+    # rate and back up when there is headroom (the ratio gap is the hysteresis band)
+    ADAPTIVE_RESOLUTION = False
+    ADAPTIVE_TARGET_FPS = 15
+    ADAPTIVE_DOWN_RATIO = 1.0  # step down when mean latency exceeds this fraction of 1/target FPS
+    ADAPTIVE_UP_RATIO = 0.6  # step up when it falls below this fraction
+    ADAPTIVE_WINDOW = 30  # frames averaged per decision
+    ADAPTIVE_COOLDOWN = 60  # frames after a change before the next one
+
+    # Process-isolated inference: run the detector in a worker process so the Python side of
+    # inference does not compete with capture and Tk for the GIL. Frames travel through a
+    # shared-memory ring; only box arrays come back over a pipe.
+    INFERENCE_PROCESS = False
+    INFERENCE_PROCESS_SLOTS = 8  # frames the ring holds, also the largest batch per round trip
+    INFERENCE_PROCESS_SLOT_BYTES = 1920 * 1080 * 3  # initial slot size, grown for larger frames
+    INFERENCE_PROCESS_THREADS = None  # torch/BLAS threads in the worker (None leaves the default)
+    INFERENCE_PROCESS_TIMEOUT = 10.0  # seconds without a result before the worker is stopped
+
+    # Post-processing applied to every prediction
+    DEFAULT_CONF_THRESHOLD = 0.25  # minimum confidence for classes without their own threshold
+    CLASS_CONF_THRESHOLDS = {}  # e.g. {'cable': 0.5} for classes that need more certainty
+    CLASS_ALLOW_LIST = None  # class names to report (None reports all)
+
+    # Inference backend: 'pytorch', 'torchscript', 'onnx' (ONNX Runtime) or 'openvino'.
+    # Non-pytorch backends are exported from MODEL_PATH once and cached by weights hash in MODEL_CACHE_DIR.
+    INFERENCE_BACKEND = 'pytorch'
+    PARITY_SAMPLE_IMAGE = None  # image with objects checked against pytorch on first use (None: export stays unverified)
+    PARITY_BOX_TOLERANCE = 2.0  # max box coordinate difference in pixels
+    PARITY_CONF_TOLERANCE = 0.02  # max confidence difference
+
+    # Model hot-swap: new weights appearing under MODEL_WATCH_DIR are loaded in the
+    # background and swapped in between frames; a slow or broken model is rolled back
+    MODEL_WATCH_DIR = None  # e.g. the training runs/detect folder; None disables watching
+    MODEL_WATCH_FILENAME = "best.pt"
+    MODEL_WATCH_INTERVAL = 5.0  # seconds between scans; files must be unchanged for one scan
+    HOT_SWAP_MAX_SLOWDOWN = 1.5  # reject or roll back a model this many times slower than the current one
+    HOT_SWAP_PROBATION_FRAMES = 100  # live frames over which a new model's latency is checked
 
     # Camera settings
     CAMERA_SOURCES = {
@@ -21,7 +67,40 @@ class Settings:
     }
 
     DEFAULT_CAMERA = 'LAPTOP'  # Set default camera source
+
+    # Multi-source mode (main.py --multi): station cameras share one batched detector.
+    # Add station URLs to CAMERA_SOURCES and list their keys here.
+    STATION_SOURCES = ['LAPTOP', 'IP_CAMERA']
+    MULTI_MAX_BATCH = 8  # most frames (one per source) in a single predict call
+    MULTI_MAX_FRAME_AGE = 1.0  # seconds after which a waiting frame is too stale to infer
+    MULTI_IDLE_WAIT = 0.005  # seconds to sleep when no source has a new frame
+    MULTI_FEED_WIDTH = 320
+    MULTI_FEED_HEIGHT = 240
     FRAME_RATE = 10  # milliseconds between frame updates
+    DISPLAY_MAX_FPS = 30  # camera feed redraws per second, independent of capture and inference rates
+    CAMERA_BACKGROUND_GRAB = True  # drain the source on a thread so reads always get the newest frame
+    CAMERA_READ_TIMEOUT = 2.0  # seconds to wait for a new frame before reporting a capture failure
+    CAMERA_FPS_SMOOTHING = 0.1  # weight of the newest sample in the source FPS moving average
+
+    # Pipeline settings
+    CAPTURE_RETRY_DELAY = 0.5  # seconds to wait before re-reading after a capture error
+    PIPELINE_POLL_TIMEOUT = 0.1  # seconds a worker waits for a frame before re-checking for shutdown
+    STATS_PRINT_INTERVAL = 10  # seconds between pipeline stats lines on the console (0 disables)
+
+    # Motion gate: skip inference and reuse the last result while the scene is static
+    MOTION_GATE_ENABLED = True
+    MOTION_THRESHOLD = 4.0  # mean absolute grayscale difference (0-255) that counts as a change
+    MOTION_DOWNSCALE_WIDTH = 64  # width of the thumbnail frames are compared at
+    MOTION_FORCE_REFRESH_FRAMES = 30  # run inference at least every this many frames
+
+    # Tracker: run YOLO every N frames and carry boxes/track IDs in between
+    TRACKER_ENABLED = True
+    DETECT_EVERY_N_FRAMES = 3
+    TRACKER_IOU_THRESHOLD = 0.3  # minimum IoU for a detection to continue a track
+    TRACKER_HIGH_CONF = 0.5  # detections at or above this can start new tracks
+    TRACKER_LOW_CONF = 0.1  # weaker detections only keep existing tracks alive
+    TRACKER_MIN_HITS = 2  # detections needed before a track counts (and is saved)
+    TRACKER_MAX_AGE = 10  # detector runs a track survives without a matching detection
 
     # UI settings
     CAMERA_WINDOW_SIZE = "650x500"
@@ -33,3 +112,35 @@ class Settings:
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     DETECTED_OBJECTS_DIR = os.path.join(BASE_DIR, "detected_objects")
     os.makedirs(DETECTED_OBJECTS_DIR, exist_ok=True)
+    MODEL_CACHE_DIR = os.path.join(BASE_DIR, "model_cache")  # exported models, keyed by weights hash
+    WARMUP_RUNS = 2  # dummy inferences run after loading, before the first real frame
+    SAVE_QUEUE_SIZE = 32  # frames waiting for the background writer before new saves are dropped
+    # 'frame': full frame per detected class, 'crops': only the padded boxes,
+    # 'frame_links': the full frame once, hardlinked under every other detected class
+    SAVE_MODE = 'frame'
+    SAVE_CROP_PADDING = 0.1  # fraction of the box width/height added around each crop
+    SAVE_JPEG_QUALITY = 90
+    SAVE_ENCODE_WORKERS = 2  # threads encoding and writing JPEGs in parallel
+
+    # Detection store: rate limiting, deduplication and quota for DETECTED_OBJECTS_DIR
+    STORE_INDEX_PATH = os.path.join(DETECTED_OBJECTS_DIR, "index.sqlite")
+    STORE_CLASS_COOLDOWN = 2.0  # minimum seconds between two saved frames of the same class
+    STORE_DEDUP_MAX_DISTANCE = 6  # dHash bits (of 64) within which frames count as duplicates
+    STORE_DEDUP_HISTORY = 8  # recent hashes per class checked for duplicates
+    STORE_MAX_BYTES = 2 * 1024 ** 3  # oldest frames are removed beyond this size (None for no limit)
+    STORE_MAX_AGE = 7 * 24 * 3600  # seconds a frame is kept (None keeps forever)
+    STORE_JANITOR_INTERVAL = 60  # seconds between quota enforcement passes
+
+    # Detection event log: one row per detected box, written in batched transactions
+    EVENT_LOG_PATH = os.path.join(BASE_DIR, "detections.sqlite")  # None disables the log
+    EVENT_LOG_BATCH_SIZE = 500  # rows per insert transaction
+    EVENT_LOG_FLUSH_INTERVAL = 1.0  # seconds a row may wait before it is committed
+    EVENT_LOG_MAX_QUEUE = 10000  # frames waiting for the writer before new ones are dropped
+
+    # Metrics: rolling stage latencies and FPS counters, exported as Prometheus text and JSON
+    METRICS_ENABLED = True
+    METRICS_HTTP_PORT = 9108  # serves /metrics and /metrics.json on localhost (None disables)
+    METRICS_JSON_PATH = os.path.join(BASE_DIR, "metrics.json")  # None disables the snapshot file
+    METRICS_SNAPSHOT_INTERVAL = 5  # seconds between JSON snapshot rewrites
+    SHOW_METRICS_OVERLAY = False  # draw FPS/latency over the camera feed
+    OVERLAY_REFRESH_INTERVAL = 0.5  # seconds between overlay text updates
@@ -1,27 +1,137 @@
 # main.py
+import time
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import threading
 import tkinter as tk
-import cv2
-from PIL import Image, ImageTk
-from models.yolo_model import LiveEWasteDetector
-from utils.camera import Camera
-from utils.image_processing import ImageProcessor
 from ui.camera_window import CameraWindow
 from ui.classification_window import ClassificationWindow
+from ui.multi_camera_window import MultiCameraWindow
 from config.settings import Settings
+from utils.metrics import registry
+from detection_common.event_log import DetectionEventLog
+
+def open_event_log():
+    """Detection event log configured in Settings, or None if disabled"""
+    if not Settings.EVENT_LOG_PATH:
+        return None
+    return DetectionEventLog(Settings.EVENT_LOG_PATH, Settings.EVENT_LOG_BATCH_SIZE,
+                             Settings.EVENT_LOG_FLUSH_INTERVAL, Settings.EVENT_LOG_MAX_QUEUE)
+
+def start_metrics_export():
+    """Start the Prometheus endpoint and JSON snapshot writer configured in Settings"""
+    registry.enabled = Settings.METRICS_ENABLED
+    if not Settings.METRICS_ENABLED:
+        return
+    if Settings.METRICS_HTTP_PORT:
+        try:
+            registry.start_http_server(Settings.METRICS_HTTP_PORT)
+        except OSError as e:
+            print(f"Error starting metrics endpoint: {e}")
+    if Settings.METRICS_JSON_PATH:
+        registry.start_snapshot_writer(Settings.METRICS_JSON_PATH, Settings.METRICS_SNAPSHOT_INTERVAL)
+
+def make_detector(in_process=None):
+    """Detector for the apps: in this process, or in a worker process per Settings.INFERENCE_PROCESS"""
+    in_process = Settings.INFERENCE_PROCESS if in_process is None else in_process
+    if in_process:
+        from models.process_detector import ProcessDetector
+        return ProcessDetector()
+    from models.yolo_model import LiveEWasteDetector
+    return LiveEWasteDetector()
 
 class LiveEWasteDetectionApp:
-    def __init__(self, camera_source=None):
-        self.detector = LiveEWasteDetector()
-        self.camera = Camera(camera_source)
+    def __init__(self, camera_source=None, inference_process=None):
+        self.camera_source = camera_source
         self.camera_window = CameraWindow()
         self.classification_window = ClassificationWindow(self.camera_window.window)
-        self.image_processor = ImageProcessor()
-        
-        # Commented out because method is not defined
-        # self._setup_window_handlers()
-        
+        self.event_log = open_event_log()
+
+        # Model, image store and camera are brought up in the background once the window exists
+        self.inference_process = inference_process
+        self.detector = None
+        self.image_processor = None
+        self.camera = None
+        self.pipeline = None
+        self._camera_error = None
+        self._closing = False
+        self._startup_marks = {}
+
+        self._last_stats_time = time.time()
+        self._last_overlay_time = 0.0
+        self._last_render_time = 0.0
+
+        self._setup_window_handlers()
         self._setup_camera_controls()
 
+    def _setup_window_handlers(self):
+        """Stop the pipeline threads and release the camera when the window closes"""
+        self.camera_window.window.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _start_background(self):
+        """Load the model and open the camera in parallel, off the Tk thread"""
+        def open_camera():
+            # Imported here, not at the top of main.py: numpy, cv2 and PIL take a few hundred
+            # milliseconds to import, and the window should not wait for them
+            self.detector = make_detector(self.inference_process)
+            self.detector.start_loading()
+            from utils.camera import Camera
+            from utils.image_processing import ImageProcessor
+            from utils.pipeline import DetectionPipeline
+            self.image_processor = ImageProcessor()
+            try:
+                camera = Camera(self.camera_source)
+            except RuntimeError as e:
+                self._camera_error = e
+                print(f"Error opening camera: {e}")
+                return
+            pipeline = DetectionPipeline(camera, self.detector, self.image_processor, self.event_log)
+            if self._closing:
+                camera.release()
+                return
+            pipeline.start()
+            self.camera, self.pipeline = camera, pipeline
+
+        threading.Thread(target=open_camera, name="camera-open", daemon=True).start()
+
+    def _mark_startup(self, name):
+        """Record (once) how long after process start a startup milestone was reached"""
+        if name not in self._startup_marks:
+            elapsed = time.perf_counter() - _PROCESS_START
+            self._startup_marks[name] = elapsed
+            registry.set_gauge(f"startup_{name}_seconds", elapsed)
+            print(f"Startup: {name.replace('_', ' ')} after {elapsed:.2f}s")
+
+    def _update_status(self):
+        """Show loading progress in the window title until the model is ready"""
+        if self.detector is not None and self.detector.load_error is not None:
+            status = "model failed to load"
+        elif self._camera_error is not None:
+            status = "camera failed to open"
+        elif self.pipeline is None:
+            status = "opening camera..."
+        elif not self.detector.ready.is_set():
+            status = "loading model..."
+        else:
+            self._mark_startup('model_ready')
+            status = None
+        self.camera_window.set_status(status)
+
+    def _on_close(self):
+        self._closing = True
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.detector is not None:
+            self.detector.close()
+        if self.camera is not None:
+            self.camera.release()
+        if self.image_processor is not None:
+            self.image_processor.close()
+        if self.event_log is not None:
+            self.event_log.close()
+        self.camera_window.window.destroy()
+
     def _setup_camera_controls(self):
         """Add camera control buttons to the camera window"""
         control_frame = tk.Frame(self.camera_window.window)
@@ -41,6 +151,9 @@ class LiveEWasteDetectionApp:
 
     def _switch_camera(self, source):
         """Switch between camera sources"""
+        if self.camera is None:
+            print("Camera is still starting up")
+            return
         try:
             self.camera.switch_camera(source)
             print(f"Switched to {source}")
@@ -48,38 +161,192 @@ class LiveEWasteDetectionApp:
             print(f"Error switching camera: {e}")
 
     def _update_frame(self):
-        """Capture frame, make predictions, and update the UI"""
-        try:
-            frame = self.camera.read_frame()
-            detections = self.detector.predict(frame)
-            detected_classes = self.detector.get_detected_classes(detections)
-
-            # Update camera feed in UI
-            self.camera_window.update_camera_feed(frame)
-
-            # Update detected objects in classification window
-            for class_name in Settings.CLASS_NAMES:
-                if class_name in detected_classes:
-                    img_path = self.image_processor.save_detected_object(frame, class_name)
-                    display_img = self.image_processor.create_display_image(img_path)
-                    self.classification_window.update_detection(class_name, display_img, detected=True)
-                else:
-                    self.classification_window.update_detection(class_name, detected=False)
-        except RuntimeError as e:
-            print(f"Error capturing frame: {e}")
-            # Optionally, stop the loop if capturing fails
+        """Render the newest captured frame and detection result, if any"""
+        self._mark_startup('window_shown')
+        self._update_status()
+        if self.pipeline is None:
+            self.camera_window.window.after(Settings.FRAME_RATE, self._update_frame)
             return
 
-        # Schedule the next frame update
+        # Capped separately from the tick rate; a skipped frame just stays queued as the newest
+        now = time.time()
+        packet = None
+        if now - self._last_render_time >= 1.0 / Settings.DISPLAY_MAX_FPS:
+            packet = self.pipeline.latest_frame()
+        if packet is not None:
+            self._last_render_time = now
+            self._mark_startup('first_frame')
+            with registry.time('render_feed'):
+                self.camera_window.update_camera_feed(packet.frame)
+            registry.tick('render')
+
+        result = self.pipeline.latest_result()
+        if result is not None:
+            self._mark_startup('first_result')
+            with registry.time('render_classes'):
+                self._render_result(result)
+            registry.observe('end_to_end', time.time() - result.timestamp)
+
+        self._print_stats()
+        self._update_overlay()
+
+        # Schedule the next render tick; capture and inference run on their own threads
         self.camera_window.window.after(Settings.FRAME_RATE, self._update_frame)
 
+    def _render_result(self, result):
+        """Push one detection result to the classification window"""
+        updated = self.classification_window.apply_frame(
+            result.thumbnails, self.image_processor.create_display_image)
+        registry.set_gauge('classification_updates', updated)
+
+    def _print_stats(self):
+        """Periodically log capture rate, dropped frames and how often inference was skipped"""
+        if self.pipeline is None:
+            return
+        now = time.time()
+        if not Settings.STATS_PRINT_INTERVAL or now - self._last_stats_time < Settings.STATS_PRINT_INTERVAL:
+            return
+        self._last_stats_time = now
+        stats = self.pipeline.stats()
+        for name in ('source_fps', 'dropped_frames', 'inference_dropped', 'motion_skip_ratio'):
+            registry.set_gauge(name, stats[name])
+        registry.set_gauge('saves_dropped', self.image_processor.writer.dropped)
+        registry.set_gauge('saves_skipped_cooldown', self.image_processor.store.skipped_cooldown)
+        registry.set_gauge('saves_skipped_duplicate', self.image_processor.store.skipped_duplicate)
+        registry.set_gauge('store_bytes', self.image_processor.store.total_bytes)
+        print(f"Source {stats['source_fps']:.1f} FPS, "
+              f"{stats['dropped_frames']} camera frames dropped, "
+              f"{stats['inference_dropped']} frames never reached inference, "
+              f"motion gate skipped {stats['motion_skip_ratio']:.0%} of inferences")
+
+    def _update_overlay(self):
+        """Refresh the on-screen FPS/latency overlay a few times per second"""
+        now = time.time()
+        if not Settings.SHOW_METRICS_OVERLAY or now - self._last_overlay_time < Settings.OVERLAY_REFRESH_INTERVAL:
+            return
+        self._last_overlay_time = now
+        predict = registry.stage_quantiles('predict')
+        end_to_end = registry.stage_quantiles('end_to_end')
+        self.camera_window.update_overlay(
+            f"capture {registry.fps('capture'):5.1f} FPS\n"
+            f"infer   {registry.fps('inference'):5.1f} FPS  p50 {predict[0.5] * 1000:4.0f} ms  p95 {predict[0.95] * 1000:4.0f} ms\n"
+            f"render  {registry.fps('render'):5.1f} FPS\n"
+            f"e2e p50 {end_to_end[0.5] * 1000:4.0f} ms  p95 {end_to_end[0.95] * 1000:4.0f} ms")
+
     def run(self):
-        """Start the application with continuous frame updates"""
+        """Start the Tk render loop; model and camera come up in the background"""
+        start_metrics_export()
+        self._start_background()
         self._update_frame()
         self.camera_window.window.mainloop()
 
+class MultiSourceDetectionApp:
+    """Runs several station cameras through one batched detector"""
+
+    def __init__(self, sources, inference_process=None):
+        self.sources = sources
+        self.window = MultiCameraWindow(sources)
+        self.event_log = open_event_log()
+
+        # Model, image store and cameras are brought up in the background once the window exists
+        self.inference_process = inference_process
+        self.detector = None
+        self.image_processor = None
+        self.scheduler = None
+        self._camera_error = None
+        self._closing = False
+        self.window.window.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _start_background(self):
+        """Load the model and open the cameras in parallel, off the Tk thread"""
+        def open_cameras():
+            # Imported here so the window does not wait for numpy, cv2 and PIL, as in LiveEWasteDetectionApp
+            self.detector = make_detector(self.inference_process)
+            self.detector.start_loading()
+            from utils.image_processing import ImageProcessor
+            from utils.multi_source import MultiSourceScheduler
+            self.image_processor = ImageProcessor()
+            sinks = {source: self._make_sink(source) for source in self.sources}
+            try:
+                scheduler = MultiSourceScheduler(self.sources, self.detector, sinks, self.event_log)
+            except RuntimeError as e:
+                self._camera_error = e
+                print(f"Error opening cameras: {e}")
+                return
+            if self._closing:
+                scheduler.stop()
+                return
+            scheduler.start()
+            self.scheduler = scheduler
+
+        threading.Thread(target=open_cameras, name="camera-open", daemon=True).start()
+
+    def _make_sink(self, source):
+        """Save detections of one source per Settings.SAVE_MODE, indexed under that source"""
+        def sink(result, detections):
+            self.image_processor.save_detections(result.frame, detections.xyxy, detections.class_ids,
+                                                 self.detector.class_names, source=source)
+        return sink
+
+    def _update_status(self):
+        """Show loading progress in the window title until the model is ready"""
+        if self.detector is not None and self.detector.load_error is not None:
+            status = "model failed to load"
+        elif self._camera_error is not None:
+            status = "cameras failed to open"
+        elif self.scheduler is None:
+            status = "opening cameras..."
+        elif not self.detector.ready.is_set():
+            status = "loading model..."
+        else:
+            status = None
+        self.window.set_status(status)
+
+    def _on_close(self):
+        self._closing = True
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.detector is not None:
+            self.detector.close()
+        if self.image_processor is not None:
+            self.image_processor.close()
+        if self.event_log is not None:
+            self.event_log.close()
+        self.window.window.destroy()
+
+    def _update_frame(self):
+        """Render the newest result of every source"""
+        self._update_status()
+        if self.scheduler is not None:
+            stats = self.scheduler.stats()
+            for source in self.sources:
+                result = self.scheduler.latest_result(source)
+                if result is not None:
+                    self.window.update_source(source, result.frame, result.detected_classes)
+                self.window.update_stats(source, stats[source])
+        self.window.window.after(Settings.FRAME_RATE, self._update_frame)
+
+    def run(self):
+        """Start the Tk render loop; model and cameras come up in the background"""
+        start_metrics_export()
+        self._start_background()
+        self._update_frame()
+        self.window.window.mainloop()
+
 # Usage example:
 if __name__ == "__main__":
-    # Start with laptop camera
-    app = LiveEWasteDetectionApp(camera_source='LAPTOP')
-    app.run()
+    parser = argparse.ArgumentParser(description=Settings.PROJECT_NAME)
+    parser.add_argument("--camera", default='LAPTOP', choices=list(Settings.CAMERA_SOURCES),
+                        help="Camera source for single-camera mode")
+    parser.add_argument("--multi", nargs='*', metavar="SOURCE",
+                        help="Run several sources at once (defaults to Settings.STATION_SOURCES)")
+    parser.add_argument("--inference-process", action="store_true", default=Settings.INFERENCE_PROCESS,
+                        help="Run the model in a separate worker process")
+    args = parser.parse_args()
+
+    if args.multi is not None:
+        MultiSourceDetectionApp(args.multi or Settings.STATION_SOURCES, args.inference_process).run()
+    else:
+        # Start with laptop camera
+        app = LiveEWasteDetectionApp(camera_source=args.camera, inference_process=args.inference_process)
+        app.run()
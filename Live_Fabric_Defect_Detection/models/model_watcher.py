@@ -0,0 +1,71 @@
+# models/model_watcher.py
+import os
+import threading
+
+
+def find_weights(directory, filename):
+    """{path: (mtime, size)} of every weights file named `filename` under directory"""
+    found = {}
+    for root, _, files in os.walk(directory):
+        if filename in files:
+            path = os.path.join(root, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # removed between listing and stat
+            found[path] = (stat.st_mtime, stat.st_size)
+    return found
+
+
+class ModelWatcher(threading.Thread):
+    """Poll a training output directory and report weights files once they are fully written
+
+    Files present when the watcher starts are ignored; a new or rewritten
+    file is reported only after its size and mtime stayed the same for
+    one whole poll interval, so a checkpoint still being saved is never loaded.
+    """
+
+    def __init__(self, directory, on_new_weights, filename="best.pt", interval=5.0):
+        """
+        Args:
+            directory: Folder searched recursively (e.g. model_training/runs/detect)
+            on_new_weights: Called with the path of each new, stable weights file
+            filename: Weights file name to look for
+            interval: Seconds between directory scans
+        """
+        super().__init__(name="model-watcher", daemon=True)
+        self.directory = directory
+        self.on_new_weights = on_new_weights
+        self.filename = filename
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._known = find_weights(directory, filename)
+        self._pending = {}
+
+    def poll(self):
+        """Scan once; returns the paths that became stable since the last scan"""
+        stable = []
+        for path, signature in find_weights(self.directory, self.filename).items():
+            if self._known.get(path) == signature:
+                continue
+            if self._pending.get(path) == signature:
+                # Unchanged for a full interval: the writer has finished
+                del self._pending[path]
+                self._known[path] = signature
+                stable.append(path)
+            else:
+                self._pending[path] = signature
+        # Newest first, so after a burst of training runs only the latest really matters
+        return sorted(stable, key=lambda p: self._known[p][0], reverse=True)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                stable = self.poll()
+                if stable:
+                    self.on_new_weights(stable[0])
+            except Exception as e:
+                print(f"Error watching {self.directory} for new weights: {e}")
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,252 @@
+# models/process_detector.py
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+from config.settings import Settings
+from detection_common.postprocess import PostProcessor
+from utils.metrics import registry
+from utils.shared_frames import SharedFrameRing
+
+# What comes back over the pipe per frame: raw box arrays plus ultralytics' stage timings (ms)
+RemoteResult = namedtuple('RemoteResult', ['xyxy', 'confs', 'class_ids', 'speed'])
+
+
+def _pack(result):
+    boxes = result.boxes
+    return RemoteResult(boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(),
+                        boxes.cls.cpu().numpy().astype(int), dict(result.speed))
+
+
+def _worker_main(conn, ring_name, slots, slot_bytes, threads):
+    """Inference process: load the model, then answer predict requests until told to stop"""
+    if threads:
+        # Must be set before torch is imported, which only happens when the model loads
+        for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+            os.environ[var] = str(threads)
+    from models.yolo_model import LiveEWasteDetector
+
+    ring = SharedFrameRing(slots, slot_bytes, ring_name)
+    retired = []
+    detector = LiveEWasteDetector()
+    try:
+        detector.load()
+        detector.start_watching()
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+        return
+    conn.send(('ready', detector.backend.name, detector.model_path))
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break  # the app went away without saying goodbye
+            if message[0] == 'stop':
+                break
+            if message[0] == 'ring':
+                try:
+                    ring.close()
+                except BufferError:
+                    retired.append(ring)  # the model may still hold a view of the last frames
+                ring = SharedFrameRing(message[2], message[3], message[1])
+                conn.send(('ok',))
+                continue
+
+            _, frames, kwargs, batch = message
+            start = time.perf_counter()
+            try:
+                images = [ring.view(*frame) for frame in frames]
+                if batch:
+                    results = detector.predict_batch(images, **kwargs)
+                else:
+                    results = [detector.predict(images[0], **kwargs)]
+                reply = [_pack(result) for result in results]
+                del images, results
+            except Exception as e:
+                conn.send(('error', f"{type(e).__name__}: {e}"))
+                continue
+            conn.send(('result', reply, time.perf_counter() - start, detector.profile))
+    finally:
+        detector.stop_watching()
+
+
+class ProcessDetector:
+    """LiveEWasteDetector running in a separate worker process
+
+    Capture, Tk rendering and the Python side of inference otherwise share
+    one GIL. Here the model lives in a spawned process: frames are copied
+    once into a shared-memory ring that the worker reads as ndarray views
+    without copying, and only the box arrays and stage timings come back
+    over a pipe. While the worker computes, the calling thread is blocked
+    on the pipe with the GIL released.
+
+    Exposes the parts of LiveEWasteDetector the pipeline and the multi-source
+    scheduler use; `backend` holds the worker's backend name once it serves.
+    Weights watching and hot-swap run inside the worker.
+    """
+
+    def __init__(self, slots=None, slot_bytes=None, threads=None, timeout=None):
+        """
+        Args:
+            slots: Frames the shared ring holds, also the largest batch sent at once
+            slot_bytes: Initial capacity of each slot (grown when a larger frame arrives)
+            threads: torch/BLAS threads in the worker (None leaves the library default)
+            timeout: Seconds to wait for a result before the worker is considered hung
+        """
+        self.class_names = Settings.CLASS_NAMES
+        self.postprocess = PostProcessor(
+            Settings.CLASS_NAMES, Settings.CLASS_CONF_THRESHOLDS,
+            Settings.DEFAULT_CONF_THRESHOLD, Settings.CLASS_ALLOW_LIST)
+        self.ready = threading.Event()
+        self.load_error = None
+        self.backend = None
+        self.model_path = None
+        self.profile = Settings.INFERENCE_PROFILE
+
+        self.slots = slots or Settings.INFERENCE_PROCESS_SLOTS
+        self.slot_bytes = slot_bytes or Settings.INFERENCE_PROCESS_SLOT_BYTES
+        self.threads = threads or Settings.INFERENCE_PROCESS_THREADS
+        self.timeout = timeout or Settings.INFERENCE_PROCESS_TIMEOUT
+        self._ring = None
+        self._conn = None
+        self._process = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Start the worker and wait until its model is loaded and warmed up"""
+        with registry.time('model_load'):
+            # spawn keeps the worker independent of the threads running in this process
+            context = multiprocessing.get_context('spawn')
+            self._ring = SharedFrameRing(self.slots, self.slot_bytes)
+            self._conn, child_conn = context.Pipe()
+            self._process = context.Process(
+                target=_worker_main, name="inference-worker", daemon=True,
+                args=(child_conn, self._ring.name, self.slots, self.slot_bytes, self.threads))
+            self._process.start()
+            child_conn.close()
+            try:
+                message = self._conn.recv()  # no timeout: loading may include a first-time export
+            except EOFError:
+                message = ('error', f"worker exited with code {self._process.exitcode}")
+        if message[0] == 'error':
+            raise RuntimeError(f"Inference worker failed to load the model: {message[1]}")
+        _, self.backend, self.model_path = message
+        self.ready.set()
+
+    def start_loading(self):
+        """Start the worker on a background thread; check `ready` and `load_error`"""
+        def run():
+            try:
+                self.load()
+            except Exception as e:
+                self.load_error = e
+                print(f"Error loading model: {e}")
+            finally:
+                self.ready.set()
+
+        thread = threading.Thread(target=run, name="model-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def start_watching(self, directory=None):
+        """Weights watching already runs inside the worker; kept for interface parity"""
+
+    def close(self):
+        """Stop the worker and free the shared frame ring"""
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._conn.send(('stop',))
+                except (BrokenPipeError, OSError):
+                    pass
+                self._process.join(5.0)
+                if self._process.is_alive():
+                    self._process.terminate()
+                self._conn.close()
+                self._process = None
+            if self._ring is not None:
+                self._ring.close()
+                self._ring = None
+        self.backend = None
+
+    def predict(self, frame, **kwargs):
+        """Perform prediction on a single frame in the worker"""
+        return self._request([frame], kwargs, batch=False)[0]
+
+    def predict_batch(self, frames, **kwargs):
+        """Perform prediction on several frames, at most `slots` per round trip"""
+        frames = list(frames)
+        results = []
+        for begin in range(0, len(frames), self.slots):
+            results.extend(self._request(frames[begin:begin + self.slots], kwargs, batch=True))
+        return results
+
+    def _request(self, frames, kwargs, batch):
+        with self._lock:
+            if self._process is None:
+                raise RuntimeError("Inference worker is not running")
+            largest = max(frame.nbytes for frame in frames)
+            if largest > self._ring.slot_bytes:
+                self._grow_ring(largest)
+            with registry.time('ipc_write'):
+                entries = [self._ring.write(self._ring.next_slot(), frame) for frame in frames]
+            start = time.perf_counter()
+            self._conn.send(('predict', entries, kwargs, batch))
+            reply = self._receive()
+            roundtrip = time.perf_counter() - start
+
+        if reply[0] == 'error':
+            raise RuntimeError(f"Inference worker error: {reply[1]}")
+        _, results, worker_seconds, self.profile = reply
+        # Round trip minus the worker's own time: pipe messages, pickling and wake-ups
+        registry.observe('ipc_overhead', roundtrip - worker_seconds)
+        self._record_speed(results)
+        return results
+
+    def _receive(self):
+        """Next reply from the worker; a hung or dead worker is shut down for good"""
+        try:
+            if self._conn.poll(self.timeout):
+                return self._conn.recv()
+            problem = f"no reply within {self.timeout:.0f}s"
+        except EOFError:
+            problem = f"worker exited with code {self._process.exitcode}"
+        # A late reply would be read as the answer to the next request, so stop here
+        self._process.terminate()
+        self._process = None
+        self.backend = None
+        self.load_error = RuntimeError(problem)
+        raise RuntimeError(f"Inference worker stopped: {problem}")
+
+    def _grow_ring(self, nbytes):
+        """Replace the ring with one whose slots fit nbytes; the worker switches over first"""
+        ring = SharedFrameRing(self.slots, nbytes)
+        self._conn.send(('ring', ring.name, ring.slots, ring.slot_bytes))
+        self._receive()
+        self._ring.close()
+        self._ring = ring
+        print(f"Inference frame slots grown to {nbytes} bytes")
+
+    @staticmethod
+    def _record_speed(results):
+        """Feed the worker's per-image stage timings (ms) into this process's registry"""
+        if not results:
+            return
+        for stage, name in (('preprocess', 'preprocess'), ('inference', 'predict'),
+                            ('postprocess', 'postprocess')):
+            ms = results[0].speed.get(stage)
+            if ms is not None:
+                registry.observe(name, ms / 1000)
+        registry.tick('inference')
+
+    def get_detections(self, results, apply_thresholds=True):
+        """Known, allowed boxes above their class's confidence threshold as Detections arrays"""
+        with registry.time('postprocess_filter'):
+            return self.postprocess(results.xyxy, results.confs, results.class_ids, apply_thresholds)
+
+    def get_detected_classes(self, results):
+        """Extract detected class names from results"""
+        return self.postprocess.names(self.get_detections(results))
@@ -0,0 +1,62 @@
+# models/resolution.py
+from collections import deque
+
+
+class AdaptiveResolutionController:
+    """Step between inference profiles to hold a target frame rate
+
+    Profiles are ordered from cheapest to most accurate. The mean latency of
+    the last `window` frames is compared with the frame budget (1 / target
+    FPS): above down_ratio of the budget the next cheaper profile is chosen,
+    below up_ratio the next more accurate one. The gap between the two
+    ratios, a full window of fresh samples after every change, and a
+    cooldown of `cooldown` frames keep it from oscillating at a boundary.
+    """
+
+    def __init__(self, profiles, target_fps, start=None, down_ratio=1.0, up_ratio=0.6,
+                 window=30, cooldown=60):
+        """
+        Args:
+            profiles: Profile names ordered from cheapest to most accurate
+            target_fps: Inference rate to sustain
+            start: Initial profile (None starts with the most accurate)
+            down_ratio: Fraction of the frame budget above which to step down
+            up_ratio: Fraction of the frame budget below which to step up (must be < down_ratio)
+            window: Frames averaged before deciding
+            cooldown: Frames after a change during which no further change is made
+        """
+        if up_ratio >= down_ratio:
+            raise ValueError("up_ratio must be below down_ratio for hysteresis")
+        self.profiles = list(profiles)
+        self.budget = 1.0 / target_fps
+        self.index = self.profiles.index(start) if start is not None else len(self.profiles) - 1
+        self.down_ratio = down_ratio
+        self.up_ratio = up_ratio
+        self.cooldown = cooldown
+        self.samples = deque(maxlen=window)
+        self._frames_since_change = cooldown
+        self.changes = 0
+
+    @property
+    def profile(self):
+        return self.profiles[self.index]
+
+    def observe(self, latency):
+        """Record one frame's inference latency (seconds); returns the profile to use next"""
+        self.samples.append(latency)
+        self._frames_since_change += 1
+        if len(self.samples) < self.samples.maxlen or self._frames_since_change < self.cooldown:
+            return self.profile
+
+        mean = sum(self.samples) / len(self.samples)
+        if mean > self.budget * self.down_ratio and self.index > 0:
+            self._change(-1)
+        elif mean < self.budget * self.up_ratio and self.index < len(self.profiles) - 1:
+            self._change(+1)
+        return self.profile
+
+    def _change(self, step):
+        self.index += step
+        self.samples.clear()  # latencies at the old resolution say nothing about the new one
+        self._frames_since_change = 0
+        self.changes += 1
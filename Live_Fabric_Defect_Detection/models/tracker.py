@@ -0,0 +1,177 @@
+# models/tracker.py
+import itertools
+import numpy as np
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU between two (N, 4) and (M, 4) xyxy arrays"""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)))
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def greedy_match(iou, threshold):
+    """Match rows to columns by descending IoU, ignoring pairs below threshold"""
+    matches = []
+    if iou.size == 0:
+        return matches
+    used_rows, used_cols = set(), set()
+    for flat_index in np.argsort(-iou, axis=None):
+        row, col = np.unravel_index(flat_index, iou.shape)
+        if iou[row, col] < threshold:
+            break
+        if row in used_rows or col in used_cols:
+            continue
+        matches.append((row, col))
+        used_rows.add(row)
+        used_cols.add(col)
+    return matches
+
+
+class Track:
+    """A single object followed across frames with a constant-velocity box model"""
+
+    _next_id = itertools.count(1)
+
+    def __init__(self, box, class_id, conf):
+        self.track_id = next(Track._next_id)
+        self.box = np.asarray(box, dtype=float)
+        self.velocity = np.zeros(4)
+        self.class_id = int(class_id)
+        self.conf = float(conf)
+        self.hits = 1
+        self.misses = 0  # detector runs since the last matched detection
+        self.frames_since_update = 0
+        self.confirmed = False
+
+    def predict(self):
+        """Advance the box one frame along its estimated velocity"""
+        self.box = self.box + self.velocity
+        self.frames_since_update += 1
+
+    def update(self, box, conf, position_gain, velocity_gain):
+        """Correct the predicted box towards a matched detection (alpha-beta filter)"""
+        frames = max(1, self.frames_since_update)
+        residual = np.asarray(box, dtype=float) - self.box
+        self.box = self.box + position_gain * residual
+        self.velocity = self.velocity + velocity_gain * residual / frames
+        self.conf = float(conf)
+        self.hits += 1
+        self.misses = 0
+        self.frames_since_update = 0
+
+
+class IoUTracker:
+    """Lightweight ByteTrack-style tracker
+
+    Detections are associated to tracks of the same class by IoU in two
+    passes: confident detections first, then low-confidence ones against the
+    tracks that are still unmatched, which keeps tracks alive through brief
+    confidence dips. Between detector runs predict() moves every track along
+    its velocity so boxes and IDs carry over without running YOLO.
+
+    Track age is counted in update() calls, not frames: frames on which the
+    detector did not run (every-N scheduling, a static scene skipped by the
+    motion gate) say nothing about whether the object is still there.
+    """
+
+    def __init__(self, iou_threshold=0.3, high_conf=0.5, low_conf=0.1, min_hits=2,
+                 max_age=30, position_gain=0.7, velocity_gain=0.3, class_conf=None):
+        """
+        Args:
+            iou_threshold: Minimum IoU for a detection to continue a track
+            high_conf: Detections at or above this confidence can start new tracks
+            low_conf: Detections below this confidence are ignored entirely
+            min_hits: Matched detections needed before a track is confirmed
+            max_age: Detector runs a confirmed track survives without a matching detection
+            position_gain: How far a match pulls the box from its prediction (0-1)
+            velocity_gain: How strongly a match corrects the velocity estimate (0-1)
+            class_conf: Per-class-id minimum confidence to start a track (raises high_conf for those classes)
+        """
+        self.iou_threshold = iou_threshold
+        self.high_conf = high_conf
+        self.low_conf = low_conf
+        self.min_hits = min_hits
+        self.max_age = max_age
+        self.position_gain = position_gain
+        self.velocity_gain = velocity_gain
+        self.class_conf = None if class_conf is None else np.asarray(class_conf, dtype=float)
+        self.tracks = []
+
+    def predict(self):
+        """Move all tracks forward one frame"""
+        for track in self.tracks:
+            track.predict()
+
+    def _associate(self, tracks, boxes, class_ids):
+        if not tracks or len(boxes) == 0:
+            return []
+        track_boxes = np.array([t.box for t in tracks])
+        track_classes = np.array([t.class_id for t in tracks])
+        iou = iou_matrix(track_boxes, boxes)
+        iou[track_classes[:, None] != class_ids[None, :]] = 0.0
+        return greedy_match(iou, self.iou_threshold)
+
+    def update(self, boxes, class_ids, confs):
+        """
+        Associate one frame of detections with the current tracks
+        Args:
+            boxes: (N, 4) xyxy array
+            class_ids: (N,) int array
+            confs: (N,) float array
+        Returns:
+            Tracks confirmed by this update, i.e. objects seen for the first time
+        """
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        class_ids = np.asarray(class_ids, dtype=int)
+        confs = np.asarray(confs, dtype=float)
+
+        high = np.flatnonzero(confs >= self.high_conf)
+        low = np.flatnonzero((confs >= self.low_conf) & (confs < self.high_conf))
+
+        matched_tracks = set()
+        unmatched_high = set(high.tolist())
+
+        # First pass: confident detections against every track
+        for row, col in self._associate(self.tracks, boxes[high], class_ids[high]):
+            det = high[col]
+            self.tracks[row].update(boxes[det], confs[det], self.position_gain, self.velocity_gain)
+            matched_tracks.add(row)
+            unmatched_high.discard(det)
+
+        # Second pass: low-confidence detections keep remaining tracks alive
+        remaining = [i for i in range(len(self.tracks)) if i not in matched_tracks]
+        remaining_tracks = [self.tracks[i] for i in remaining]
+        for row, col in self._associate(remaining_tracks, boxes[low], class_ids[low]):
+            det = low[col]
+            remaining_tracks[row].update(boxes[det], confs[det], self.position_gain, self.velocity_gain)
+            matched_tracks.add(remaining[row])
+
+        for i, track in enumerate(self.tracks):
+            if i not in matched_tracks:
+                track.misses += 1
+        # Tentative tracks that missed their follow-up detection are discarded, confirmed ones once lost too long
+        self.tracks = [t for i, t in enumerate(self.tracks)
+                       if i in matched_tracks or (t.confirmed and t.misses <= self.max_age)]
+
+        for det in sorted(unmatched_high):
+            # Existing tracks may be continued by any confident box, new ones need the class threshold too
+            if self.class_conf is not None and confs[det] < self.class_conf[class_ids[det]]:
+                continue
+            self.tracks.append(Track(boxes[det], class_ids[det], confs[det]))
+
+        newly_confirmed = []
+        for track in self.tracks:
+            if not track.confirmed and track.hits >= self.min_hits:
+                track.confirmed = True
+                newly_confirmed.append(track)
+        return newly_confirmed
+
+    def active_tracks(self):
+        """Confirmed tracks that are currently being followed"""
+        return [t for t in self.tracks if t.confirmed]
@@ -1,25 +1,270 @@
 # models/yolo_model.py
-from ultralytics import YOLO
-import cv2
+import os
+import threading
+import numpy as np
 from config.settings import Settings
+from detection_common.backends import DYNAMIC_FORMATS, EXPORT_FORMATS, load_backend, weights_digest
+from models.model_watcher import ModelWatcher
+from detection_common.postprocess import PostProcessor
+from models.resolution import AdaptiveResolutionController
+from utils.metrics import registry
 
 class LiveEWasteDetector:
-    """YOLO model wrapper for live e-waste detection"""
+    """YOLO model wrapper for live e-waste detection
+
+    Construction is cheap; the model (and ultralytics/torch with it) is only
+    loaded by load() or start_loading(), so the UI can come up first. `ready`
+    is set once the model is loaded and warmed up, or loading failed.
+
+    New weights can be swapped in while running (swap_to, or start_watching
+    a training directory). The candidate is loaded, warmed up and checked on
+    the caller's thread while the current model keeps serving; the swap
+    itself is a single reference assignment, so predict() always runs one
+    whole frame on one model. The previous model is kept for rollback().
+    """
     
     def __init__(self):
-        self.model = YOLO(Settings.MODEL_PATH)
+        self.backend = None
+        self.model_path = Settings.MODEL_PATH
+        self.weights_digest = None
         self.class_names = Settings.CLASS_NAMES
+        self.postprocess = PostProcessor(
+            Settings.CLASS_NAMES, Settings.CLASS_CONF_THRESHOLDS,
+            Settings.DEFAULT_CONF_THRESHOLD, Settings.CLASS_ALLOW_LIST)
+        self.ready = threading.Event()
+        self.load_error = None
+
+        # Profiles ordered cheapest first, so the controller steps along input size
+        self.profiles = dict(sorted(Settings.INFERENCE_PROFILES.items(), key=lambda p: p[1]['imgsz']))
+        self.profile = Settings.INFERENCE_PROFILE
+        if self.profile not in self.profiles:
+            raise ValueError(f"Invalid inference profile. Choose from: {list(self.profiles)}")
+        self.controller = None
+        if Settings.ADAPTIVE_RESOLUTION:
+            self.controller = AdaptiveResolutionController(
+                list(self.profiles), Settings.ADAPTIVE_TARGET_FPS, self.profile,
+                Settings.ADAPTIVE_DOWN_RATIO, Settings.ADAPTIVE_UP_RATIO,
+                Settings.ADAPTIVE_WINDOW, Settings.ADAPTIVE_COOLDOWN)
+
+        self.previous = None  # (backend, model_path, weights_digest) restored by rollback()
+        self.swap_count = 0
+        self._swap_lock = threading.Lock()
+        self._probation = None
+        self._watcher = None
+
+    def _load_backend(self, weights_path):
+        return load_backend(
+            weights_path, Settings.INFERENCE_BACKEND, Settings.MODEL_IMAGE_SIZE,
+            Settings.PARITY_SAMPLE_IMAGE, Settings.PARITY_BOX_TOLERANCE,
+            Settings.PARITY_CONF_TOLERANCE, Settings.MODEL_CACHE_DIR)
+
+    def load(self):
+        """Load the configured backend and run warm-up inferences"""
+        with registry.time('model_load'):
+            self.backend = self._load_backend(self.model_path)
+            self.weights_digest = weights_digest(self.model_path)
+        with registry.time('model_warmup'):
+            self.warm_up()
+        self.ready.set()
+
+    def start_loading(self):
+        """Load the model on a background thread; check `ready` and `load_error`"""
+        def run():
+            try:
+                self.load()
+                self.start_watching()
+            except Exception as e:
+                self.load_error = e
+                print(f"Error loading model: {e}")
+            finally:
+                self.ready.set()
+
+        thread = threading.Thread(target=run, name="model-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def warm_up(self, runs=None, backend=None):
+        """Run dummy inferences so the first real frame does not pay one-off setup costs"""
+        runs = Settings.WARMUP_RUNS if runs is None else runs
+        backend = self.backend if backend is None else backend
+        dummy = np.zeros((Settings.MODEL_IMAGE_SIZE, Settings.MODEL_IMAGE_SIZE, 3), dtype=np.uint8)
+        # Warm every size the controller may switch to, not just the starting one
+        names = self.profiles if self.controller is not None else [self.profile]
+        for name in names:
+            for _ in range(runs):
+                backend.predict(dummy, verbose=False, **self._profile_args(name, backend))
+
+    def _profile_args(self, name, backend=None):
+        """predict() keyword arguments for a profile on a backend"""
+        backend = self.backend if backend is None else backend
+        args = dict(self.profiles[name])
+        # Exports without dynamic shapes only accept the size they were exported at
+        if backend.name != 'pytorch' and EXPORT_FORMATS[backend.name] not in DYNAMIC_FORMATS:
+            args['imgsz'] = Settings.MODEL_IMAGE_SIZE
+        return args
+
+    def set_profile(self, name):
+        """Switch inference profile; takes effect from the next predict call"""
+        if name not in self.profiles:
+            raise ValueError(f"Invalid inference profile. Choose from: {list(self.profiles)}")
+        if name != self.profile:
+            print(f"Inference profile {self.profile} -> {name} ({self.profiles[name]})")
+            self.profile = name
+        registry.set_gauge('inference_imgsz', self.profiles[name]['imgsz'])
+
+    def start_watching(self, directory=None):
+        """Swap in new weights whenever they appear under directory (default Settings.MODEL_WATCH_DIR)"""
+        directory = directory or Settings.MODEL_WATCH_DIR
+        if self._watcher is not None or not directory:
+            return
+        if not os.path.isdir(directory):
+            print(f"Warning: model watch directory {directory} does not exist, hot-swap disabled")
+            return
+        self._watcher = ModelWatcher(directory, self.swap_to, Settings.MODEL_WATCH_FILENAME,
+                                     Settings.MODEL_WATCH_INTERVAL)
+        self._watcher.start()
+        print(f"Watching {directory} for new {Settings.MODEL_WATCH_FILENAME}")
+
+    def close(self):
+        """Stop background work; the detector can still predict afterwards"""
+        self.stop_watching()
 
-    def predict(self, frame):
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _check_candidate(self, backend):
+        """Sanity and latency checks on a loaded model; returns None if it may serve, else why not"""
+        names = getattr(backend.model, 'names', None) or {}
+        if len(names) != len(self.class_names):
+            return f"it has {len(names)} classes, expected {len(self.class_names)}"
+
+        rng = np.random.default_rng(0)
+        sample = rng.integers(0, 256, size=(Settings.MODEL_IMAGE_SIZE, Settings.MODEL_IMAGE_SIZE, 3),
+                              dtype=np.uint8)
+        # Same profile as live frames, so latency compares like with like
+        result = backend.predict(sample, verbose=False, **self._profile_args(self.profile, backend))[0]
+        confs = result.boxes.conf.cpu().numpy()
+        class_ids = result.boxes.cls.cpu().numpy().astype(int)
+        if not np.all(np.isfinite(confs)) or not np.all(np.isfinite(result.boxes.xyxy.cpu().numpy())):
+            return "it produced non-finite boxes or confidences"
+        if len(class_ids) and (class_ids.min() < 0 or class_ids.max() >= len(self.class_names)):
+            return "it produced out-of-range class ids"
+
+        # Compared against the live model's recent p50; both are measured under the same load
+        baseline = registry.stage_quantiles('predict')[0.5]
+        latency = result.speed.get('inference', 0.0) / 1000
+        if baseline > 0 and latency > baseline * Settings.HOT_SWAP_MAX_SLOWDOWN:
+            return f"inference took {latency * 1000:.1f} ms vs {baseline * 1000:.1f} ms for the current model"
+        return None
+
+    def swap_to(self, weights_path):
+        """
+        Load, warm up and check new weights, then make them the serving model
+        Returns:
+            True if the new weights are now in use
+        """
+        digest = weights_digest(weights_path)
+        if digest == self.weights_digest:
+            return False
+        print(f"Loading new weights {weights_path}")
+        try:
+            with registry.time('model_swap_load'):
+                candidate = self._load_backend(weights_path)
+                self.warm_up(backend=candidate)
+            problem = self._check_candidate(candidate)
+        except Exception as e:
+            problem = f"it failed to load ({e})"
+        if problem is not None:
+            print(f"Rejected new weights {weights_path}: {problem}")
+            registry.tick('model_swap_rejected')
+            return False
+
+        baseline = registry.stage_quantiles('predict')[0.5]
+        with self._swap_lock:
+            self.previous = (self.backend, self.model_path, self.weights_digest)
+            self.backend, self.model_path, self.weights_digest = candidate, weights_path, digest
+            self._probation = {
+                'backend': candidate, 'frames': 0, 'total': 0.0,
+                'limit': baseline * Settings.HOT_SWAP_MAX_SLOWDOWN if baseline > 0 else None,
+            }
+            self.swap_count += 1
+        registry.set_gauge('model_swaps', self.swap_count)
+        print(f"Now serving {weights_path}")
+        return True
+
+    def rollback(self, reason="requested"):
+        """Go back to the model that served before the last swap; returns False if there is none"""
+        with self._swap_lock:
+            if self.previous is None:
+                return False
+            self.backend, self.model_path, self.weights_digest = self.previous
+            self.previous = None
+            self._probation = None
+        registry.tick('model_rollback')
+        print(f"Rolled back to {self.model_path}: {reason}")
+        return True
+
+    def _check_probation(self, backend, results):
+        """Roll back a freshly swapped model whose live inference latency is too high"""
+        probation = self._probation
+        if probation is None or probation['backend'] is not backend or not results:
+            return
+        probation['frames'] += 1
+        probation['total'] += results[0].speed.get('inference', 0.0) / 1000
+        if probation['frames'] < Settings.HOT_SWAP_PROBATION_FRAMES:
+            return
+        self._probation = None
+        mean = probation['total'] / probation['frames']
+        if probation['limit'] is not None and mean > probation['limit']:
+            self.rollback(f"new model averaged {mean * 1000:.1f} ms per frame, "
+                          f"limit {probation['limit'] * 1000:.1f} ms")
+
+    def predict(self, frame, **kwargs):
         """Perform prediction on a single frame"""
-        results = self.model.predict(source=frame, save=False, show=False)
+        backend = self.backend  # one model per frame even if a swap lands meanwhile
+        results = backend.predict(frame, **{**self._profile_args(self.profile, backend), **kwargs})
+        self._record_speed(results)
+        self._check_probation(backend, results)
+        self._adapt_resolution(results)
         return results[0]
 
+    def predict_batch(self, frames, **kwargs):
+        """Perform prediction on several frames in a single call"""
+        backend = self.backend
+        results = backend.predict(list(frames), **{**self._profile_args(self.profile, backend), **kwargs})
+        self._record_speed(results)
+        self._check_probation(backend, results)
+        return results
+
+    def _adapt_resolution(self, results):
+        """Feed this frame's model time to the controller and apply its profile choice"""
+        if self.controller is None or not results:
+            return
+        speed = results[0].speed
+        latency = sum(speed.get(stage) or 0.0 for stage in ('preprocess', 'inference', 'postprocess')) / 1000
+        profile = self.controller.observe(latency)
+        if profile != self.profile:
+            self.set_profile(profile)
+
+    @staticmethod
+    def _record_speed(results):
+        """Feed ultralytics' own per-image stage timings (ms) into the metrics registry"""
+        if not results:
+            return
+        for stage, name in (('preprocess', 'preprocess'), ('inference', 'predict'),
+                            ('postprocess', 'postprocess')):
+            ms = results[0].speed.get(stage)
+            if ms is not None:
+                registry.observe(name, ms / 1000)
+        registry.tick('inference')
+
+    def get_detections(self, results, apply_thresholds=True):
+        """Known, allowed boxes above their class's confidence threshold as Detections arrays"""
+        with registry.time('postprocess_filter'):
+            return self.postprocess.from_result(results, apply_thresholds)
+
     def get_detected_classes(self, results):
         """Extract detected class names from results"""
-        class_ids = results.boxes.cls.cpu().numpy().astype(int)
-        detected_objects = []
-        for class_id in class_ids:
-            if class_id < len(self.class_names):
-                detected_objects.append(self.class_names[class_id])
-        return detected_objects
\ No newline at end of file
+        return self.postprocess.names(self.get_detections(results))
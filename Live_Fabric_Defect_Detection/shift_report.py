@@ -0,0 +1,43 @@
+# shift_report.py
+import argparse
+import sys
+from datetime import datetime
+from config.settings import Settings
+from detection_common.event_log import EventLogReader
+
+def parse_time(value):
+    """Accept 'YYYY-MM-DD HH:MM' (or any ISO 8601 form) and return a unix timestamp"""
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+def class_label(class_id):
+    return Settings.CLASS_NAMES[class_id] if 0 <= class_id < len(Settings.CLASS_NAMES) else str(class_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="Detection counts for a shift from the event log")
+    parser.add_argument("--db", default=Settings.EVENT_LOG_PATH, help="Event log database")
+    parser.add_argument("--start", help="Shift start, e.g. '2024-05-01 06:00'")
+    parser.add_argument("--end", help="Shift end, e.g. '2024-05-01 14:00'")
+    parser.add_argument("--source", help="Only count detections from this camera")
+    parser.add_argument("--hourly", action="store_true", help="Also break counts down per hour")
+    args = parser.parse_args()
+
+    try:
+        log = EventLogReader(args.db)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    start, end = parse_time(args.start), parse_time(args.end)
+
+    counts = log.class_counts(start, end, args.source)
+    print(f"{'class':<28}{'detections':>12}")
+    for class_id, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"{class_label(class_id):<28}{count:>12}")
+    print(f"{'total':<28}{sum(counts.values()):>12}")
+
+    if args.hourly:
+        print()
+        for hour, class_id, count in log.hourly_counts(start, end, source=args.source):
+            print(f"{datetime.fromtimestamp(hour):%Y-%m-%d %H:00}  {class_label(class_id):<28}{count:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# tests/test_backends.py
+import json
+import os
+import numpy as np
+import pytest
+from detection_common import backends
+
+
+class _Array:
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=float)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+
+class _Boxes:
+    def __init__(self, xyxy, cls, conf):
+        self.xyxy = _Array(np.reshape(xyxy, (-1, 4)))
+        self.cls = _Array(cls)
+        self.conf = _Array(conf)
+
+    def __len__(self):
+        return len(self.cls.values)
+
+
+class _Result:
+    def __init__(self, boxes):
+        self.boxes = boxes
+
+
+def fake_backend(outputs):
+    """InferenceBackend stand-in returning fixed boxes per backend name"""
+    class FakeBackend:
+        def __init__(self, name, model_path):
+            self.name = name
+            self.model_path = model_path
+
+        def predict(self, source, **kwargs):
+            return [_Result(_Boxes(*outputs[self.name]))]
+    return FakeBackend
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    entry_dir = str(tmp_path)
+    os.makedirs(os.path.join(entry_dir, "export"))
+
+    def export_model(weights_path, name, imgsz, cache_dir=None):
+        manifest = backends._read_manifest(entry_dir)
+        entry = manifest.setdefault(name, {'artifact': 'export', 'imgsz': imgsz, 'parity': None})
+        return os.path.join(entry_dir, 'export'), entry, entry_dir
+
+    monkeypatch.setattr(backends, 'export_model', export_model)
+    return entry_dir
+
+
+def parity(entry_dir):
+    with open(os.path.join(entry_dir, "manifest.json")) as f:
+        return json.load(f)['onnx']['parity']
+
+
+def test_empty_reference_is_recorded_unverified(cache, monkeypatch):
+    monkeypatch.setattr(backends, 'InferenceBackend', fake_backend({'pytorch': ([], [], []), 'onnx': ([], [], [])}))
+    name, _ = backends.resolve_backend("best.pt", 'onnx')
+    assert name == 'onnx'
+    assert parity(cache) == backends.UNVERIFIED
+
+
+def test_matching_boxes_pass_and_mismatch_falls_back(cache, monkeypatch):
+    box = [[10, 10, 50, 50]]
+    monkeypatch.setattr(backends, 'InferenceBackend',
+                        fake_backend({'pytorch': (box, [1], [0.9]), 'onnx': (box, [1], [0.91])}))
+    assert backends.resolve_backend("best.pt", 'onnx')[0] == 'onnx'
+    assert parity(cache) is True
+
+    os.remove(os.path.join(cache, "manifest.json"))
+    monkeypatch.setattr(backends, 'InferenceBackend',
+                        fake_backend({'pytorch': (box, [1], [0.9]), 'onnx': (box, [2], [0.9])}))
+    assert backends.resolve_backend("best.pt", 'onnx') == ('pytorch', "best.pt")
+    assert parity(cache) is False
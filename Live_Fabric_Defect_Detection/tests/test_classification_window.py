@@ -0,0 +1,44 @@
+# tests/test_classification_window.py
+import numpy as np
+import pytest
+
+pytest.importorskip("tkinter")
+
+from ui.classification_window import ClassificationWindow
+
+
+class RecordingWindow(ClassificationWindow):
+    """ClassificationWindow without Tk widgets, recording what would be drawn"""
+
+    def __init__(self):
+        self._detected = set()
+        self._shown = {}
+        self.images = {}
+
+    def _set_image(self, class_name, image):
+        self.images[class_name] = image
+
+    def _set_status(self, class_name, detected):
+        pass
+
+
+def test_new_thumbnail_is_drawn_even_if_its_result_was_dropped():
+    window = RecordingWindow()
+    first, second = np.zeros((2, 2, 3)), np.ones((2, 2, 3))
+    make_photo = lambda thumbnail: ("photo", thumbnail[0, 0, 0])
+
+    assert window.apply_frame({'HDD': first}, make_photo) == 1
+    # The result that introduced `second` never reached the window; a later one carries it
+    assert window.apply_frame({'HDD': second}, make_photo) == 1
+    assert window.images['HDD'] == ("photo", 1.0)
+    assert window.apply_frame({'HDD': second}, make_photo) == 0  # unchanged: nothing redrawn
+
+
+def test_classes_sharing_a_thumbnail_share_one_photo():
+    window = RecordingWindow()
+    thumbnail = np.zeros((2, 2, 3))
+    photos = []
+    window.apply_frame({'HDD': thumbnail, 'Router': thumbnail}, lambda t: photos.append(t) or len(photos))
+    assert len(photos) == 1
+    assert window.apply_frame({}, None) == 2
+    assert window.images == {'HDD': None, 'Router': None}
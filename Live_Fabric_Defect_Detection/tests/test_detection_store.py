@@ -0,0 +1,112 @@
+# tests/test_detection_store.py
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from utils.detection_store import DetectionStore
+
+SIZE = 100
+
+
+class SyncWriter:
+    """AsyncImageWriter stand-in that writes SIZE bytes and calls on_written on the caller's thread"""
+
+    def submit(self, path, image, on_written=None, links=()):
+        for target in (path, *links):
+            with open(target, 'wb') as f:
+                f.write(b'\0' * SIZE)
+            if on_written is not None:
+                on_written(target, SIZE)
+        return True
+
+
+def noise(seed):
+    """Frame with its own dHash, so different seeds never count as duplicates"""
+    return np.random.default_rng(seed).integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(**kwargs):
+        store = DetectionStore(str(tmp_path / "detections"), SyncWriter(), str(tmp_path / "index.sqlite"),
+                               janitor_interval=3600, **kwargs)
+        # Let the janitor's startup pass finish, then stop it so only the test touches the store
+        store._stop_event.set()
+        store._janitor.join()
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def test_cooldown_applies_per_class_and_source(make_store):
+    store = make_store(cooldown=2.0)
+    assert store.save(noise(1), "cable", now=100.0) is not None
+    assert store.save(noise(2), "cable", now=101.0) is None
+    assert store.skipped_cooldown == 1
+    # Other classes and other cameras have their own cooldown
+    assert store.save(noise(3), "battery", now=101.0) is not None
+    assert store.save(noise(4), "cable", now=101.0, source="IP_CAMERA") is not None
+    assert store.save(noise(5), "cable", now=102.5) is not None
+    assert [row[1] for row in store.list_detections(source="IP_CAMERA")] == ["cable"]
+
+
+def test_near_duplicate_frames_are_skipped(make_store):
+    store = make_store(cooldown=0.0, dedup_max_distance=6)
+    frame = noise(1)
+    assert store.save(frame, "cable", now=1.0) is not None
+    brighter = np.clip(frame.astype(np.int16) + 3, 0, 255).astype(np.uint8)
+    assert store.save(brighter, "cable", now=2.0) is None
+    assert store.skipped_duplicate == 1
+    assert store.save(noise(2), "cable", now=3.0) is not None
+    # The same frame is still new to another class
+    assert store.save(frame, "battery", now=4.0) is not None
+
+
+def test_quota_evicts_oldest_first(make_store):
+    store = make_store(cooldown=0.0, max_bytes=2 * SIZE + SIZE // 2)
+    paths = [store.save(noise(i), "cable", now=float(i)) for i in range(4)]
+    assert store.total_bytes == 4 * SIZE
+
+    assert store.enforce_quota(now=10.0) == 2
+    assert [row[0] for row in store.list_detections()] == paths[2:]
+    assert not any(os.path.exists(path) for path in paths[:2])
+    assert store.total_bytes == 2 * SIZE
+
+
+def test_max_age_and_purge(make_store):
+    store = make_store(cooldown=0.0, max_age=60)
+    old = store.save(noise(1), "cable", now=0.0)
+    store.save(noise(2), "cable", now=100.0)
+    store.save(noise(3), "battery", now=100.0)
+    assert store.enforce_quota(now=120.0) == 1 and not os.path.exists(old)
+
+    assert store.purge(class_name="battery") == 1
+    assert [row[1] for row in store.list_detections()] == ["cable"]
+    assert store.purge() == 1
+    assert store.list_detections() == [] and store.total_bytes == 0
+
+
+def test_indexing_a_path_twice_counts_its_size_once(make_store):
+    store = make_store(cooldown=0.0)
+    path = store.save(noise(1), "cable", now=1.0)
+    store._index(path, "cable", 1.0, SIZE, 0)
+    assert store.total_bytes == SIZE
+    assert store.rebuild_index() == 1 and store.total_bytes == SIZE
+
+
+def test_rebuild_index_parses_class_names(make_store, tmp_path):
+    directory = tmp_path / "detections"
+    directory.mkdir()
+    for name in ("circuit_board_1700000000000_12.jpg", "cable_1700000000.jpg", "notes.txt"):
+        (directory / name).write_bytes(b'\0' * SIZE)
+
+    store = make_store()  # a new index is filled from the directory on startup
+    assert sorted(row[1] for row in store.list_detections()) == ["cable", "circuit_board"]
+    assert store.total_bytes == 2 * SIZE
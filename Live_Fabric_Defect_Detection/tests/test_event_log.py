@@ -0,0 +1,26 @@
+# tests/test_event_log.py
+import os
+import pytest
+from detection_common.event_log import DetectionEventLog, EventLogReader
+
+BOX = (0.0, 0.0, 10.0, 10.0)
+
+
+def test_reader_filters_hourly_counts_by_source(tmp_path):
+    path = str(tmp_path / "events.sqlite")
+    log = DetectionEventLog(path, flush_interval=0.01)
+    log.log("LAPTOP", [1, 1, 2], [0.9, 0.8, 0.7], [BOX] * 3, timestamp=7200.0, block=True)
+    log.log("IP_CAMERA", [1], [0.9], [BOX], timestamp=7300.0, block=True)
+    log.close()
+
+    reader = EventLogReader(path)
+    assert reader.class_counts(source="LAPTOP") == {1: 2, 2: 1}
+    assert reader.hourly_counts(source="IP_CAMERA") == [(7200, 1, 1)]
+    assert reader.hourly_counts() == [(7200, 1, 3), (7200, 2, 1)]
+
+
+def test_reader_does_not_create_a_missing_database(tmp_path):
+    path = str(tmp_path / "typo.sqlite")
+    with pytest.raises(FileNotFoundError):
+        EventLogReader(path)
+    assert not os.path.exists(path)
@@ -0,0 +1,43 @@
+# tests/test_postprocess.py
+import numpy as np
+from detection_common.postprocess import Detections, PostProcessor
+from models.tracker import IoUTracker
+
+NAMES = ['battery', 'cable', 'router']
+XYXY = np.array([[0, 0, 10, 10], [20, 20, 30, 30], [40, 40, 50, 50], [60, 60, 70, 70]], dtype=np.float32)
+
+
+def test_per_class_thresholds_and_allow_list():
+    post = PostProcessor(NAMES, {'cable': 0.6}, default_conf=0.3, allowed_classes=['battery', 'cable'])
+    dets = post(XYXY, [0.35, 0.5, 0.9, 0.7], [0, 1, 2, 1])
+
+    assert dets.class_ids.tolist() == [0, 1]  # cable at 0.5 below its 0.6, router not allowed
+    assert dets.confs.tolist() == np.float32([0.35, 0.7]).tolist()
+    assert post.names(dets) == ['battery', 'cable']
+    assert post.present_names(dets) == frozenset({'battery', 'cable'})
+
+
+def test_unknown_class_ids_are_dropped():
+    post = PostProcessor(NAMES)
+    dets = post(XYXY[:3], [0.9, 0.9, 0.9], [0, 7, -1])
+    assert dets.class_ids.tolist() == [0]
+
+
+def test_threshold_after_unthresholded_filter():
+    post = PostProcessor(NAMES, {'cable': 0.6}, default_conf=0.3)
+    raw = post(XYXY, [0.1, 0.5, 0.9, 0.7], [0, 1, 2, 1], apply_thresholds=False)
+    assert len(raw.class_ids) == 4
+    assert post.threshold(raw).class_ids.tolist() == [2, 1]
+
+
+def test_counts():
+    dets = Detections(XYXY, np.ones(4, dtype=np.float32), np.array([0, 2, 2, 1]))
+    assert dets.counts(len(NAMES)).tolist() == [1, 1, 2]
+    assert dets.present_ids() == frozenset({0, 1, 2})
+
+
+def test_tracker_needs_class_threshold_to_start_a_track():
+    post = PostProcessor(NAMES, {'cable': 0.6}, default_conf=0.25)
+    tracker = IoUTracker(high_conf=0.5, min_hits=1, class_conf=post.thresholds)
+    assert tracker.update(XYXY[:2], [0, 1], [0.55, 0.55])[0].class_id == 0
+    assert [t.class_id for t in tracker.tracks] == [0]  # the 0.55 cable is below its 0.6 threshold
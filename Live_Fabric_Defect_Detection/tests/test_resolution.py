@@ -0,0 +1,37 @@
+# tests/test_resolution.py
+import pytest
+from models.resolution import AdaptiveResolutionController
+
+PROFILES = ['fast', 'balanced', 'accurate']
+LATENCY = {'fast': 0.02, 'balanced': 0.05, 'accurate': 0.09}  # seconds, against a 15 FPS budget of 0.067
+
+
+def run(controller, frames, latency=LATENCY):
+    for _ in range(frames):
+        controller.observe(latency[controller.profile])
+    return controller.profile
+
+
+def test_steps_down_under_load_and_settles():
+    controller = AdaptiveResolutionController(PROFILES, 15, window=5, cooldown=10)
+    assert run(controller, 200) == 'balanced'
+    assert controller.changes == 1  # 0.05 s sits inside the hysteresis band: no oscillation
+
+
+def test_steps_back_up_with_headroom():
+    controller = AdaptiveResolutionController(PROFILES, 15, start='fast', window=5, cooldown=10)
+    assert run(controller, 200, {'fast': 0.01, 'balanced': 0.02, 'accurate': 0.03}) == 'accurate'
+
+
+def test_waits_for_window_and_cooldown():
+    controller = AdaptiveResolutionController(PROFILES, 15, window=5, cooldown=10)
+    assert run(controller, 4) == 'accurate'
+    assert run(controller, 1) == 'balanced'
+    # Even far over budget, the next change waits for the cooldown
+    assert run(controller, 9, {'balanced': 1.0}) == 'balanced'
+    assert run(controller, 1, {'balanced': 1.0}) == 'fast'
+
+
+def test_rejects_ratios_without_hysteresis():
+    with pytest.raises(ValueError):
+        AdaptiveResolutionController(PROFILES, 15, down_ratio=0.6, up_ratio=0.6)
@@ -0,0 +1,89 @@
+# tests/test_tracker.py
+import threading
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from config.settings import Settings
+from detection_common.postprocess import Detections, PostProcessor
+from models.tracker import IoUTracker
+from utils.camera import FramePacket
+from utils.motion import MotionGate
+from utils.pipeline import InferenceThread
+
+BOX = np.array([[100.0, 100.0, 200.0, 220.0]])
+
+
+class StubDetector:
+    """Returns the same confident box on every frame"""
+
+    def __init__(self, conf=0.9, class_id=0):
+        self.class_names = Settings.CLASS_NAMES
+        self.postprocess = PostProcessor(Settings.CLASS_NAMES)
+        self.detection = Detections(BOX.astype(np.float32), np.array([conf], dtype=np.float32),
+                                    np.array([class_id]))
+        self.runs = 0
+
+    def predict(self, frame, **kwargs):
+        self.runs += 1
+        return self.detection
+
+    def get_detections(self, results, apply_thresholds=True):
+        return results
+
+
+class StubImageProcessor:
+    def save_detections(self, frame, boxes, class_ids, class_names):
+        return {class_names[class_id]: "saved.jpg" for class_id in class_ids}
+
+    def make_thumbnail(self, frame):
+        return frame[:2, :2]
+
+
+def make_thread(detector):
+    gate = MotionGate(Settings.MOTION_THRESHOLD, Settings.MOTION_DOWNSCALE_WIDTH,
+                      Settings.MOTION_FORCE_REFRESH_FRAMES)
+    tracker = IoUTracker(Settings.TRACKER_IOU_THRESHOLD, Settings.TRACKER_HIGH_CONF,
+                         Settings.TRACKER_LOW_CONF, Settings.TRACKER_MIN_HITS, Settings.TRACKER_MAX_AGE)
+    return InferenceThread(detector, StubImageProcessor(), None, None, threading.Event(),
+                           motion_gate=gate, tracker=tracker)
+
+
+def run_frames(thread, frames):
+    return [thread._track(FramePacket(frame, 0.0, seq)) for seq, frame in enumerate(frames)]
+
+
+def test_object_in_static_scene_is_confirmed_and_kept():
+    frame = np.full((240, 320, 3), 128, dtype=np.uint8)
+    detector = StubDetector()
+    results = run_frames(make_thread(detector), [frame] * 200)
+
+    detected = [bool(result.detected_classes) for result in results]
+    assert any(detected)
+    first = detected.index(True)
+    assert all(detected[first:])  # never dropped while the gate skips the detector
+    assert detector.runs < 20  # the gate still skips most frames
+
+
+def test_object_stays_tracked_after_motion_stops():
+    rng = np.random.default_rng(0)
+    moving = [rng.integers(0, 256, size=(240, 320, 3), dtype=np.uint8) for _ in range(20)]
+    still = [moving[-1]] * 180
+    results = run_frames(make_thread(StubDetector()), moving + still)
+
+    assert all(result.detected_classes for result in results[10:])
+
+
+def test_lost_track_expires_after_max_age_detector_runs():
+    tracker = IoUTracker(min_hits=1, max_age=3)
+    tracker.update(BOX, [0], [0.9])
+    for _ in range(50):
+        tracker.predict()  # frames without a detector run do not age the track
+    assert tracker.active_tracks()
+
+    for _ in range(3):
+        tracker.update(np.empty((0, 4)), [], [])
+    assert tracker.active_tracks()
+    tracker.update(np.empty((0, 4)), [], [])
+    assert not tracker.active_tracks()
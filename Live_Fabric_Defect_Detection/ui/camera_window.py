@@ -1,7 +1,5 @@
 # ui/camera_window.py
 import tkinter as tk
-from PIL import Image, ImageTk
-import cv2
 from config.settings import Settings
 
 class CameraWindow:
@@ -13,6 +11,8 @@ class CameraWindow:
         self.window.geometry(Settings.CAMERA_WINDOW_SIZE)
         self.window.configure(bg="#f0f0f0")
 
+        self._photo = None  # reused across frames while the display size stays the same
+        self._photo_size = None
         self._setup_ui()
 
     def _setup_ui(self):
@@ -23,9 +23,53 @@ class CameraWindow:
         self.camera_label = tk.Label(self.camera_frame)
         self.camera_label.pack(fill=tk.BOTH, expand=True)
 
+        self.overlay_label = None
+        if Settings.SHOW_METRICS_OVERLAY:
+            self.overlay_label = tk.Label(self.camera_frame, bg='black', fg='#00ff00',
+                                          font=("Courier", 9), justify=tk.LEFT)
+            self.overlay_label.place(x=5, y=5)
+
+    def _display_size(self, frame):
+        """Largest size with the frame's aspect ratio that fits the label"""
+        frame_height, frame_width = frame.shape[:2]
+        label_width, label_height = self.camera_label.winfo_width(), self.camera_label.winfo_height()
+        if label_width <= 1 or label_height <= 1:
+            # Not laid out yet: fall back to the configured window size
+            label_width, label_height = map(int, Settings.CAMERA_WINDOW_SIZE.split('x'))
+        scale = min(label_width / frame_width, label_height / frame_height)
+        return max(1, int(frame_width * scale)), max(1, int(frame_height * scale))
+
     def update_camera_feed(self, frame):
         """Update the camera feed display"""
+        # Imported on the first frame rather than at startup, so the window appears without waiting on them
+        import cv2
+        from PIL import Image, ImageTk
+
+        # Shrink first so the colour conversion and Tk upload only touch display-sized pixels
+        width, height = self._display_size(frame)
+        if (width, height) != (frame.shape[1], frame.shape[0]):
+            interpolation = cv2.INTER_AREA if width < frame.shape[1] else cv2.INTER_LINEAR
+            frame = cv2.resize(frame, (width, height), interpolation=interpolation)
         img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        img_tk = ImageTk.PhotoImage(image=img)
-        self.camera_label.config(image=img_tk)
-        self.camera_label.image = img_tk
\ No newline at end of file
+
+        if self._photo is None or self._photo_size != (width, height):
+            self._photo = ImageTk.PhotoImage(image=img)
+            self._photo_size = (width, height)
+            self.camera_label.config(image=self._photo)
+            self.camera_label.image = self._photo
+        else:
+            self._photo.paste(img)
+
+    def update_overlay(self, text):
+        """Show FPS/latency text over the feed when the overlay is enabled"""
+        if self.overlay_label is not None:
+            self.overlay_label.config(text=text)
+            self.overlay_label.lift()
+
+    def set_status(self, status):
+        """Show a startup status next to the window title (None clears it)"""
+        title = f"{Settings.PROJECT_NAME} - Camera Feed"
+        if status:
+            title = f"{title} ({status})"
+        if self.window.title() != title:
+            self.window.title(title)
@@ -10,6 +10,8 @@ class ClassificationWindow:
         self.window.title(f"{Settings.PROJECT_NAME} - Classified Objects")
         self.window.geometry(Settings.CLASSIFICATION_WINDOW_SIZE)
         self.frames = {}
+        self._detected = set()  # classes currently shown as detected
+        self._shown = {}  # class -> thumbnail array its tile was last drawn from
         self._setup_frames()
 
     def _setup_frames(self):
@@ -42,12 +44,63 @@ class ClassificationWindow:
         for i in range((len(Settings.CLASS_NAMES) + 4) // 5):
             self.window.grid_rowconfigure(i, weight=1)
 
-    def update_detection(self, class_name, image=None, detected=False):
-        """Update the display for a detected or non-detected class"""
+    def _set_image(self, class_name, image):
+        img_label = self.frames[class_name]["img_label"]
+        img_label.config(image=image if image is not None else '')
+        img_label.image = image
+
+    def _set_status(self, class_name, detected):
         if detected:
-            self.frames[class_name]["img_label"].config(image=image)
-            self.frames[class_name]["img_label"].image = image
             self.frames[class_name]["detected"].config(text="Detected", fg="green")
         else:
-            self.frames[class_name]["img_label"].config(image='')
             self.frames[class_name]["detected"].config(text="Not Detected", fg="red")
+
+    def update_detection(self, class_name, image=None, detected=False):
+        """Update the display for a detected or non-detected class"""
+        self._set_image(class_name, image if detected else None)
+        self._shown.pop(class_name, None)
+        if detected != (class_name in self._detected):
+            self._set_status(class_name, detected)
+        if detected:
+            self._detected.add(class_name)
+        else:
+            self._detected.discard(class_name)
+
+    def apply_frame(self, thumbnails, make_photo=None):
+        """
+        Bring the window to one frame's detection state, touching only classes that change
+        Args:
+            thumbnails: {class_name: thumbnail} for every class detected in the frame
+            make_photo: Callable turning a thumbnail into a Tk image
+        Returns:
+            Number of classes whose widgets were reconfigured
+
+        Work is proportional to the number of transitions, not the number of
+        classes; classes sharing one thumbnail array share one Tk image. A
+        tile is redrawn whenever its thumbnail is a different array from the
+        one it shows, so nothing is missed when intermediate results were
+        dropped before reaching the window.
+        """
+        current = thumbnails.keys()
+        appeared = current - self._detected
+        disappeared = self._detected - current
+        refreshed = {class_name for class_name in current
+                     if self._shown.get(class_name) is not thumbnails[class_name]}
+
+        photos = {}
+        for class_name in refreshed:
+            thumbnail = thumbnails[class_name]
+            photo = photos.get(id(thumbnail))
+            if photo is None:
+                photo = photos[id(thumbnail)] = make_photo(thumbnail)
+            self._set_image(class_name, photo)
+            self._shown[class_name] = thumbnail
+        for class_name in appeared:
+            self._set_status(class_name, True)
+        for class_name in disappeared:
+            self._set_image(class_name, None)
+            self._shown.pop(class_name, None)
+            self._set_status(class_name, False)
+
+        self._detected = set(current)
+        return len(refreshed | disappeared)
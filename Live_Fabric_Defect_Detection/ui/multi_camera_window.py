@@ -0,0 +1,65 @@
+# ui/multi_camera_window.py
+import math
+import tkinter as tk
+from config.settings import Settings
+
+class MultiCameraWindow:
+    """Grid of station camera feeds with per-source detections and stats"""
+
+    def __init__(self, sources):
+        self.window = tk.Tk()
+        self.window.title(f"{Settings.PROJECT_NAME} - Station Cameras")
+        self.window.configure(bg="#f0f0f0")
+        self.tiles = {}
+        self._setup_ui(sources)
+
+    def _setup_ui(self, sources):
+        """Setup one feed tile per source"""
+        columns = max(1, math.ceil(math.sqrt(len(sources))))
+        for i, source in enumerate(sources):
+            frame = tk.Frame(self.window, bg='white', borderwidth=2, relief="groove")
+            frame.grid(row=i // columns, column=i % columns, padx=5, pady=5, sticky='nsew')
+
+            tk.Label(frame, text=source, font=("Arial", 10, 'bold')).pack(pady=(5, 0))
+            feed = tk.Label(frame, bg='black', width=Settings.MULTI_FEED_WIDTH,
+                            height=Settings.MULTI_FEED_HEIGHT)
+            feed.pack()
+            detected = tk.Label(frame, text="Not Detected", font=("Arial", 10, 'italic'), fg="red")
+            detected.pack()
+            stats = tk.Label(frame, text="", font=("Arial", 8))
+            stats.pack(pady=(0, 5))
+            self.tiles[source] = {"feed": feed, "detected": detected, "stats": stats}
+
+        for i in range(columns):
+            self.window.grid_columnconfigure(i, weight=1)
+
+    def set_status(self, status):
+        """Show a startup status next to the window title (None clears it)"""
+        title = f"{Settings.PROJECT_NAME} - Station Cameras"
+        if status:
+            title = f"{title} ({status})"
+        if self.window.title() != title:
+            self.window.title(title)
+
+    def update_source(self, source, frame, detected_classes):
+        """Show the latest processed frame and detections of one source"""
+        # Imported on the first frame rather than at startup, so the window appears without waiting on them
+        import cv2
+        from PIL import Image, ImageTk
+
+        tile = self.tiles[source]
+        img = cv2.resize(frame, (Settings.MULTI_FEED_WIDTH, Settings.MULTI_FEED_HEIGHT),
+                         interpolation=cv2.INTER_AREA)
+        img_tk = ImageTk.PhotoImage(image=Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)))
+        tile["feed"].config(image=img_tk)
+        tile["feed"].image = img_tk
+        if detected_classes:
+            tile["detected"].config(text=", ".join(sorted(set(detected_classes))), fg="green")
+        else:
+            tile["detected"].config(text="Not Detected", fg="red")
+
+    def update_stats(self, source, stats):
+        """Show per-source FPS and latency"""
+        self.tiles[source]["stats"].config(
+            text=f"{stats['inference_fps']:.1f} FPS | {stats['latency_ms']:.0f} ms | "
+                 f"{stats['dropped_frames']} dropped")
@@ -1,47 +1,150 @@
 # utils/camera.py
+import threading
+import time
+from collections import namedtuple
 import cv2
 from config.settings import Settings
+from utils.metrics import registry
+
+# A captured frame together with when it was grabbed and its position in the stream
+FramePacket = namedtuple('FramePacket', ['frame', 'timestamp', 'seq'])
 
 class Camera:
     """Handle video capture from multiple camera sources"""
-    
-    def __init__(self, source=None):
+
+    def __init__(self, source=None, background_grab=None, fallback=True):
         """
         Initialize camera with specified source
         Args:
-            source: Either 'LAPTOP' or 'IP_CAMERA' or None (uses default)
+            source: A key of Settings.CAMERA_SOURCES or None (uses default)
+            background_grab: Keep draining the source on a background thread so reads
+                always return the newest frame (None uses Settings.CAMERA_BACKGROUND_GRAB)
+            fallback: Try the other of 'LAPTOP'/'IP_CAMERA' if the source fails to open
         """
         self.source = source or Settings.DEFAULT_CAMERA
+        self.fallback = fallback
+        self.background_grab = (Settings.CAMERA_BACKGROUND_GRAB
+                                if background_grab is None else background_grab)
+        self._lock = threading.Lock()
         self.cap = self._initialize_camera()
 
+        # Single-slot buffer shared with the grab thread
+        self._frame_ready = threading.Condition()
+        self._latest = None
+        self._seq = 0
+        self._last_read_seq = 0
+        self._last_grab_time = None
+        self.frames_grabbed = 0
+        self.dropped_frames = 0
+        self.source_fps = 0.0
+
+        self._stop_grab = threading.Event()
+        self._grab_thread = None
+        if self.background_grab:
+            self._start_grabber()
+
     def _initialize_camera(self):
         """Initialize the camera with the selected source, with fallback to alternate source if needed"""
         camera_source = Settings.CAMERA_SOURCES[self.source]
         cap = cv2.VideoCapture(camera_source)
-        
+
+        if not cap.isOpened() and not self.fallback:
+            raise RuntimeError(f"Error: Could not open video source {self.source}.")
+
         if not cap.isOpened():
             # Try the alternative source if the primary one fails
             alternative_source = 'IP_CAMERA' if self.source == 'LAPTOP' else 'LAPTOP'
             alternative_camera_source = Settings.CAMERA_SOURCES[alternative_source]
             cap = cv2.VideoCapture(alternative_camera_source)
-            
+
             if not cap.isOpened():
                 raise RuntimeError("Error: Could not open any video source. Please check the camera connections and settings.")
             else:
                 print(f"Warning: Primary camera source ({self.source}) failed, using alternative source ({alternative_source})")
-        
+
         return cap
 
+    def _start_grabber(self):
+        """Start the background thread that keeps the single-slot buffer fresh"""
+        self._stop_grab.clear()
+        self._grab_thread = threading.Thread(target=self._grab_loop, name="camera-grab", daemon=True)
+        self._grab_thread.start()
+
+    def _grab_loop(self):
+        """Continuously read the source so OpenCV's internal buffer never backs up"""
+        while not self._stop_grab.is_set():
+            with registry.time('capture'), self._lock:
+                ret, frame = self.cap.read()
+            if not ret:
+                self._stop_grab.wait(Settings.CAPTURE_RETRY_DELAY)
+                continue
+            self._publish(frame, time.time())
+
+    def _publish(self, frame, timestamp):
+        """Store a freshly grabbed frame and update the counters"""
+        with self._frame_ready:
+            # The previous frame was overwritten before anyone read it
+            if self._latest is not None and self._latest.seq > self._last_read_seq:
+                self.dropped_frames += 1
+
+            if self._last_grab_time is not None and timestamp > self._last_grab_time:
+                instant_fps = 1.0 / (timestamp - self._last_grab_time)
+                alpha = Settings.CAMERA_FPS_SMOOTHING
+                self.source_fps = instant_fps if self.source_fps == 0 else (
+                    alpha * instant_fps + (1 - alpha) * self.source_fps)
+            self._last_grab_time = timestamp
+
+            self._seq += 1
+            self.frames_grabbed += 1
+            self._latest = FramePacket(frame, timestamp, self._seq)
+            self._frame_ready.notify_all()
+        registry.tick('capture')
+
+    def read_packet(self, timeout=None):
+        """
+        Read the newest frame along with its capture timestamp and sequence number
+        Args:
+            timeout: Seconds to wait for a frame newer than the last one read
+                (None uses Settings.CAMERA_READ_TIMEOUT, background grab mode only)
+        """
+        if not self.background_grab:
+            with registry.time('capture'), self._lock:
+                ret, frame = self.cap.read()
+            if not ret:
+                raise RuntimeError("Error: Failed to capture image")
+            self._publish(frame, time.time())
+
+        timeout = Settings.CAMERA_READ_TIMEOUT if timeout is None else timeout
+        with self._frame_ready:
+            has_new = self._frame_ready.wait_for(
+                lambda: self._latest is not None and self._latest.seq > self._last_read_seq,
+                timeout)
+            if not has_new:
+                raise RuntimeError("Error: Failed to capture image")
+            self._last_read_seq = self._latest.seq
+            return self._latest
+
     def read_frame(self):
         """Read a single frame from the video source"""
-        ret, frame = self.cap.read()
-        if not ret:
-            raise RuntimeError("Error: Failed to capture image")
-        return frame
+        return self.read_packet().frame
+
+    def stats(self):
+        """Capture counters showing how far consumers lag behind the source"""
+        with self._frame_ready:
+            return {
+                'source': self.source,
+                'source_fps': self.source_fps,
+                'frames_grabbed': self.frames_grabbed,
+                'dropped_frames': self.dropped_frames,
+            }
 
     def release(self):
         """Release the video capture resource"""
-        self.cap.release()
+        self._stop_grab.set()
+        if self._grab_thread is not None and self._grab_thread is not threading.current_thread():
+            self._grab_thread.join(timeout=1.0)
+        with self._lock:
+            self.cap.release()
 
     def switch_camera(self, new_source):
         """
@@ -50,8 +153,13 @@ class Camera:
             new_source: Either 'LAPTOP' or 'IP_CAMERA'
         """
         if new_source in Settings.CAMERA_SOURCES:
-            self.release()
-            self.source = new_source
-            self.cap = self._initialize_camera()
+            # Hold the lock across the swap so a capture thread never reads a released cap
+            with self._lock:
+                self.cap.release()
+                self.source = new_source
+                self.cap = self._initialize_camera()
+            with self._frame_ready:
+                self._last_grab_time = None
+                self.source_fps = 0.0
         else:
             raise ValueError(f"Invalid camera source. Choose from: {list(Settings.CAMERA_SOURCES.keys())}")
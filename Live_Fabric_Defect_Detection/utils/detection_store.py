@@ -0,0 +1,327 @@
+# utils/detection_store.py
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def difference_hash(frame, hash_size=8):
+    """64-bit perceptual dHash: brightness gradient signs of a tiny grayscale copy"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _to_sqlite_int(value):
+    """Map an unsigned 64-bit hash into SQLite's signed INTEGER range"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+class DetectionStore:
+    """Managed directory of saved detection frames
+
+    Saves are rate limited per class and skipped when the frame is
+    perceptually identical to one recently stored for that class; with
+    several cameras both are tracked per (source, class). Every
+    stored file is recorded in a SQLite index, so listing, quota checks and
+    purges never need to scan the directory. A janitor thread removes the
+    oldest files once the directory exceeds its size or age quota.
+    """
+
+    def __init__(self, directory, writer, index_path, cooldown=2.0, dedup_max_distance=6,
+                 dedup_history=8, max_bytes=None, max_age=None, janitor_interval=60):
+        """
+        Args:
+            directory: Folder the frames are written to
+            writer: AsyncImageWriter that performs the actual encoding and writes
+            index_path: SQLite file holding one row per stored frame
+            cooldown: Minimum seconds between two saves of the same class
+            dedup_max_distance: dHash Hamming distance at or below which frames count as duplicates
+            dedup_history: Recent hashes remembered per class for deduplication
+            max_bytes: Size quota for the directory (None for unlimited)
+            max_age: Seconds a frame is kept (None for forever)
+            janitor_interval: Seconds between quota enforcement passes
+        """
+        self.directory = directory
+        self.writer = writer
+        self.cooldown = cooldown
+        self.dedup_max_distance = dedup_max_distance
+        self.dedup_history = dedup_history
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.janitor_interval = janitor_interval
+
+        self._last_saved = {}
+        self._recent_hashes = {}
+        self._seq = itertools.count(1)
+        self.skipped_cooldown = 0
+        self.skipped_duplicate = 0
+
+        os.makedirs(directory, exist_ok=True)
+        needs_rebuild = not os.path.exists(index_path)
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(index_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS detections ("
+            "id INTEGER PRIMARY KEY, path TEXT UNIQUE, class_name TEXT, "
+            "created REAL, size INTEGER, phash INTEGER, source TEXT)")
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(detections)")}
+        if 'source' not in columns:  # index created before multi-camera saves were recorded
+            self._db.execute("ALTER TABLE detections ADD COLUMN source TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_detections_created ON detections(created)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_detections_class ON detections(class_name, created)")
+        self._db.commit()
+        with self._db_lock:
+            self.total_bytes = self._query_total_bytes()
+
+        self._stop_event = threading.Event()
+        self._janitor = threading.Thread(target=self._janitor_loop, args=(needs_rebuild,),
+                                         name="detection-janitor", daemon=True)
+        self._janitor.start()
+
+    def _query_total_bytes(self):
+        """Size of every indexed file; the caller holds _db_lock"""
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM detections").fetchone()[0]
+
+    def _admit(self, image, class_name, now, source=None):
+        """dHash of image if a save of class_name is allowed now, None if rate limited or a duplicate"""
+        key = (source, class_name)
+        if now - self._last_saved.get(key, 0.0) < self.cooldown:
+            self.skipped_cooldown += 1
+            return None
+
+        image_hash = difference_hash(image)
+        recent = self._recent_hashes.setdefault(key, deque(maxlen=self.dedup_history))
+        if any(hamming_distance(image_hash, h) <= self.dedup_max_distance for h in recent):
+            self.skipped_duplicate += 1
+            return None
+        return image_hash
+
+    def _commit(self, class_name, now, image_hash, source=None):
+        self._last_saved[(source, class_name)] = now
+        self._recent_hashes[(source, class_name)].append(image_hash)
+
+    def _new_path(self, class_name, now):
+        return os.path.join(self.directory, f"{class_name}_{int(now * 1000)}_{next(self._seq)}.jpg")
+
+    def _on_written(self, class_name, now, image_hash, source=None):
+        return lambda path, size: self._index(path, class_name, now, size, image_hash, source)
+
+    def save(self, frame, class_name, now=None, source=None):
+        """
+        Queue a frame for storage unless it is rate limited or a near-duplicate
+        Args:
+            source: Camera the frame came from, indexed alongside the class (None for a single camera)
+        Returns:
+            The path the frame will be written to, or None if it was skipped
+        """
+        now = time.time() if now is None else now
+        frame_hash = self._admit(frame, class_name, now, source)
+        if frame_hash is None:
+            return None
+
+        path = self._new_path(class_name, now)
+        if not self.writer.submit(path, frame, self._on_written(class_name, now, frame_hash, source)):
+            return None
+        self._commit(class_name, now, frame_hash, source)
+        return path
+
+    def save_crops(self, crops, class_name, now=None, source=None):
+        """
+        Queue one file per crop of a class; cooldown and dedup apply to the class as a whole
+        Returns:
+            The path of the first crop, or None if the class was skipped
+        """
+        if not crops:
+            return None
+        now = time.time() if now is None else now
+        crop_hash = self._admit(crops[0], class_name, now, source)
+        if crop_hash is None:
+            return None
+
+        paths = []
+        for crop in crops:
+            path = self._new_path(class_name, now)
+            if self.writer.submit(path, crop, self._on_written(class_name, now, crop_hash, source)):
+                paths.append(path)
+        if not paths:
+            return None
+        self._commit(class_name, now, crop_hash, source)
+        return paths[0]
+
+    def save_linked(self, frame, class_names, now=None, source=None):
+        """
+        Write the frame once and hardlink it under every other admitted class
+        Returns:
+            {class_name: path} for the classes that were not skipped
+        """
+        now = time.time() if now is None else now
+        admitted = {}
+        for class_name in class_names:
+            frame_hash = self._admit(frame, class_name, now, source)
+            if frame_hash is not None:
+                admitted[class_name] = frame_hash
+        if not admitted:
+            return {}
+
+        paths = {class_name: self._new_path(class_name, now) for class_name in admitted}
+        primary, *others = admitted
+        # Each link is indexed under its own class; the hash is the same frame's for all of them
+        frame_hash = admitted[primary]
+        class_of = {path: class_name for class_name, path in paths.items()}
+        on_written = lambda path, size: self._index(path, class_of[path], now, size, frame_hash, source)
+        if not self.writer.submit(paths[primary], frame, on_written, [paths[c] for c in others]):
+            return {}
+        for class_name, image_hash in admitted.items():
+            self._commit(class_name, now, image_hash, source)
+        return paths
+
+    def _index(self, path, class_name, created, size, frame_hash, source=None):
+        """Record a frame once the writer has put it on disk"""
+        with self._db_lock:
+            # A path can be indexed twice (e.g. by rebuild_index at startup); count its size once
+            previous = self._db.execute("SELECT size FROM detections WHERE path = ?", (path,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO detections (path, class_name, created, size, phash, source) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, class_name, created, size, _to_sqlite_int(frame_hash), source))
+            self._db.commit()
+            self.total_bytes += size - (previous[0] if previous else 0)
+
+    def list_detections(self, class_name=None, since=None, until=None, limit=None, source=None):
+        """Indexed lookup of stored frames as (path, class_name, created, size) rows, oldest first"""
+        query = "SELECT path, class_name, created, size FROM detections WHERE 1=1"
+        params = []
+        if class_name is not None:
+            query += " AND class_name = ?"
+            params.append(class_name)
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
+        if since is not None:
+            query += " AND created >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND created < ?"
+            params.append(until)
+        query += " ORDER BY created"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._db_lock:
+            return self._db.execute(query, params).fetchall()
+
+    def _delete_rows(self, rows):
+        """Remove files and their index rows; rows are (id, path, size)"""
+        for _, path, _ in rows:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error deleting image {path}: {e}")
+        with self._db_lock:
+            self._db.executemany("DELETE FROM detections WHERE id = ?", [(row[0],) for row in rows])
+            self._db.commit()
+            self.total_bytes -= sum(row[2] for row in rows)
+
+    def purge(self, class_name=None, older_than=None, batch_size=1000):
+        """Delete stored frames by class and/or age (everything if no filter); returns the count"""
+        query = "SELECT id, path, size FROM detections WHERE 1=1"
+        params = []
+        if class_name is not None:
+            query += " AND class_name = ?"
+            params.append(class_name)
+        if older_than is not None:
+            query += " AND created < ?"
+            params.append(older_than)
+        query += " ORDER BY created LIMIT ?"
+
+        removed = 0
+        while True:
+            with self._db_lock:
+                rows = self._db.execute(query, params + [batch_size]).fetchall()
+            if not rows:
+                return removed
+            self._delete_rows(rows)
+            removed += len(rows)
+
+    def enforce_quota(self, now=None, batch_size=500):
+        """Drop frames past the age limit, then the oldest frames until under the size limit"""
+        now = time.time() if now is None else now
+        removed = 0
+        if self.max_age is not None:
+            removed += self.purge(older_than=now - self.max_age, batch_size=batch_size)
+        while self.max_bytes is not None and self.total_bytes > self.max_bytes:
+            with self._db_lock:
+                rows = self._db.execute(
+                    "SELECT id, path, size FROM detections ORDER BY created LIMIT ?",
+                    (batch_size,)).fetchall()
+            if not rows:
+                break
+            # Only delete as many of the oldest as needed to get back under quota
+            excess = self.total_bytes - self.max_bytes
+            needed = []
+            for row in rows:
+                needed.append(row)
+                excess -= row[2]
+                if excess <= 0:
+                    break
+            self._delete_rows(needed)
+            removed += len(needed)
+        return removed
+
+    def rebuild_index(self):
+        """Index frames that are on disk but not yet in the index (one directory scan)"""
+        rows = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                stat = entry.stat()
+                # Strip the timestamp/sequence suffix: "<class>_<ms>_<seq>.jpg" or "<class>_<ts>.jpg"
+                class_name = re.sub(r'(_\d+)+$', '', os.path.splitext(entry.name)[0])
+                rows.append((entry.path, class_name, stat.st_mtime, stat.st_size, None))
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO detections (path, class_name, created, size, phash) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+            # Recount under the lock so concurrent _index and _delete_rows updates are not lost
+            self.total_bytes = self._query_total_bytes()
+        return len(rows)
+
+    def _janitor_loop(self, needs_rebuild):
+        if needs_rebuild:
+            count = self.rebuild_index()
+            if count:
+                print(f"Indexed {count} existing detection images")
+        while True:
+            try:
+                removed = self.enforce_quota()
+                if removed:
+                    print(f"Detection store janitor removed {removed} images")
+            except Exception as e:
+                print(f"Error enforcing detection store quota: {e}")
+            if self._stop_event.wait(self.janitor_interval):
+                break
+
+    def close(self):
+        """Stop the janitor and close the index"""
+        self._stop_event.set()
+        self._janitor.join(timeout=1.0)
+        with self._db_lock:
+            self._db.close()
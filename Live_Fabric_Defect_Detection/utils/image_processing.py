@@ -1,35 +1,79 @@
 # utils/image_processing.py
 import cv2
-import os
-import time
+import numpy as np
 from PIL import Image, ImageTk
 from config.settings import Settings
+from detection_common.async_writer import AsyncImageWriter, crop_box
+from utils.detection_store import DetectionStore
+from utils.metrics import registry
 
 class ImageProcessor:
     """Handle image processing and storage operations"""
-    
-    @staticmethod
-    def save_detected_object(frame, class_name):
-        """Save detected object frame to disk"""
-        timestamp = int(time.time())
-        img_save_path = os.path.join(Settings.DETECTED_OBJECTS_DIR, 
-                                    f"{class_name}_{timestamp}.jpg")
-        cv2.imwrite(img_save_path, frame)
-        return img_save_path
+
+    def __init__(self):
+        # Drop rather than block: a slow disk must never stall the inference thread
+        self.writer = AsyncImageWriter(Settings.SAVE_QUEUE_SIZE, Settings.SAVE_ENCODE_WORKERS,
+                                       Settings.SAVE_JPEG_QUALITY, block=False, registry=registry)
+        self.store = DetectionStore(
+            Settings.DETECTED_OBJECTS_DIR, self.writer, Settings.STORE_INDEX_PATH,
+            cooldown=Settings.STORE_CLASS_COOLDOWN,
+            dedup_max_distance=Settings.STORE_DEDUP_MAX_DISTANCE,
+            dedup_history=Settings.STORE_DEDUP_HISTORY,
+            max_bytes=Settings.STORE_MAX_BYTES,
+            max_age=Settings.STORE_MAX_AGE,
+            janitor_interval=Settings.STORE_JANITOR_INTERVAL)
+
+    def save_detected_object(self, frame, class_name):
+        """Queue a detected object frame for storage; returns its path, or None if skipped"""
+        return self.store.save(frame, class_name)
+
+    def save_detections(self, frame, boxes, class_ids, class_names, source=None):
+        """
+        Save one frame's detections according to Settings.SAVE_MODE
+        Args:
+            boxes: (N, 4) xyxy boxes
+            class_ids: (N,) class ids, ids outside class_names are ignored
+            source: Camera the frame came from when several are saved into one store
+        Returns:
+            {class_name: saved path} for the classes that were not skipped
+        """
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        class_ids = np.asarray(class_ids, dtype=np.int64)
+        boxes_by_class = {class_names[class_id]: boxes[class_ids == class_id]
+                          for class_id in np.unique(class_ids).tolist() if 0 <= class_id < len(class_names)}
+
+        if Settings.SAVE_MODE == 'frame_links':
+            return self.store.save_linked(frame, list(boxes_by_class), source=source)
+
+        saved_paths = {}
+        for class_name, class_boxes in boxes_by_class.items():
+            if Settings.SAVE_MODE == 'crops':
+                crops = [crop_box(frame, box, Settings.SAVE_CROP_PADDING) for box in class_boxes]
+                path = self.store.save_crops(crops, class_name, source=source)
+            else:
+                path = self.store.save(frame, class_name, source=source)
+            if path is not None:
+                saved_paths[class_name] = path
+        return saved_paths
 
     @staticmethod
-    def create_display_image(image_path):
-        """Create a Tkinter-compatible image for display"""
-        img = Image.open(image_path)
-        img = img.resize((Settings.FRAME_WIDTH, Settings.FRAME_HEIGHT), Image.LANCZOS)
-        return ImageTk.PhotoImage(image=img)
+    def make_thumbnail(frame):
+        """Downscale a BGR frame once to the classification tile size, as RGB"""
+        with registry.time('thumbnail'):
+            small = cv2.resize(frame, (Settings.FRAME_WIDTH, Settings.FRAME_HEIGHT),
+                               interpolation=cv2.INTER_AREA)
+            return cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
 
     @staticmethod
-    def cleanup_detected_objects():
+    def create_display_image(thumbnail):
+        """Create a Tkinter-compatible image from an in-memory RGB thumbnail"""
+        return ImageTk.PhotoImage(image=Image.fromarray(thumbnail))
+
+    def close(self):
+        """Flush queued writes, then close the store index"""
+        self.writer.close()
+        self.store.close()
+
+    def cleanup_detected_objects(self):
         """Remove all saved detected object images"""
-        for filename in os.listdir(Settings.DETECTED_OBJECTS_DIR):
-            file_path = os.path.join(Settings.DETECTED_OBJECTS_DIR, filename)
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"Error deleting image {file_path}: {e}")
\ No newline at end of file
+        return self.store.purge()
\ No newline at end of file
@@ -0,0 +1,5 @@
+# utils/metrics.py
+from detection_common.metrics import MetricsRegistry
+
+# Shared registry every pipeline stage reports into
+registry = MetricsRegistry('ewaste_live')
@@ -0,0 +1,55 @@
+# utils/motion.py
+import cv2
+import numpy as np
+
+class MotionGate:
+    """Cheap change detector that decides whether a frame needs a fresh YOLO pass
+
+    Each frame is reduced to a tiny grayscale thumbnail and compared with the
+    thumbnail of the last frame that was actually inferred. Comparing against
+    the last inferred frame, rather than the previous frame, means slow drift
+    still adds up and triggers a refresh eventually.
+    """
+
+    def __init__(self, threshold, downscale_width=64, force_refresh_frames=30):
+        """
+        Args:
+            threshold: Mean absolute pixel difference (0-255) above which the scene counts as changed
+            downscale_width: Width of the comparison thumbnail in pixels
+            force_refresh_frames: Run inference at least once every this many frames
+        """
+        self.threshold = threshold
+        self.downscale_width = downscale_width
+        self.force_refresh_frames = force_refresh_frames
+        self._reference = None
+        self._since_refresh = 0
+        self.frames_seen = 0
+        self.frames_skipped = 0
+
+    def _signature(self, frame):
+        height, width = frame.shape[:2]
+        size = (self.downscale_width, max(1, height * self.downscale_width // width))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+    def should_infer(self, frame):
+        """Return True if the frame changed enough (or the refresh interval elapsed)"""
+        self.frames_seen += 1
+        signature = self._signature(frame)
+        reference = self._reference
+
+        if (reference is None or reference.shape != signature.shape
+                or self._since_refresh >= self.force_refresh_frames
+                or np.abs(signature - reference).mean() > self.threshold):
+            self._reference = signature
+            self._since_refresh = 0
+            return True
+
+        self._since_refresh += 1
+        self.frames_skipped += 1
+        return False
+
+    @property
+    def skip_ratio(self):
+        """Fraction of frames that reused the previous detection result"""
+        return self.frames_skipped / self.frames_seen if self.frames_seen else 0.0
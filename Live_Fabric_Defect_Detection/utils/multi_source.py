@@ -0,0 +1,137 @@
+# utils/multi_source.py
+import threading
+import time
+from config.settings import Settings
+from utils.camera import Camera
+from utils.pipeline import FrameResult, LatestValueQueue
+
+
+class SourceStats:
+    """Rolling per-source throughput and capture-to-result latency"""
+
+    def __init__(self, smoothing):
+        self.smoothing = smoothing
+        self.fps = 0.0
+        self.latency = 0.0
+        self.frames_served = 0
+        self.last_served = 0.0
+
+    def record(self, capture_time, done_time):
+        """Account for one frame of this source coming back from the model"""
+        latency = done_time - capture_time
+        if self.frames_served and done_time > self.last_served:
+            instant_fps = 1.0 / (done_time - self.last_served)
+            self.fps = self.smoothing * instant_fps + (1 - self.smoothing) * self.fps
+            self.latency = self.smoothing * latency + (1 - self.smoothing) * self.latency
+        else:
+            self.latency = latency
+        self.frames_served += 1
+        self.last_served = done_time
+
+
+class MultiSourceScheduler(threading.Thread):
+    """Batches the newest frame of every station camera into one predict call
+
+    Every source keeps its own background grab thread (see Camera). Each
+    round the scheduler visits sources in least-recently-served order and
+    takes at most one new frame from each, up to Settings.MULTI_MAX_BATCH.
+    It never waits on a source that has nothing new, so a slow or stalled
+    stream cannot hold back the others, and a fast stream cannot take more
+    than one slot per batch.
+    """
+
+    def __init__(self, sources, detector, sinks=None, event_log=None):
+        """
+        Args:
+            sources: Keys of Settings.CAMERA_SOURCES to open
+            detector: LiveEWasteDetector used for batched prediction
+            sinks: Optional {source: callable(FrameResult, Detections)} called from the scheduler thread
+            event_log: Optional DetectionEventLog receiving every detection
+        """
+        super().__init__(name="multi-source-scheduler", daemon=True)
+        self.detector = detector
+        self.cameras = {name: Camera(name, background_grab=True, fallback=False) for name in sources}
+        self.results = {name: LatestValueQueue() for name in sources}
+        self.sinks = sinks or {}
+        self.event_log = event_log
+        self.source_stats = {name: SourceStats(Settings.CAMERA_FPS_SMOOTHING) for name in sources}
+        self.stop_event = threading.Event()
+        self.batches = 0
+
+    def _gather(self):
+        """Pick up to MULTI_MAX_BATCH new frames, oldest-served sources first"""
+        batch = []
+        order = sorted(self.cameras, key=lambda name: self.source_stats[name].last_served)
+        for name in order:
+            if len(batch) >= Settings.MULTI_MAX_BATCH:
+                break
+            try:
+                packet = self.cameras[name].read_packet(timeout=0)
+            except RuntimeError:
+                continue  # nothing new from this source yet
+            if time.time() - packet.timestamp > Settings.MULTI_MAX_FRAME_AGE:
+                continue
+            batch.append((name, packet))
+        return batch
+
+    def run(self):
+        while not self.stop_event.is_set():
+            # Cameras keep grabbing while the model loads; their frames are simply not inferred
+            if not self.detector.ready.wait(Settings.PIPELINE_POLL_TIMEOUT):
+                continue
+            if self.detector.backend is None:
+                return  # loading failed, nothing to run
+
+            batch = self._gather()
+            if not batch:
+                self.stop_event.wait(Settings.MULTI_IDLE_WAIT)
+                continue
+
+            try:
+                outputs = self.detector.predict_batch([packet.frame for _, packet in batch])
+            except Exception as e:
+                print(f"Error running batched inference: {e}")
+                continue
+
+            done = time.time()
+            self.batches += 1
+            for (name, packet), detections in zip(batch, outputs):
+                self.source_stats[name].record(packet.timestamp, done)
+                detections = self.detector.get_detections(detections)
+                if self.event_log is not None:
+                    boxes, confs, class_ids = detections
+                    self.event_log.log(name, class_ids, confs, boxes, f"{name}:{packet.seq}", packet.timestamp)
+                result = FrameResult(packet, self.detector.postprocess.names(detections), {})
+                self.results[name].put(result)
+                sink = self.sinks.get(name)
+                if sink is not None:
+                    try:
+                        sink(result, detections)
+                    except Exception as e:
+                        print(f"Error in result sink for {name}: {e}")
+
+    def latest_result(self, source):
+        """Newest FrameResult for a source since the last call, or None"""
+        return self.results[source].get_nowait()
+
+    def stop(self, timeout=1.0):
+        """Stop scheduling and release every camera"""
+        self.stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+        for camera in self.cameras.values():
+            camera.release()
+
+    def stats(self):
+        """Per-source FPS, latency in ms and dropped frames"""
+        stats = {}
+        for name, camera in self.cameras.items():
+            source = self.source_stats[name]
+            stats[name] = {
+                'source_fps': camera.source_fps,
+                'inference_fps': source.fps,
+                'latency_ms': source.latency * 1000,
+                'frames_served': source.frames_served,
+                'dropped_frames': camera.dropped_frames,
+            }
+        return stats
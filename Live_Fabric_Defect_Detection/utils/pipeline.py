@@ -0,0 +1,286 @@
+# utils/pipeline.py
+import threading
+from config.settings import Settings
+from utils.motion import MotionGate
+from models.tracker import IoUTracker
+from utils.metrics import registry
+
+
+class LatestValueQueue:
+    """Single-slot queue that only ever holds the newest item
+
+    Putting into a full slot overwrites the stale item instead of blocking,
+    so a slow consumer always sees the most recent value and never a backlog.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self.dropped = 0
+
+    def put(self, item):
+        """Store item, replacing (and counting) any unconsumed one"""
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Wait for an item and take it, or return None on timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._has_item, timeout):
+                return None
+            return self._take()
+
+    def get_nowait(self):
+        """Take the current item if there is one, else return None"""
+        with self._cond:
+            if not self._has_item:
+                return None
+            return self._take()
+
+    def _take(self):
+        item = self._item
+        self._item = None
+        self._has_item = False
+        return item
+
+
+class FrameResult:
+    """Inference output for one captured frame, handed to the render step
+
+    thumbnails maps each detected class to an RGB thumbnail array; classes
+    detected in the same frame share one array, so the render step builds a
+    single PhotoImage for them. A class's array is only replaced when its
+    thumbnail changes, so the render step redraws just those classes.
+    tracks is a snapshot of (track_id, class_id, xyxy) when tracking is on.
+    """
+
+    def __init__(self, packet, detected_classes, saved_paths, tracks=(), thumbnails=None):
+        self.frame = packet.frame
+        self.seq = packet.seq
+        self.timestamp = packet.timestamp
+        self.detected_classes = detected_classes
+        self.saved_paths = saved_paths
+        self.tracks = list(tracks)
+        self.thumbnails = thumbnails or {}
+
+
+class CaptureThread(threading.Thread):
+    """Reads frames from the camera as fast as it delivers them"""
+
+    def __init__(self, camera, outputs, stop_event):
+        super().__init__(name="capture", daemon=True)
+        self.camera = camera
+        self.outputs = outputs
+        self.stop_event = stop_event
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                packet = self.camera.read_packet()
+            except RuntimeError as e:
+                print(f"Error capturing frame: {e}")
+                self.stop_event.wait(Settings.CAPTURE_RETRY_DELAY)
+                continue
+
+            for output in self.outputs:
+                output.put(packet)
+
+
+class InferenceThread(threading.Thread):
+    """Runs the detector on the newest captured frame and persists hits
+
+    With a tracker the detector only runs every Settings.DETECT_EVERY_N_FRAMES
+    frames; in between the tracker carries boxes forward, and a frame is
+    saved only when a new track is confirmed rather than on every frame.
+    """
+
+    def __init__(self, detector, image_processor, frames, results, stop_event,
+                 motion_gate=None, tracker=None, event_log=None, camera=None):
+        super().__init__(name="inference", daemon=True)
+        self.detector = detector
+        self.image_processor = image_processor
+        self.frames = frames
+        self.results = results
+        self.stop_event = stop_event
+        self.motion_gate = motion_gate
+        self.tracker = tracker
+        self.event_log = event_log
+        self.camera = camera
+        self._last_result = None
+        self._saved_paths = {}
+        self._thumbnails = {}
+        self._frames_since_detect = Settings.DETECT_EVERY_N_FRAMES
+
+    def run(self):
+        while not self.stop_event.is_set():
+            # Frames keep flowing to the display while the model loads; they are simply not inferred
+            if not self.detector.ready.wait(Settings.PIPELINE_POLL_TIMEOUT):
+                continue
+            if self.detector.backend is None:
+                return  # loading failed, nothing to run
+
+            packet = self.frames.get(timeout=Settings.PIPELINE_POLL_TIMEOUT)
+            if packet is None:
+                continue
+
+            try:
+                if self.tracker is not None:
+                    result = self._track(packet)
+                else:
+                    result = self._detect(packet)
+            except Exception as e:
+                print(f"Error running inference: {e}")
+                continue
+            registry.tick('results')
+            self.results.put(result)
+
+    def _scene_changed(self, frame):
+        if self.motion_gate is None:
+            return True
+        with registry.time('motion_gate'):
+            return self.motion_gate.should_infer(frame)
+
+    def _log_events(self, packet, boxes, class_ids, confs, saved_paths):
+        """Append this frame's detections to the event log, if one is configured"""
+        if self.event_log is None:
+            return
+        source = self.camera.source if self.camera is not None else None
+        frame_ref = next(iter(saved_paths.values()), None) or f"{source}:{packet.seq}"
+        self.event_log.log(source, class_ids, confs, boxes, frame_ref, packet.timestamp)
+
+    def _detect(self, packet):
+        """Run the detector on every frame the motion gate lets through"""
+        frame = packet.frame
+
+        # Static scene: reuse the previous detections instead of running YOLO again
+        if self._last_result is not None and not self._scene_changed(frame):
+            last = self._last_result
+            return FrameResult(packet, last.detected_classes, last.saved_paths,
+                               thumbnails=last.thumbnails)
+
+        detections = self.detector.get_detections(self.detector.predict(frame))
+        postprocess = self.detector.postprocess
+        detected_classes = postprocess.names(detections)
+        present = postprocess.present_names(detections)
+        boxes, confs, class_ids = detections
+        saved_paths = self.image_processor.save_detections(
+            frame, boxes, class_ids, self.detector.class_names)
+
+        # One downscale per frame, shared by every detected class
+        thumbnails = {}
+        if present:
+            thumbnail = self.image_processor.make_thumbnail(frame)
+            thumbnails = {class_name: thumbnail for class_name in present}
+
+        self._log_events(packet, boxes, class_ids, confs, saved_paths)
+
+        self._last_result = FrameResult(packet, detected_classes, saved_paths, thumbnails=thumbnails)
+        return self._last_result
+
+    def _track(self, packet):
+        """Advance the tracker and run the detector only every N frames"""
+        frame = packet.frame
+        class_names = self.detector.class_names
+        self.tracker.predict()
+        self._frames_since_detect += 1
+
+        if (self._frames_since_detect >= Settings.DETECT_EVERY_N_FRAMES
+                and self._scene_changed(frame)):
+            self._frames_since_detect = 0
+            detections = self.detector.predict(frame, conf=Settings.TRACKER_LOW_CONF)
+            # Low-confidence boxes stay in: the tracker's second association pass needs them
+            detections = self.detector.get_detections(detections, apply_thresholds=False)
+            boxes, confs, class_ids = detections
+            with registry.time('tracker_update'):
+                new_tracks = self.tracker.update(boxes, class_ids, confs)
+            frame_paths = {}
+            if new_tracks:
+                frame_paths = self.image_processor.save_detections(
+                    frame, [t.box for t in new_tracks], [t.class_id for t in new_tracks], class_names)
+                self._saved_paths.update(frame_paths)
+                thumbnail = self.image_processor.make_thumbnail(frame)
+                for track in new_tracks:
+                    class_name = class_names[track.class_id]
+                    self._thumbnails[class_name] = thumbnail
+            # Log only boxes that pass the class thresholds, as detect mode does
+            logged = self.detector.postprocess.threshold(detections)
+            self._log_events(packet, logged.xyxy, logged.class_ids, logged.confs, frame_paths)
+
+        active = self.tracker.active_tracks()
+        detected_classes = [class_names[t.class_id] for t in active]
+        saved_paths = {name: self._saved_paths[name]
+                       for name in set(detected_classes) if name in self._saved_paths}
+        thumbnails = {name: self._thumbnails[name]
+                      for name in set(detected_classes) if name in self._thumbnails}
+        tracks = [(t.track_id, t.class_id, t.box.copy()) for t in active]
+        return FrameResult(packet, detected_classes, saved_paths, tracks, thumbnails)
+
+
+class DetectionPipeline:
+    """Capture -> inference stages connected by latest-value queues
+
+    The capture thread feeds two single-slot queues: one for display and one
+    for inference. Each consumer takes whatever is newest when it is ready,
+    so the camera, the detector and the Tk render step all run at their own
+    rate and stale frames are dropped rather than queued.
+    """
+
+    def __init__(self, camera, detector, image_processor, event_log=None):
+        self.camera = camera
+        self.stop_event = threading.Event()
+        self.display_frames = LatestValueQueue()
+        self.inference_frames = LatestValueQueue()
+        self.results = LatestValueQueue()
+        self.motion_gate = None
+        if Settings.MOTION_GATE_ENABLED:
+            self.motion_gate = MotionGate(
+                Settings.MOTION_THRESHOLD, Settings.MOTION_DOWNSCALE_WIDTH,
+                Settings.MOTION_FORCE_REFRESH_FRAMES)
+
+        self.tracker = None
+        if Settings.TRACKER_ENABLED:
+            self.tracker = IoUTracker(
+                Settings.TRACKER_IOU_THRESHOLD, Settings.TRACKER_HIGH_CONF,
+                Settings.TRACKER_LOW_CONF, Settings.TRACKER_MIN_HITS, Settings.TRACKER_MAX_AGE,
+                class_conf=detector.postprocess.thresholds)
+
+        self.capture_thread = CaptureThread(
+            camera, [self.display_frames, self.inference_frames], self.stop_event)
+        self.inference_thread = InferenceThread(
+            detector, image_processor, self.inference_frames, self.results, self.stop_event,
+            self.motion_gate, self.tracker, event_log, camera)
+
+    def start(self):
+        """Start the capture and inference threads"""
+        self.capture_thread.start()
+        self.inference_thread.start()
+
+    def stop(self, timeout=1.0):
+        """Signal both stages to exit and wait briefly for them"""
+        self.stop_event.set()
+        for thread in (self.capture_thread, self.inference_thread):
+            if thread.is_alive():
+                thread.join(timeout)
+
+    def latest_frame(self):
+        """Newest FramePacket captured since the last call, or None"""
+        return self.display_frames.get_nowait()
+
+    def latest_result(self):
+        """Newest FrameResult produced since the last call, or None"""
+        return self.results.get_nowait()
+
+    def stats(self):
+        """Camera counters plus frames dropped at each queue because a consumer was behind"""
+        return {
+            **self.camera.stats(),
+            'display_dropped': self.display_frames.dropped,
+            'inference_dropped': self.inference_frames.dropped,
+            'results_dropped': self.results.dropped,
+            'motion_skip_ratio': self.motion_gate.skip_ratio if self.motion_gate else 0.0,
+        }
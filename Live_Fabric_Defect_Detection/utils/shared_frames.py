@@ -0,0 +1,61 @@
+# utils/shared_frames.py
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SharedFrameRing:
+    """Fixed-size frame slots in one shared memory block
+
+    The owning process creates the block and copies frames in with write();
+    another process attaches by name and reads them with view(), which
+    returns an ndarray over the shared buffer without copying. Slots are
+    handed out round-robin, so up to `slots` frames (e.g. one batch) can be
+    in flight before a slot is reused. Who may touch which slot when is up
+    to the caller; the ring itself does no locking.
+    """
+
+    def __init__(self, slots, slot_bytes, name=None):
+        """
+        Args:
+            slots: Number of frame slots
+            slot_bytes: Capacity of each slot in bytes
+            name: Attach to this existing block instead of creating a new one
+        """
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._next = 0
+
+    def fits(self, frame):
+        return frame.nbytes <= self.slot_bytes
+
+    def next_slot(self):
+        """Index of the slot to write next"""
+        slot = self._next
+        self._next = (self._next + 1) % self.slots
+        return slot
+
+    def view(self, slot, shape, dtype):
+        """ndarray of the given shape backed directly by a slot's memory"""
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def write(self, slot, frame):
+        """Copy frame into a slot; returns the (slot, shape, dtype) needed to view it"""
+        if not self.fits(frame):
+            raise ValueError(f"frame of {frame.nbytes} bytes does not fit a {self.slot_bytes} byte slot")
+        np.copyto(self.view(slot, frame.shape, frame.dtype), frame, casting='no')
+        return slot, frame.shape, frame.dtype.str
+
+    def close(self):
+        """Detach from the block, and free it if this ring created it"""
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,46 @@
+# benchmark_tiling.py
+import argparse
+import itertools
+import time
+import numpy as np
+from config.config import Config
+from core.detector import ObjectDetector, detector_kwargs
+from core.loader import ImageLoader
+
+def run_mode(detector, batches):
+    """Time one pass over the preloaded batches and count detections per class"""
+    counts = np.zeros(len(Config.CLASS_NAMES), dtype=int)
+    images = 0
+    start = time.perf_counter()
+    for batch in batches:
+        _, frames = zip(*batch)
+        for detections in detector.detect_batch_boxes(frames):
+            counts += detections.counts(len(counts))
+        images += len(frames)
+    elapsed = time.perf_counter() - start
+    return images, elapsed, counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare plain and tiled inference throughput")
+    parser.add_argument("--images", default=Config.TEST_IMAGES_PATH, help="Folder of test images")
+    parser.add_argument("--limit", type=int, default=50, help="Number of images to benchmark")
+    args = parser.parse_args()
+
+    loader = ImageLoader(args.images, Config.BATCH_SIZE, Config.LOADER_WORKERS, Config.PREFETCH_BATCHES)
+    # Decode up front so both modes are timed on model work only
+    batches = list(itertools.islice(loader, max(1, args.limit // Config.BATCH_SIZE)))
+
+    detector = ObjectDetector(**dict(detector_kwargs(Config), tiled=False))
+    run_mode(detector, batches[:1])  # warm-up
+
+    print(f"{'mode':<8}{'images/s':>10}{'ms/image':>10}  detections per class")
+    for tiled in (False, True):
+        detector.tiled = tiled
+        images, elapsed, counts = run_mode(detector, batches)
+        per_class = ", ".join(f"{name}={count}" for name, count in zip(Config.CLASS_NAMES, counts))
+        print(f"{'tiled' if tiled else 'plain':<8}{images / elapsed:>10.2f}"
+              f"{1000 * elapsed / images:>10.1f}  {per_class}")
+    print(f"Tile size {Config.TILE_SIZE}, overlap {Config.TILE_OVERLAP}, tile batch {Config.TILE_BATCH_SIZE}")
+
+if __name__ == "__main__":
+    main()
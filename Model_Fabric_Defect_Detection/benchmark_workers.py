@@ -0,0 +1,71 @@
+# benchmark_workers.py
+import argparse
+import json
+import os
+import tempfile
+import time
+from config.config import Config
+from core.detector import detector_kwargs
+from core.image_processor import save_kwargs
+from core.sharding import ShardedDetector
+
+def run_workers(workers, folder, limit, threads_per_worker):
+    """Images/sec for one worker count, including each worker's model load"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        detector = ShardedDetector(workers, detector_kwargs(Config), output_dir, Config.CLASS_NAMES,
+                                   threads_per_worker, Config.BATCH_SIZE, Config.SHARD_SIZE,
+                                   save_kwargs(Config))
+        images = 0
+        start = time.perf_counter()
+        first_result = None
+        for _ in detector.detect_folder(folder):
+            if first_result is None:
+                first_result = time.perf_counter() - start
+            images += 1
+            if images >= limit:
+                break
+        elapsed = time.perf_counter() - start
+    return {'workers': workers, 'threads_per_worker': detector.threads_per_worker,
+            'images': images, 'seconds': elapsed, 'first_result_s': first_result,
+            'images_per_s': images / elapsed if elapsed else 0.0}
+
+def default_worker_counts():
+    """1, 2, 4, ... up to the number of cores"""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure folder detection throughput against worker count")
+    parser.add_argument("--images", default=Config.TEST_IMAGES_PATH, help="Folder of test images")
+    parser.add_argument("--limit", type=int, default=500, help="Images processed per worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts to try (default 1, 2, 4, ... up to the core count)")
+    parser.add_argument("--threads-per-worker", type=int, default=Config.THREADS_PER_WORKER,
+                        help="torch threads per worker (default splits the cores evenly)")
+    parser.add_argument("--output", default="./scaling_report.json", help="JSON report path")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'workers':>8}{'threads':>9}{'images/s':>10}{'speedup':>9}{'efficiency':>12}{'1st result':>12}")
+    for workers in args.workers or default_worker_counts():
+        row = run_workers(workers, args.images, args.limit, args.threads_per_worker)
+        baseline = rows[0]['images_per_s'] if rows else row['images_per_s']
+        row['speedup'] = row['images_per_s'] / baseline if baseline else 0.0
+        row['efficiency'] = row['speedup'] / (workers / rows[0]['workers'] if rows else 1)
+        rows.append(row)
+        print(f"{workers:>8}{row['threads_per_worker']:>9}{row['images_per_s']:>10.2f}"
+              f"{row['speedup']:>9.2f}{row['efficiency']:>12.0%}{row['first_result_s'] or 0:>11.1f}s")
+
+    with open(args.output, 'w') as f:
+        json.dump({'timestamp': time.time(), 'cpu_count': os.cpu_count(), 'images': args.images,
+                   'limit': args.limit, 'runs': rows}, f, indent=2)
+    print(f"Scaling report written to {args.output}")
+    print("Throughput includes each worker's model load; raise --limit to approach steady state")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# cli.py
+import argparse
+import json
+import os
+import sys
+import time
+from config.config import Config
+from core.detector import ObjectDetector, detector_kwargs
+from core.image_processor import ImageProcessor, save_kwargs
+from core.loader import ImageLoader, list_images
+from core.metrics import registry
+from core.result_cache import ResultCache
+from core.sharding import ShardedDetector
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Detect fabric defects in a folder without a GUI, writing one JSON line per image")
+    parser.add_argument("--input", default=Config.TEST_IMAGES_PATH, help="Folder of images")
+    parser.add_argument("--output", default="-", help="JSON-lines file, '-' for stdout")
+    parser.add_argument("--save-dir", default=None,
+                        help="Also save detected images here (like the GUI app), default off")
+    parser.add_argument("--model", default=Config.MODEL_PATH, help="Weights file")
+    parser.add_argument("--backend", default=Config.INFERENCE_BACKEND,
+                        choices=['pytorch', 'torchscript', 'onnx', 'openvino'])
+    parser.add_argument("--imgsz", type=int, default=Config.IMAGE_SIZE, help="Inference input size")
+    parser.add_argument("--batch-size", type=int, default=Config.BATCH_SIZE, help="Images per predict call")
+    parser.add_argument("--tiled", action=argparse.BooleanOptionalAction, default=Config.TILED_INFERENCE,
+                        help="Tile high-resolution images")
+    parser.add_argument("--workers", type=int, default=Config.WORKERS, help="Worker processes")
+    parser.add_argument("--cache", default=Config.RESULT_CACHE_PATH,
+                        help="Result cache database (single process only)")
+    parser.add_argument("--no-cache", action="store_true", help="Always run the model")
+    parser.add_argument("--quiet", action="store_true", help="No progress line on stderr")
+    return parser.parse_args()
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+def open_output(path):
+    """
+    Stream the JSON lines go to
+    With '-' they keep the real stdout while file descriptor 1 is pointed at stderr,
+    so prints from model export, ultralytics and worker processes cannot end up in them.
+    """
+    if path != "-":
+        return open(path, 'w')
+    sys.stdout.flush()
+    out = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return out
+
+def detection_record(filename, detections, saved):
+    """JSON-serialisable result for one image"""
+    xyxy, confs, class_ids = detections
+    boxes = []
+    for box, conf, class_id in zip(xyxy.tolist(), confs.tolist(), class_ids.tolist()):
+        name = Config.CLASS_NAMES[class_id] if class_id < len(Config.CLASS_NAMES) else None
+        boxes.append({'class_id': class_id, 'class': name, 'conf': round(conf, 4),
+                      'box': [round(v, 1) for v in box]})
+    record = {'file': filename, 'detections': boxes}
+    if saved:
+        record['saved'] = sorted({path for _, path in saved})
+    return record
+
+def main():
+    args = parse_args()
+    out = open_output(args.output)
+    kwargs = detector_kwargs(Config)
+    # verbose=False keeps ultralytics' per-image log lines from flooding stderr
+    kwargs.update(model_path=args.model, backend=args.backend, imgsz=args.imgsz, tiled=args.tiled,
+                  verbose=False)
+    total = sum(1 for _ in list_images(args.input))
+
+    result_cache = None
+    image_processor = None
+    if args.workers > 1:
+        detector = ShardedDetector(args.workers, kwargs, args.save_dir, Config.CLASS_NAMES,
+                                   Config.THREADS_PER_WORKER, args.batch_size, Config.SHARD_SIZE,
+                                   save_kwargs(Config))
+        results = detector.detect_folder(args.input)
+    else:
+        detector = ObjectDetector(**kwargs)
+        if args.cache and not args.no_cache:
+            result_cache = ResultCache(args.cache, *detector.cache_identity(),
+                                       max_entries=Config.RESULT_CACHE_MAX_ENTRIES)
+        image_processor = (ImageProcessor(args.save_dir, Config.CLASS_NAMES, **save_kwargs(Config))
+                           if args.save_dir else None)
+        loader = ImageLoader(args.input, args.batch_size, Config.LOADER_WORKERS, Config.PREFETCH_BATCHES,
+                             digests=result_cache is not None)
+        results = ((filename, detections,
+                    image_processor.save_detections(image, filename, detections[0], detections[2]) if image_processor else [])
+                   for filename, image, detections in detector.detect_stream(loader, result_cache))
+
+    start = time.perf_counter()
+    last_progress = 0.0
+    done = 0
+    boxes = 0
+    try:
+        for filename, detections, saved in results:
+            out.write(json.dumps(detection_record(filename, detections, saved)) + "\n")
+            done += 1
+            boxes += len(detections[2])
+
+            now = time.perf_counter()
+            if not args.quiet and (now - last_progress >= 0.5 or done == total):
+                last_progress = now
+                rate = done / (now - start)
+                eta = (total - done) / rate if rate else 0.0
+                sys.stderr.write(f"\r{done}/{total} images  {rate:6.1f} img/s  ETA {format_duration(eta)}")
+                sys.stderr.flush()
+    finally:
+        if image_processor is not None:
+            image_processor.close()
+        out.close()
+        if result_cache is not None:
+            result_cache.close()
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        sys.stderr.write("\n")
+    # Summary goes to stderr so stdout stays pure JSON lines
+    summary = [f"{done} images, {boxes} detections in {format_duration(elapsed)} "
+               f"({done / elapsed if elapsed else 0.0:.1f} images/s)"]
+    for stage, stats in sorted(registry.snapshot()['stages'].items()):
+        summary.append(f"  {stage:<12} mean {stats['mean_ms']:7.1f} ms  p50 {stats['p50_ms']:7.1f} ms  "
+                       f"p95 {stats['p95_ms']:7.1f} ms  ({stats['count']} samples)")
+    if result_cache is not None:
+        summary.append(result_cache.stats_line())
+    print("\n".join(summary), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,62 @@ class Config:
     FRAME_WIDTH = 300
     FRAME_HEIGHT = 250
     DETECTED_OBJECTS_DIR = "./detected_objects"
+    # 'frame': the image once per detected class, 'crops': one padded crop per box,
+    # 'frame_links': the image once, hardlinked under every other detected class
+    SAVE_MODE = 'frame'
+    SAVE_CROP_PADDING = 0.1  # fraction of the box width/height added around each crop
+    JPEG_QUALITY = 90
+    SAVE_WORKERS = 4  # threads encoding and writing detected images
     MODEL_PATH = "C:/Users/vlabs/Desktop/ewaste/model_training/runs/detect/train/weights/best.pt"
     TEST_IMAGES_PATH = "C:/Users/vlabs/Desktop/ewaste/Fabric_Defect_5Class/test/images"
+    IMAGE_SIZE = 640
+
+    # Post-processing applied to every prediction
+    DEFAULT_CONF_THRESHOLD = 0.25  # minimum confidence for classes without their own threshold
+    CLASS_CONF_THRESHOLDS = {}  # e.g. {'stains': 0.4} for classes that need more certainty
+    CLASS_ALLOW_LIST = None  # class names to report (None reports all)
+
+    # Inference backend: 'pytorch', 'torchscript', 'onnx' (ONNX Runtime) or 'openvino'.
+    # Non-pytorch backends are exported from MODEL_PATH once and cached by weights hash.
+    INFERENCE_BACKEND = 'pytorch'
+    MODEL_CACHE_DIR = "./model_cache"  # exported models, one subfolder per weights file
+    PARITY_SAMPLE_IMAGE = None  # image with objects checked against pytorch on first use (None: export stays unverified)
+
+    # Folder inference settings
+    BATCH_SIZE = 8  # images per model.predict call
+    LOADER_WORKERS = 4  # threads decoding images ahead of the model
+    PREFETCH_BATCHES = 2  # decoded batches kept ready beyond the one being predicted
+
+    # Multi-process folder inference (main.py --workers N): each process loads its own model
+    WORKERS = 1  # 1 runs everything in this process
+    THREADS_PER_WORKER = None  # torch/BLAS threads per process (None splits the cores evenly)
+    SHARD_SIZE = 32  # images handed to a worker at a time
+
+    # Result cache: detections keyed by image content, weights and inference settings,
+    # so re-running an unchanged folder only sends new or modified images to the model
+    RESULT_CACHE_PATH = "./result_cache.sqlite"  # None disables the cache
+    RESULT_CACHE_MAX_ENTRIES = 100000  # least recently used results beyond this are evicted
+
+    # Tiled inference for high-resolution scans: small defects survive because
+    # each tile is fed to the model at full resolution instead of letterboxed
+    TILED_INFERENCE = False
+    TILE_SIZE = 640  # tile edge in pixels, also the model input size for tiles
+    TILE_OVERLAP = 0.2  # fraction of a tile shared with its neighbour
+    TILE_BATCH_SIZE = 16  # tiles per predict call
+    TILE_NMS_IOU = 0.5  # IoU above which same-class boxes from neighbouring tiles are merged
+
+    # Watch-folder streaming (main.py --watch FOLDER): process images as the scanners write them
+    WATCH_POLL_INTERVAL = 1.0  # seconds between folder scans (watchdog, if installed, wakes scans early)
+    WATCH_SETTLE_SECONDS = 0.5  # a file must be unchanged this long before it is read
+    WATCH_MAX_PENDING = 64  # ready files queued ahead of inference before scanning pauses
+    WATCH_DONE_DIR = "done"  # processed images are moved here (relative to the watched folder)
+    WATCH_BATCH_WAIT = 0.2  # seconds to wait for a full batch before running a partial one
+    WATCH_GUI_REFRESH_MS = 500
+
+    # Metrics: per-stage latency quantiles and images/sec
+    METRICS_ENABLED = True
+    METRICS_HTTP_PORT = None  # e.g. 9109 to serve /metrics while a folder is processed
+    METRICS_JSON_PATH = "./metrics.json"  # snapshot written when processing finishes (None disables)
+
+    # Detection event log (SQLite, WAL mode): one row per detected box
+    EVENT_LOG_PATH = "./detections.sqlite"  # None disables the log
@@ -1,13 +1,131 @@
 # ewaste_detection/core/detector.py
 import cv2
-from ultralytics import YOLO
 import os
+from detection_common.backends import InferenceBackend, load_backend, weights_digest
+from core.tiling import make_tiles, merge_tile_detections
+from core.metrics import registry
+from detection_common.postprocess import Detections, PostProcessor
+
+def detector_kwargs(config):
+    """ObjectDetector keyword arguments from a Config class (picklable, for worker processes too)"""
+    return dict(model_path=config.MODEL_PATH, backend=config.INFERENCE_BACKEND,
+                imgsz=config.IMAGE_SIZE, parity_sample=config.PARITY_SAMPLE_IMAGE,
+                tiled=config.TILED_INFERENCE, tile_size=config.TILE_SIZE,
+                tile_overlap=config.TILE_OVERLAP, tile_batch_size=config.TILE_BATCH_SIZE,
+                tile_nms_iou=config.TILE_NMS_IOU, cache_dir=config.MODEL_CACHE_DIR,
+                class_names=config.CLASS_NAMES, conf_thresholds=config.CLASS_CONF_THRESHOLDS,
+                default_conf=config.DEFAULT_CONF_THRESHOLD, allowed_classes=config.CLASS_ALLOW_LIST)
 
 class ObjectDetector:
-    def __init__(self, model_path):
-        self.model = YOLO(model_path)
+    def __init__(self, model_path, backend='pytorch', imgsz=640, parity_sample=None,
+                 tiled=False, tile_size=640, tile_overlap=0.2, tile_batch_size=16, tile_nms_iou=0.5,
+                 cache_dir=None, verbose=True, class_names=None, conf_thresholds=None,
+                 default_conf=0.0, allowed_classes=None, resolved_backend=None):
+        """
+        Args:
+            resolved_backend: (backend name, model path) from resolve_backend, loaded as is
+                without exporting or parity-checking again (used by worker processes)
+        """
+        self.model_path = model_path
+        self.verbose = verbose
+        self.imgsz = imgsz
+        with registry.time('model_load'):
+            if resolved_backend is not None:
+                self.backend = InferenceBackend(*resolved_backend)
+            else:
+                self.backend = load_backend(model_path, backend, imgsz, parity_sample, cache_dir=cache_dir)
+        self.tiled = tiled
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.tile_batch_size = tile_batch_size
+        self.tile_nms_iou = tile_nms_iou
+        # Without class names every box is kept; with them unknown or filtered classes are dropped
+        self.postprocess = None
+        if class_names is not None:
+            self.postprocess = PostProcessor(class_names, conf_thresholds, default_conf, allowed_classes)
         
     def detect_objects(self, image_path):
         image = cv2.imread(image_path)
-        results = self.model.predict(source=image, save=False, show=False)
-        return image, results[0].boxes.cls.cpu().numpy().astype(int)
+        return image, self.detect_batch([image])[0]
+
+    def _predict_boxes(self, images, imgsz):
+        """Run one predict call and return (xyxy, confs, class_ids) arrays per image"""
+        results = self.backend.predict(list(images), imgsz=imgsz, verbose=self.verbose)
+        # ultralytics reports per-image stage timings in milliseconds
+        for result in results:
+            for stage, name in (('preprocess', 'preprocess'), ('inference', 'predict'),
+                                ('postprocess', 'postprocess')):
+                if result.speed.get(stage) is not None:
+                    registry.observe(name, result.speed[stage] / 1000)
+        return [(r.boxes.xyxy.cpu().numpy(),
+                 r.boxes.conf.cpu().numpy(),
+                 r.boxes.cls.cpu().numpy().astype(int)) for r in results]
+
+    def _predict_tiled(self, images):
+        """Slice every image into tiles, batch all tiles through the model and merge per image"""
+        tiles = []
+        for index, image in enumerate(images):
+            for x0, y0, tile in make_tiles(image, self.tile_size, self.tile_overlap):
+                tiles.append((index, x0, y0, tile))
+
+        per_image = [[] for _ in images]
+        for start in range(0, len(tiles), self.tile_batch_size):
+            chunk = tiles[start:start + self.tile_batch_size]
+            outputs = self._predict_boxes([tile for _, _, _, tile in chunk], self.tile_size)
+            for (index, x0, y0, _), (xyxy, confs, class_ids) in zip(chunk, outputs):
+                per_image[index].append((x0, y0, xyxy, confs, class_ids))
+
+        with registry.time('tile_merge'):
+            return [merge_tile_detections(detections, self.tile_nms_iou) for detections in per_image]
+
+    def detect_batch_boxes(self, images):
+        """Return Detections (xyxy, confs, class_ids arrays) per image, tiled if enabled and filtered"""
+        outputs = self._predict_tiled(images) if self.tiled else self._predict_boxes(images, self.imgsz)
+        if self.postprocess is None:
+            return [Detections(*output) for output in outputs]
+        with registry.time('postprocess_filter'):
+            return [self.postprocess(*output) for output in outputs]
+
+    def detect_batch(self, images):
+        """Run one predict call over a list of images and return class ids per image"""
+        return [class_ids for _, _, class_ids in self.detect_batch_boxes(images)]
+
+    def cache_identity(self):
+        """(weights digest, parameters) that determine this detector's output, for ResultCache"""
+        params = {'backend': self.backend.name, 'imgsz': self.imgsz, 'tiled': self.tiled}
+        if self.postprocess is not None:
+            params.update(class_names=self.postprocess.class_names,
+                          thresholds=self.postprocess.thresholds.tolist(),
+                          allowed=self.postprocess.allowed.tolist())
+        if self.tiled:
+            params.update(tile_size=self.tile_size, tile_overlap=self.tile_overlap,
+                          tile_nms_iou=self.tile_nms_iou)
+        return weights_digest(self.model_path), params
+
+    def _detect_cached(self, images, digests, cache):
+        """Detections per image, running the model only on images the cache has not seen"""
+        found = cache.get_many(digests)
+        missing = [i for i, digest in enumerate(digests) if digest not in found]
+        if missing:
+            outputs = self.detect_batch_boxes([images[i] for i in missing])
+            fresh = [(digests[i], output) for i, output in zip(missing, outputs)]
+            cache.put_many(fresh)
+            found.update(fresh)
+        return [Detections(*found[digest]) for digest in digests]
+
+    def detect_stream(self, batches, cache=None):
+        """
+        Yield (filename, image, (xyxy, confs, class_ids)) for each image of an ImageLoader-style batch iterable
+        Args:
+            cache: ResultCache to consult first; batch items must then be (filename, image, digest)
+        """
+        for batch in batches:
+            if cache is None:
+                filenames, images = zip(*batch)
+                detections = self.detect_batch_boxes(images)
+            else:
+                filenames, images, digests = zip(*batch)
+                detections = self._detect_cached(images, digests, cache)
+            for filename, image, image_detections in zip(filenames, images, detections):
+                registry.tick('images')
+                yield filename, image, image_detections
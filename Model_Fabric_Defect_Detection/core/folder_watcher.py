@@ -0,0 +1,182 @@
+# ewaste_detection/core/folder_watcher.py
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from core.loader import IMAGE_EXTENSIONS
+from core.metrics import registry
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # fall back to polling only
+    Observer = None
+
+
+class FolderWatcher:
+    """Stream images from a folder that scanners keep writing into
+
+    A scanner thread lists the folder every poll_interval seconds, or as soon
+    as watchdog (inotify on Linux) reports a change if it is installed. A file
+    is handed on only after its size and mtime have not changed for
+    settle_seconds, so half-written images are never decoded. Ready files wait
+    in a queue of at most max_pending names; when inference falls behind the
+    scanner blocks on that queue instead of reading ahead. Once a batch has
+    been handled its files are moved into done_dir, so the folder, each scan
+    and the names remembered between scans only ever cover pending files,
+    however many have arrived. Files of a batch that was not finished when
+    the watcher stopped stay put and are processed again on the next run.
+    """
+
+    def __init__(self, folder, poll_interval=1.0, settle_seconds=0.5, max_pending=64, done_dir="done"):
+        """
+        Args:
+            folder: Directory the scanners write to
+            poll_interval: Seconds between scans (an upper bound when watchdog is active)
+            settle_seconds: How long a file must stay unchanged before it is read
+            max_pending: Ready files queued ahead of inference before the scanner waits
+            done_dir: Folder processed images are moved to (relative paths are inside folder)
+        """
+        self.folder = folder
+        self.done_dir = os.path.join(folder, done_dir)
+        os.makedirs(self.done_dir, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self._ready = queue.Queue(maxsize=max_pending)
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._seen = set()
+        self._settling = {}  # name -> ((size, mtime_ns), unchanged since)
+        self._observer = None
+        self._thread = threading.Thread(target=self._scan_loop, name="folder-watcher", daemon=True)
+
+    def start(self):
+        if Observer is not None:
+            watcher = self
+
+            class Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    watcher._wakeup.set()
+
+            self._observer = Observer()
+            self._observer.schedule(Handler(), self.folder, recursive=False)
+            self._observer.start()
+        else:
+            print("watchdog is not installed, polling for new images")
+        self._thread.start()
+        return self
+
+    def _scan(self):
+        """Queue every settled, unseen image; blocks while the ready queue is full"""
+        now = time.time()
+        present = set()
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                present.add(entry.name)
+                if entry.name in self._seen:
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                previous = self._settling.get(entry.name)
+                if previous is None or previous[0] != signature:
+                    self._settling[entry.name] = (signature, now)
+                elif stat.st_size > 0 and now - previous[1] >= self.settle_seconds:
+                    del self._settling[entry.name]
+                    self._seen.add(entry.name)
+                    while not self._stop_event.is_set():
+                        try:
+                            self._ready.put(entry.name, timeout=self.poll_interval)
+                            break
+                        except queue.Full:
+                            registry.tick('watch_backpressure')
+                if self._stop_event.is_set():
+                    return
+        # Forget files that were moved to done_dir or deleted, so both only hold pending files
+        self._seen &= present
+        for name in list(self._settling):
+            if name not in present:
+                del self._settling[name]
+        registry.set_gauge('watch_pending', self._ready.qsize())
+
+    def _scan_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self._scan()
+            except OSError as e:
+                print(f"Error scanning {self.folder}: {e}")
+            # Files still settling need another look soon even without new events
+            wait = min(self.poll_interval, self.settle_seconds) if self._settling else self.poll_interval
+            self._wakeup.wait(wait)
+            self._wakeup.clear()
+
+    def _load(self, filename):
+        with registry.time('decode'):
+            image = cv2.imread(os.path.join(self.folder, filename))
+        return filename, image
+
+    def _archive_path(self, name):
+        """Path in done_dir for name, numbered (scan_1.png, scan_2.png, ...) if an earlier file took it"""
+        path = os.path.join(self.done_dir, name)
+        stem, ext = os.path.splitext(name)
+        index = 0
+        while os.path.lexists(path):
+            index += 1
+            path = os.path.join(self.done_dir, f"{stem}_{index}{ext}")
+        return path
+
+    def _archive(self, names):
+        """Move handled files out of the watched folder without overwriting earlier ones"""
+        for name in names:
+            try:
+                # Only this watcher's consumer thread writes to done_dir, so the name stays free
+                os.replace(os.path.join(self.folder, name), self._archive_path(name))
+            except OSError as e:
+                print(f"Error moving {name} to {self.done_dir}: {e}")
+
+    def batches(self, batch_size=8, max_wait=0.2, workers=4):
+        """
+        Yield lists of (filename, image) as files arrive, until stop() is called
+        Args:
+            batch_size: Most images per batch
+            max_wait: Seconds to wait for a batch to fill before running it partially
+            workers: Decode threads
+        """
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while not self._stop_event.is_set():
+                try:
+                    names = [self._ready.get(timeout=self.poll_interval)]
+                except queue.Empty:
+                    continue
+                deadline = time.time() + max_wait
+                while len(names) < batch_size:
+                    try:
+                        names.append(self._ready.get(timeout=max(0.0, deadline - time.time())))
+                    except queue.Empty:
+                        break
+
+                batch = []
+                for filename, image in pool.map(self._load, names):
+                    if image is None:
+                        print(f"Error reading {filename}, skipping")
+                    else:
+                        batch.append((filename, image))
+                if batch:
+                    yield batch
+                # The consumer only asks for the next batch once it has handled this one;
+                # unreadable files are moved too, or they would be remembered forever
+                self._archive(names)
+
+    def stop(self):
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=1.0)
+        self._thread.join(timeout=1.0)
@@ -1,19 +1,79 @@
 # ewaste_detection/core/image_processor.py
 from PIL import Image
 import os
-import cv2
+import numpy as np
 import random
+from core.metrics import registry
+from detection_common.async_writer import AsyncImageWriter, crop_box
+
+def save_kwargs(config):
+    """ImageProcessor saving options from a Config class"""
+    return dict(save_mode=config.SAVE_MODE, crop_padding=config.SAVE_CROP_PADDING,
+                jpeg_quality=config.JPEG_QUALITY, workers=config.SAVE_WORKERS)
 
 class ImageProcessor:
-    def __init__(self, output_dir, class_names):
+    def __init__(self, output_dir, class_names, save_mode='frame', crop_padding=0.1,
+                 jpeg_quality=95, workers=4):
+        """
+        Args:
+            save_mode: 'frame' saves the image once per detected class, 'crops' one padded
+                crop per box, 'frame_links' the image once with hardlinks for the other classes
+            crop_padding: Fraction of the box width/height added around each crop
+            jpeg_quality: cv2 JPEG quality (0-100)
+            workers: Threads encoding and writing images in parallel
+        """
         self.output_dir = output_dir
         self.class_names = class_names
+        self.save_mode = save_mode
+        self.crop_padding = crop_padding
+        # Block rather than drop: every detected image of a folder run must be saved
+        self.writer = AsyncImageWriter(4 * max(1, workers), workers, jpeg_quality,
+                                       block=True, registry=registry)
         os.makedirs(output_dir, exist_ok=True)
+
+    def _submit(self, path, image, links=()):
+        """Queue an image on the writer; waits while the writer's queue is full"""
+        self.writer.submit(path, image, links=links)
+        return path
         
     def save_detected_image(self, image, filename, class_name):
         save_path = os.path.join(self.output_dir, f"{class_name}_{filename}")
-        cv2.imwrite(save_path, image)
-        return save_path
+        return self._submit(save_path, image)
+
+    def save_detections(self, image, filename, boxes, class_ids):
+        """Save one image's detections according to save_mode; returns [(class_name, saved_path), ...]"""
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        class_ids = np.asarray(class_ids, dtype=np.int64)
+        boxes_by_class = {self.class_names[class_id]: boxes[class_ids == class_id]
+                          for class_id in np.unique(class_ids).tolist()
+                          if 0 <= class_id < len(self.class_names)}
+        if not boxes_by_class:
+            return []
+
+        if self.save_mode == 'crops':
+            stem = os.path.splitext(filename)[0]
+            saved = []
+            for class_name, class_boxes in boxes_by_class.items():
+                for index, box in enumerate(class_boxes):
+                    path = os.path.join(self.output_dir, f"{class_name}_{stem}_{index}.jpg")
+                    saved.append((class_name, self._submit(path, crop_box(image, box, self.crop_padding))))
+            return saved
+
+        paths = {class_name: os.path.join(self.output_dir, f"{class_name}_{filename}")
+                 for class_name in boxes_by_class}
+        if self.save_mode == 'frame_links':
+            primary, *others = paths
+            self._submit(paths[primary], image, [paths[c] for c in others])
+            return list(paths.items())
+        # One file per class, however many boxes of it the image has
+        return [(class_name, self._submit(path, image)) for class_name, path in paths.items()]
+
+    def flush(self):
+        """Wait until every queued image is on disk"""
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
     
     def resize_image(self, image_path, width, height):
         img = Image.open(image_path)
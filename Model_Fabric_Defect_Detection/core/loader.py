@@ -0,0 +1,81 @@
+# ewaste_detection/core/loader.py
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from core.metrics import registry
+from core.result_cache import content_digest
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+def list_images(folder):
+    """Yield image filenames in folder without building the whole listing"""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                yield entry.name
+
+class ImageLoader:
+    """Decode images on a thread pool ahead of the model and hand them out in batches"""
+
+    def __init__(self, folder, batch_size=8, workers=4, prefetch_batches=2, digests=False):
+        """
+        Args:
+            digests: Also hash each file's bytes, making batch items (filename, image, digest)
+        """
+        self.folder = folder
+        self.digests = digests
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        # Number of decodes kept in flight so the model never waits on cv2.imread
+        self.max_pending = self.batch_size * (max(0, prefetch_batches) + 1)
+
+    def _load(self, filename):
+        path = os.path.join(self.folder, filename)
+        if not self.digests:
+            with registry.time('decode'):
+                image = cv2.imread(path)
+            return filename, image
+
+        # Read once, then hash and decode the same bytes
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = content_digest(data)
+        with registry.time('decode'):
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        return filename, image, digest
+
+    def __iter__(self):
+        """Yield lists of (filename, image) tuples (plus digest, if enabled) in directory order"""
+        filenames = list_images(self.folder)
+        pending = deque()
+        batch = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for filename in filenames:
+                pending.append(pool.submit(self._load, filename))
+                if len(pending) < self.max_pending:
+                    continue
+                batch = self._collect(pending.popleft(), batch)
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+
+            while pending:
+                batch = self._collect(pending.popleft(), batch)
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _collect(future, batch):
+        item = future.result()
+        if item[1] is None:
+            print(f"Error reading {item[0]}, skipping", file=sys.stderr)
+        else:
+            batch.append(item)
+        return batch
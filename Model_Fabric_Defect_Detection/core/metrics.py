@@ -0,0 +1,5 @@
+# ewaste_detection/core/metrics.py
+from detection_common.metrics import MetricsRegistry
+
+# Shared registry every pipeline stage reports into
+registry = MetricsRegistry('fabric_detection')
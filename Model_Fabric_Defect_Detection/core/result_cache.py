@@ -0,0 +1,117 @@
+# ewaste_detection/core/result_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+
+
+def content_digest(data):
+    """SHA-256 of an image file's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """Persistent detections keyed by (image content, model weights, inference parameters)
+
+    Entries live in a SQLite table; the weights digest and parameters are
+    folded into a namespace prefix of every key, so changing the model or
+    any setting that affects the output simply misses instead of returning
+    stale boxes. Once more than max_entries rows are stored, the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self, path, weights_digest, params, max_entries=100000):
+        """
+        Args:
+            path: SQLite database file
+            weights_digest: Hash of the model weights producing the results
+            params: Dict of every inference setting that changes the output
+            max_entries: Rows kept before least recently used ones are evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.namespace = hashlib.sha256(
+            json.dumps([weights_digest, params], sort_keys=True).encode()).hexdigest()[:16]
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._stored_since_evict = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, xyxy BLOB, confs BLOB, class_ids BLOB, last_used REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used)")
+        self._db.commit()
+
+    def _key(self, digest):
+        return f"{self.namespace}:{digest}"
+
+    def get_many(self, digests):
+        """{digest: (xyxy, confs, class_ids)} for the digests that are cached"""
+        keys = {self._key(d): d for d in digests}
+        found = {}
+        if keys:
+            rows = self._db.execute(
+                f"SELECT key, xyxy, confs, class_ids FROM results WHERE key IN ({','.join('?' * len(keys))})",
+                list(keys)).fetchall()
+            for key, xyxy, confs, class_ids in rows:
+                found[keys[key]] = (np.frombuffer(xyxy, dtype=np.float32).reshape(-1, 4),
+                                    np.frombuffer(confs, dtype=np.float32),
+                                    np.frombuffer(class_ids, dtype=np.int64))
+            if rows:
+                now = time.time()
+                with self._db:
+                    self._db.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                                         [(now, row[0]) for row in rows])
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store (digest, (xyxy, confs, class_ids)) pairs"""
+        now = time.time()
+        rows = [(self._key(digest),
+                 np.ascontiguousarray(xyxy, dtype=np.float32).tobytes(),
+                 np.ascontiguousarray(confs, dtype=np.float32).tobytes(),
+                 np.ascontiguousarray(class_ids, dtype=np.int64).tobytes(), now)
+                for digest, (xyxy, confs, class_ids) in items]
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+        # Counting rows is a table scan, so only check the bound every so often
+        self._stored_since_evict += len(rows)
+        if self._stored_since_evict >= max(1000, self.max_entries // 10):
+            self._stored_since_evict = 0
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries beyond max_entries; returns how many were removed"""
+        count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        with self._db:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (excess,))
+        self.evicted += excess
+        return excess
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats_line(self):
+        return (f"Result cache: {self.hits} hits, {self.misses} misses "
+                f"({self.hit_rate:.1%} hit rate), {self.evicted} evicted")
+
+    def close(self):
+        """Evict down to the size bound and close the database"""
+        self.evict()
+        self._db.close()
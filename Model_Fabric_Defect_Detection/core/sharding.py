@@ -0,0 +1,129 @@
+# ewaste_detection/core/sharding.py
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+from detection_common.backends import resolve_backend
+from core.loader import list_images
+from core.metrics import registry
+
+# Per-process state, set up once by _init_worker
+_detector = None
+_image_processor = None
+_batch_size = 8
+
+
+def _init_worker(detector_kwargs, output_dir, class_names, threads, batch_size, save_kwargs):
+    """Pin this worker's thread pools, then load its own copy of the model"""
+    global _detector, _image_processor, _batch_size
+    # Must be set before torch is imported, which only happens when the model loads
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[var] = str(threads)
+    cv2.setNumThreads(1)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    from core.detector import ObjectDetector
+    from core.image_processor import ImageProcessor
+    _detector = ObjectDetector(**detector_kwargs)
+    _image_processor = ImageProcessor(output_dir, class_names, **save_kwargs) if output_dir else None
+    _batch_size = batch_size
+
+
+def _detect_shard(folder, filenames):
+    """
+    Decode, detect and save one shard
+    Returns:
+        ([(filename, detections, saved)], seconds, {stage: [seconds, ...]} timed in this worker)
+    """
+    start = time.perf_counter()
+    images = []
+    for filename in filenames:
+        with registry.time('decode'):
+            image = cv2.imread(os.path.join(folder, filename))
+        if image is None:
+            print(f"Error reading {filename}, skipping", file=sys.stderr)
+        else:
+            images.append((filename, image))
+
+    results = []
+    for begin in range(0, len(images), _batch_size):
+        batch = images[begin:begin + _batch_size]
+        outputs = _detector.detect_batch_boxes([image for _, image in batch])
+        for (filename, image), detections in zip(batch, outputs):
+            saved = (_image_processor.save_detections(image, filename, detections[0], detections[2])
+                     if _image_processor is not None else [])
+            results.append((filename, detections, saved))
+    if _image_processor is not None:
+        _image_processor.flush()  # every returned path exists once the shard is reported
+    # This process's registry is invisible to the parent, so its samples travel with the results
+    return results, time.perf_counter() - start, registry.drain()
+
+
+class ShardedDetector:
+    """Detect a folder with one model per worker process
+
+    The image list is cut into shards of shard_size files that workers
+    decode, detect and save independently. Only a bounded number of shards
+    is in flight, and results are yielded in directory order regardless of
+    which worker finishes first.
+    """
+
+    def __init__(self, workers, detector_kwargs, output_dir, class_names,
+                 threads_per_worker=None, batch_size=8, shard_size=32, save_kwargs=None):
+        """
+        Args:
+            workers: Number of processes, each holding its own model
+            detector_kwargs: ObjectDetector keyword arguments (must be picklable)
+            output_dir: Folder detected images are saved to (None to not save)
+            class_names: Class names indexed by class id
+            threads_per_worker: torch/BLAS threads per process (None splits the CPU cores evenly)
+            batch_size: Images per predict call inside a worker
+            shard_size: Images per task handed to a worker
+            save_kwargs: Extra ImageProcessor arguments (save mode, JPEG quality, ...)
+        """
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.shard_size = max(1, shard_size)
+        # Export and parity-check once here: workers starting on a cold cache would otherwise all
+        # export to the same files next to the weights and overwrite each other's manifest
+        detector_kwargs = dict(detector_kwargs)
+        detector_kwargs['resolved_backend'] = resolve_backend(
+            detector_kwargs['model_path'], detector_kwargs.get('backend', 'pytorch'),
+            detector_kwargs.get('imgsz', 640), detector_kwargs.get('parity_sample'),
+            cache_dir=detector_kwargs.get('cache_dir'))
+        self._initargs = (detector_kwargs, output_dir, class_names, self.threads_per_worker, batch_size,
+                          save_kwargs or {})
+
+    def detect_folder(self, folder):
+        """Yield (filename, (xyxy, confs, class_ids), [(class_name, saved_path), ...]) in directory order"""
+        filenames = list_images(folder)
+        pending = deque()
+        # spawn keeps worker start-up independent of the threads running in this process
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=self._initargs) as pool:
+            while True:
+                # Two shards per worker keep every process busy without reading ahead unboundedly
+                while len(pending) < 2 * self.workers:
+                    shard = list(itertools.islice(filenames, self.shard_size))
+                    if not shard:
+                        break
+                    pending.append(pool.submit(_detect_shard, folder, shard))
+                if not pending:
+                    return
+                results, seconds, stages = pending.popleft().result()
+                registry.observe('shard', seconds)
+                for stage, samples in stages.items():
+                    for sample in samples:
+                        registry.observe(stage, sample)
+                for result in results:
+                    registry.tick('images')
+                    yield result
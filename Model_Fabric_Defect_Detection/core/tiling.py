@@ -0,0 +1,57 @@
+# ewaste_detection/core/tiling.py
+import numpy as np
+
+def tile_origins(length, tile_size, overlap):
+    """Start offsets along one axis so tiles of tile_size cover length with the given overlap"""
+    if length <= tile_size:
+        return [0]
+    stride = max(1, int(tile_size * (1 - overlap)))
+    origins = list(range(0, length - tile_size, stride))
+    # Last tile is aligned to the edge instead of running past it
+    origins.append(length - tile_size)
+    return origins
+
+def make_tiles(image, tile_size, overlap):
+    """Split an image into overlapping tiles, returning (x0, y0, tile) views"""
+    height, width = image.shape[:2]
+    return [(x0, y0, image[y0:y0 + tile_size, x0:x0 + tile_size])
+            for y0 in tile_origins(height, tile_size, overlap)
+            for x0 in tile_origins(width, tile_size, overlap)]
+
+def nms(boxes, scores, class_ids, iou_threshold):
+    """Class-aware non-maximum suppression, returning the indices to keep"""
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=int)
+    # Offset each class into its own coordinate range so classes never suppress each other
+    offsets = class_ids[:, None].astype(float) * (boxes.max() + 1)
+    shifted = boxes + offsets
+    areas = np.prod(shifted[:, 2:] - shifted[:, :2], axis=1)
+    order = np.argsort(-scores)
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        top_left = np.maximum(shifted[best, :2], shifted[rest, :2])
+        bottom_right = np.minimum(shifted[best, 2:], shifted[rest, 2:])
+        inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=1)
+        iou = inter / (areas[best] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=int)
+
+def merge_tile_detections(tile_detections, iou_threshold):
+    """
+    Shift per-tile detections back to image coordinates and remove cross-tile duplicates
+    Args:
+        tile_detections: List of (x0, y0, xyxy, confs, class_ids) for one image
+        iou_threshold: IoU above which overlapping same-class boxes are merged
+    Returns:
+        (xyxy, confs, class_ids) arrays in image coordinates
+    """
+    if not tile_detections:
+        return np.zeros((0, 4)), np.zeros(0), np.zeros(0, dtype=int)
+    boxes = np.concatenate([xyxy + np.array([x0, y0, x0, y0]) for x0, y0, xyxy, _, _ in tile_detections])
+    confs = np.concatenate([c for _, _, _, c, _ in tile_detections])
+    class_ids = np.concatenate([k for _, _, _, _, k in tile_detections]).astype(int)
+    keep = nms(boxes, confs, class_ids, iou_threshold)
+    return boxes[keep], confs[keep], class_ids[keep]
@@ -1,41 +1,147 @@
+import argparse
 import os
 import random
+import threading
 from config.config import Config
-from core.detector import ObjectDetector
-from core.image_processor import ImageProcessor
+from core.detector import ObjectDetector, detector_kwargs
+from core.image_processor import ImageProcessor, save_kwargs
+from core.loader import ImageLoader
+from core.metrics import registry
+from detection_common.event_log import DetectionEventLog
+from core.folder_watcher import FolderWatcher
+from core.result_cache import ResultCache
+from core.sharding import ShardedDetector
 from ui.gui import ClassificationGUI
 
 def main():
-    # Initialize components
-    detector = ObjectDetector(Config.MODEL_PATH)
-    image_processor = ImageProcessor(Config.DETECTED_OBJECTS_DIR, Config.CLASS_NAMES)
+    parser = argparse.ArgumentParser(description="Detect fabric defects in a folder of images")
+    parser.add_argument("--workers", type=int, default=Config.WORKERS,
+                        help="Processes to shard the folder across, each with its own model")
+    parser.add_argument("--watch", metavar="FOLDER",
+                        help="Keep running and process images as they are written to FOLDER "
+                             "(processed images are moved into its done folder)")
+    args = parser.parse_args()
+    if args.watch and args.workers > 1:
+        parser.error("--watch runs in a single process, it cannot be combined with --workers")
+    if args.watch and os.path.realpath(args.watch) == os.path.realpath(Config.TEST_IMAGES_PATH):
+        # Watch mode moves every processed image into a done folder, which would empty the dataset
+        parser.error("--watch cannot watch TEST_IMAGES_PATH, processed images are moved out of the folder")
+
+    # Initialize components; with several workers the model only lives in the worker processes
+    if args.workers > 1:
+        detector = ShardedDetector(args.workers, detector_kwargs(Config), Config.DETECTED_OBJECTS_DIR,
+                                   Config.CLASS_NAMES, Config.THREADS_PER_WORKER,
+                                   Config.BATCH_SIZE, Config.SHARD_SIZE, save_kwargs(Config))
+        result_cache = None
+    else:
+        detector = ObjectDetector(**detector_kwargs(Config))
+        result_cache = (ResultCache(Config.RESULT_CACHE_PATH, *detector.cache_identity(),
+                                    max_entries=Config.RESULT_CACHE_MAX_ENTRIES)
+                        if Config.RESULT_CACHE_PATH else None)
+    image_processor = ImageProcessor(Config.DETECTED_OBJECTS_DIR, Config.CLASS_NAMES, **save_kwargs(Config))
     gui = ClassificationGUI(Config.CLASS_NAMES, Config.FRAME_WIDTH, Config.FRAME_HEIGHT)
+    event_log = DetectionEventLog(Config.EVENT_LOG_PATH) if Config.EVENT_LOG_PATH else None
     
+    def detect_folder(folder=Config.TEST_IMAGES_PATH, batches=None):
+        """Yield (obj_class, saved_path) for every detection, streaming through the model in batches"""
+        if batches is not None:
+            # Streaming input from a FolderWatcher; the cache's SQLite handle stays on the main thread
+            results = ((filename, detections, image_processor.save_detections(image, filename, detections[0], detections[2]))
+                       for filename, image, detections in detector.detect_stream(batches))
+        elif args.workers > 1:
+            # Workers decode, detect and save; results come back in directory order
+            results = detector.detect_folder(folder)
+        else:
+            loader = ImageLoader(folder, Config.BATCH_SIZE,
+                                 Config.LOADER_WORKERS, Config.PREFETCH_BATCHES,
+                                 digests=result_cache is not None)
+            results = ((filename, detections, image_processor.save_detections(image, filename, detections[0], detections[2]))
+                       for filename, image, detections in detector.detect_stream(loader, result_cache))
+
+        for filename, (xyxy, confs, class_ids), saved in results:
+            if event_log is not None:
+                event_log.log(folder, class_ids, confs, xyxy, filename, block=True)
+            yield from saved
+
     def process_folder():
-        detected_files = []
-        
-        # Process each image in the test folder
-        for filename in os.listdir(Config.TEST_IMAGES_PATH):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                img_path = os.path.join(Config.TEST_IMAGES_PATH, filename)
-                image, class_ids = detector.detect_objects(img_path)
-                
-                # Save detected objects
-                for class_id in class_ids:
-                    if class_id < len(Config.CLASS_NAMES):
-                        obj_class = Config.CLASS_NAMES[class_id]
-                        saved_path = image_processor.save_detected_image(
-                            image, filename, obj_class)
-                        detected_files.append((obj_class, saved_path))
-        
+        registry.enabled = Config.METRICS_ENABLED
+        if Config.METRICS_ENABLED and Config.METRICS_HTTP_PORT:
+            registry.start_http_server(Config.METRICS_HTTP_PORT)
+
+        # Pick a random saved image per class (reservoir sampling) without
+        # holding every detection in memory
+        shown = {}
+        seen = {}
+        for obj_class, img_path in detect_folder():
+            seen[obj_class] = seen.get(obj_class, 0) + 1
+            if random.randrange(seen[obj_class]) == 0:
+                shown[obj_class] = img_path
+        image_processor.flush()
+
+        if event_log is not None:
+            event_log.close()
+        if result_cache is not None:
+            print(result_cache.stats_line())
+            registry.set_gauge('result_cache_hit_rate', result_cache.hit_rate)
+            result_cache.close()
+
+        if Config.METRICS_ENABLED and Config.METRICS_JSON_PATH:
+            registry.write_json(Config.METRICS_JSON_PATH)
+            print(f"Metrics snapshot written to {Config.METRICS_JSON_PATH}")
+
         # Display detected images
-        random.shuffle(detected_files)
-        for obj_class, img_path in detected_files:
+        for obj_class, img_path in shown.items():
             resized_img = image_processor.resize_image(
                 img_path, Config.FRAME_WIDTH, Config.FRAME_HEIGHT)
             gui.update_image(obj_class, resized_img)
     
+    def stream_folder(folder):
+        """Detect images as they land in folder on a background thread, showing the latest per class"""
+        registry.enabled = Config.METRICS_ENABLED
+        if Config.METRICS_ENABLED and Config.METRICS_HTTP_PORT:
+            registry.start_http_server(Config.METRICS_HTTP_PORT)
+
+        watcher = FolderWatcher(folder, Config.WATCH_POLL_INTERVAL, Config.WATCH_SETTLE_SECONDS,
+                                Config.WATCH_MAX_PENDING, Config.WATCH_DONE_DIR).start()
+        latest = {}  # class -> newest saved path not yet shown
+
+        def run():
+            batches = watcher.batches(Config.BATCH_SIZE, Config.WATCH_BATCH_WAIT, Config.LOADER_WORKERS)
+            for obj_class, img_path in detect_folder(folder, batches):
+                latest[obj_class] = img_path
+
+        worker = threading.Thread(target=run, name="watch-detect", daemon=True)
+        worker.start()
+        print(f"Watching {folder} for new images")
+
+        def refresh():
+            for obj_class in list(latest):
+                img_path = latest.pop(obj_class)
+                try:
+                    resized_img = image_processor.resize_image(
+                        img_path, Config.FRAME_WIDTH, Config.FRAME_HEIGHT)
+                except OSError:
+                    # Still being encoded; try again on the next refresh unless a newer one arrived
+                    latest.setdefault(obj_class, img_path)
+                    continue
+                gui.update_image(obj_class, resized_img)
+            gui.window.after(Config.WATCH_GUI_REFRESH_MS, refresh)
+
+        def stop():
+            watcher.stop()
+            worker.join(timeout=5.0)
+            if event_log is not None:
+                event_log.close()
+
+        refresh()
+        return stop
+
+    stop_streaming = None
+
     def cleanup():
+        if stop_streaming is not None:
+            stop_streaming()
+        image_processor.close()
         image_processor.cleanup_images()
         gui.window.destroy()
     
@@ -44,7 +150,10 @@ def main():
     gui.set_cleanup_handler(cleanup)
     
     # Process images and start GUI
-    process_folder()
+    if args.watch:
+        stop_streaming = stream_folder(args.watch)
+    else:
+        process_folder()
     gui.start()
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+# tests/test_folder_watcher.py
+import os
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from core.folder_watcher import FolderWatcher
+
+
+def write_images(folder, start, count):
+    image = np.zeros((8, 8, 3), dtype=np.uint8)
+    for i in range(start, start + count):
+        cv2.imwrite(os.path.join(folder, f"scan_{i:04d}.png"), image)
+
+
+def test_processed_files_leave_the_folder_and_the_watcher_state(tmp_path):
+    folder = str(tmp_path)
+    watcher = FolderWatcher(folder, poll_interval=0.05, settle_seconds=0.0, max_pending=4).start()
+    try:
+        batches = watcher.batches(batch_size=4, max_wait=0.05, workers=1)
+        received = []
+        for round_start in (0, 10):
+            write_images(folder, round_start, 10)
+            while len(received) < round_start + 10:
+                received.extend(name for name, _ in next(batches))
+    finally:
+        watcher.stop()
+    watcher._scan()  # one more pass prunes names that were moved since the last scan
+
+    assert sorted(received) == [f"scan_{i:04d}.png" for i in range(20)]
+    # Everything but the last batch (handed out, not yet confirmed handled) has been moved
+    remaining = {name for name in os.listdir(folder) if name.endswith(".png")}
+    assert len(remaining) <= 4
+    assert len(os.listdir(watcher.done_dir)) == 20 - len(remaining)
+    assert watcher._seen == remaining and not watcher._settling
+
+
+def test_archive_keeps_earlier_files_with_the_same_name(tmp_path):
+    folder = str(tmp_path)
+    watcher = FolderWatcher(folder)
+    for _ in range(3):
+        write_images(folder, 0, 1)
+        watcher._archive(["scan_0000.png"])
+    assert sorted(os.listdir(watcher.done_dir)) == ["scan_0000.png", "scan_0000_1.png", "scan_0000_2.png"]
+    assert not os.path.exists(os.path.join(folder, "scan_0000.png"))
@@ -0,0 +1,79 @@
+# tests/test_image_processor.py
+import os
+import threading
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from core.image_processor import ImageProcessor
+from detection_common.async_writer import AsyncImageWriter, crop_box
+
+CLASS_NAMES = ['hole', 'stain', 'tear']
+
+
+def image():
+    return np.full((100, 200, 3), 127, dtype=np.uint8)
+
+
+def stalled_writer(tmp_path, block):
+    """Writer with one thread held inside its first write's callback and room for one more queued image"""
+    release, started = threading.Event(), threading.Event()
+
+    def hold(path, size):
+        started.set()
+        release.wait(5)
+
+    writer = AsyncImageWriter(1, workers=1, block=block)
+    writer.submit(str(tmp_path / "first.png"), image(), on_written=hold)
+    started.wait(5)
+    writer.submit(str(tmp_path / "queued.png"), image())
+    return writer, release
+
+
+def test_crop_box_pads_and_clips():
+    frame = np.arange(100 * 200 * 3, dtype=np.uint8).reshape(100, 200, 3)
+    assert crop_box(frame, (10, 10, 30, 50), 0.5).shape == (70, 40, 3)
+    # Padding past the border is clipped, and the crop does not share the frame's memory
+    crop = crop_box(frame, (0, 0, 200, 100), 0.1)
+    assert crop.shape == frame.shape and not np.shares_memory(crop, frame)
+
+
+def test_full_queue_drops_unless_blocking(tmp_path):
+    writer, release = stalled_writer(tmp_path, block=False)
+    assert not writer.submit(str(tmp_path / "dropped.png"), image())
+    assert writer.dropped == 1
+    release.set()
+    writer.close()
+
+    writer, release = stalled_writer(tmp_path, block=True)
+    submitted = threading.Event()
+    threading.Thread(target=lambda: (writer.submit(str(tmp_path / "waited.png"), image()),
+                                     submitted.set()), daemon=True).start()
+    assert not submitted.wait(0.2)
+    release.set()
+    assert submitted.wait(5)
+    writer.flush()
+    assert os.path.exists(tmp_path / "waited.png") and writer.dropped == 0
+    writer.close()
+
+
+def test_frame_links_rerun_replaces_links(tmp_path):
+    processor = ImageProcessor(str(tmp_path), CLASS_NAMES, save_mode='frame_links', workers=2)
+    boxes, class_ids = [[0, 0, 10, 10], [20, 20, 40, 40]], [0, 2]
+    for _ in range(2):  # the second run overwrites the files of the first
+        saved = processor.save_detections(image(), "scan.jpg", boxes, class_ids)
+        processor.flush()
+    assert [name for name, _ in saved] == ['hole', 'tear']
+    paths = [path for _, path in saved]
+    assert os.path.samefile(*paths) or open(paths[0], 'rb').read() == open(paths[1], 'rb').read()
+    assert processor.writer.failed == 0
+    processor.close()
+
+
+def test_crops_mode_writes_one_file_per_box(tmp_path):
+    processor = ImageProcessor(str(tmp_path), CLASS_NAMES, save_mode='crops', crop_padding=0.0)
+    saved = processor.save_detections(image(), "scan.png", [[0, 0, 10, 20], [50, 50, 60, 60]], [1, 1])
+    processor.close()
+    assert [os.path.basename(path) for _, path in saved] == ["stain_scan_0.jpg", "stain_scan_1.jpg"]
+    assert cv2.imread(saved[0][1]).shape == (20, 10, 3)
@@ -0,0 +1,42 @@
+# tests/test_result_cache.py
+import itertools
+import numpy as np
+from core import result_cache
+from core.result_cache import ResultCache
+
+DETECTIONS = (np.array([[1, 2, 3, 4]], dtype=np.float32), np.array([0.5], dtype=np.float32), np.array([2]))
+
+
+class FakeClock:
+    """Strictly increasing time so LRU order does not depend on clock resolution"""
+
+    def __init__(self):
+        self._ticks = itertools.count(1)
+
+    def time(self):
+        return float(next(self._ticks))
+
+
+def test_round_trip_and_namespace(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path, "weights-a", {'imgsz': 640})
+    cache.put_many([("img1", DETECTIONS)])
+    xyxy, confs, class_ids = cache.get_many(["img1", "img2"])["img1"]
+    assert xyxy.tolist() == [[1, 2, 3, 4]] and confs.tolist() == [0.5] and class_ids.tolist() == [2]
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    # Different weights or settings never see the old entries
+    assert ResultCache(path, "weights-b", {'imgsz': 640}).get_many(["img1"]) == {}
+    assert ResultCache(path, "weights-a", {'imgsz': 320}).get_many(["img1"]) == {}
+    assert "img1" in ResultCache(path, "weights-a", {'imgsz': 640}).get_many(["img1"])
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'time', FakeClock())
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), "w", {}, max_entries=2)
+    cache.put_many([("a", DETECTIONS), ("b", DETECTIONS)])
+    cache.get_many(["a"])  # b is now the least recently used
+    cache.put_many([("c", DETECTIONS)])
+    assert cache.evict() == 1
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
@@ -0,0 +1,32 @@
+# tests/test_sharding.py
+import os
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from core import sharding
+from core.metrics import registry
+
+
+class StubDetector:
+    """ObjectDetector stand-in timing a fake predict stage like the real one does"""
+
+    def detect_batch_boxes(self, images):
+        registry.observe('predict', 0.01)
+        empty = (np.zeros((0, 4)), np.zeros(0), np.zeros(0, dtype=int))
+        return [empty for _ in images]
+
+
+def test_shard_returns_the_stage_timings_of_its_process(tmp_path, monkeypatch):
+    for i in range(3):
+        cv2.imwrite(str(tmp_path / f"scan_{i}.png"), np.zeros((8, 8, 3), dtype=np.uint8))
+    monkeypatch.setattr(sharding, '_detector', StubDetector())
+    monkeypatch.setattr(sharding, '_batch_size', 2)
+    registry.drain()
+
+    results, seconds, stages = sharding._detect_shard(str(tmp_path), sorted(os.listdir(tmp_path)))
+    assert len(results) == 3 and seconds > 0
+    assert len(stages['decode']) == 3 and stages['predict'] == [0.01, 0.01]
+    # Handed over, so the next shard of this worker does not report them again
+    assert registry.drain() == {}
@@ -0,0 +1,33 @@
+# tests/test_tiling.py
+import numpy as np
+from core.tiling import make_tiles, merge_tile_detections, nms, tile_origins
+
+
+def test_tiles_cover_the_image_edge_to_edge():
+    assert tile_origins(500, 640, 0.2) == [0]
+    origins = tile_origins(1500, 640, 0.2)
+    assert origins[0] == 0 and origins[-1] == 1500 - 640
+    assert all(b - a <= 640 for a, b in zip(origins, origins[1:]))
+    tiles = make_tiles(np.zeros((1000, 1500, 3), dtype=np.uint8), 640, 0.2)
+    assert all(tile.shape[:2] == (640, 640) for _, _, tile in tiles)
+
+
+def test_nms_suppresses_overlaps_within_a_class_only():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [0, 0, 10, 10], [50, 50, 60, 60]], dtype=float)
+    scores = np.array([0.9, 0.8, 0.7, 0.6])
+    class_ids = np.array([0, 0, 1, 0])
+    assert sorted(nms(boxes, scores, class_ids, 0.5).tolist()) == [0, 2, 3]
+
+
+def test_object_split_across_tiles_is_merged_once():
+    # The same object seen by two overlapping tiles, in tile coordinates
+    left = (0, 0, np.array([[500.0, 100.0, 600.0, 200.0]]), np.array([0.9]), np.array([3]))
+    right = (480, 0, np.array([[20.0, 101.0, 120.0, 201.0]]), np.array([0.8]), np.array([3]))
+    xyxy, confs, class_ids = merge_tile_detections([left, right], 0.5)
+    assert xyxy.tolist() == [[500.0, 100.0, 600.0, 200.0]]
+    assert confs.tolist() == [0.9] and class_ids.tolist() == [3]
+
+
+def test_no_tiles_gives_empty_arrays():
+    xyxy, confs, class_ids = merge_tile_detections([], 0.5)
+    assert xyxy.shape == (0, 4) and len(confs) == 0 and len(class_ids) == 0
@@ -0,0 +1,5 @@
+# detection_common/__init__.py
+"""Modules shared by the live e-waste app and the fabric folder app
+
+Installed from the repository root with `pip install -e .`.
+"""
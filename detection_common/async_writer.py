@@ -0,0 +1,134 @@
+# detection_common/async_writer.py
+import os
+import queue
+import shutil
+import threading
+from contextlib import nullcontext
+import cv2
+
+def link_or_copy(source, target):
+    """Hardlink target to source, copying where the filesystem has no hardlinks; replaces target"""
+    if os.path.lexists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+def crop_box(image, box, padding):
+    """Copy of the xyxy box grown by `padding` of its size on every side, clipped to the image"""
+    height, width = image.shape[:2]
+    x1, y1, x2, y2 = box
+    pad_x, pad_y = (x2 - x1) * padding, (y2 - y1) * padding
+    x1, y1 = max(0, int(x1 - pad_x)), max(0, int(y1 - pad_y))
+    x2, y2 = min(width, int(x2 + pad_x + 0.5)), min(height, int(y2 + pad_y + 0.5))
+    # Copy so the queued crop does not keep the whole image alive
+    return image[y1:max(y2, y1 + 1), x1:max(x2, x1 + 1)].copy()
+
+class AsyncImageWriter:
+    """Encodes and writes images on background threads behind a bounded queue
+
+    When the disk cannot keep up and the queue is full, submit() either
+    drops the write and counts it (block=False, so inference or render
+    threads never stall) or waits for room (block=True, for batch jobs
+    where every image must be written). cv2 releases the GIL while
+    encoding, so several worker threads encode JPEGs in parallel.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_queue, workers=1, jpeg_quality=95, block=False, registry=None):
+        """
+        Args:
+            max_queue: Images waiting to be written before submit() drops or blocks
+            workers: Encoding threads
+            jpeg_quality: cv2 JPEG quality (0-100) for .jpg/.jpeg paths
+            block: Wait for room in a full queue instead of dropping the image
+            registry: MetricsRegistry receiving 'save' timings and the queue depth gauge
+        """
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._counter_lock = threading.Lock()
+        self.jpeg_quality = jpeg_quality
+        self.block = block
+        self.registry = registry
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._threads = [threading.Thread(target=self._run, name=f"image-writer-{i}", daemon=True)
+                         for i in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path, image, on_written=None, links=()):
+        """
+        Queue an image for writing; returns False if it was dropped
+        Args:
+            on_written: Optional callable(path, size_bytes) run on the writer thread after a successful write
+            links: Further paths hardlinked to the written file (on_written is called for each)
+        """
+        item = (path, image, on_written, links)
+        if self.block:
+            self._queue.put(item)
+            return True
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+
+    def _count(self, name):
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                break
+            try:
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+            if self.registry is not None:
+                self.registry.set_gauge('save_queue_depth', self._queue.qsize())
+
+    def _write(self, path, image, on_written, links):
+        params = []
+        if path.lower().endswith(('.jpg', '.jpeg')):
+            params = [cv2.IMWRITE_JPEG_QUALITY, int(self.jpeg_quality)]
+        try:
+            with self.registry.time('save') if self.registry is not None else nullcontext():
+                ok = cv2.imwrite(path, image, params)
+            if ok:
+                self._count('written')
+                size = os.path.getsize(path)
+                if on_written is not None:
+                    on_written(path, size)
+                for link in links:
+                    link_or_copy(path, link)
+                    if on_written is not None:
+                        on_written(link, size)
+            else:
+                self._count('failed')
+                print(f"Error writing image {path}")
+        except Exception as e:
+            self._count('failed')
+            print(f"Error writing image {path}: {e}")
+
+    def pending(self):
+        """Number of images waiting to be written"""
+        return self._queue.qsize()
+
+    def flush(self):
+        """Wait until every image submitted so far has been written (or has failed)"""
+        self._queue.join()
+
+    def close(self, timeout=5.0):
+        """Write whatever is still queued, then stop the threads"""
+        for _ in self._threads:
+            self._queue.put(self._STOP)
+        for thread in self._threads:
+            thread.join(timeout)
@@ -0,0 +1,224 @@
+# detection_common/backends.py
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+
+# Backend name -> ultralytics export format (None loads the .pt weights directly)
+EXPORT_FORMATS = {
+    'pytorch': None,
+    'torchscript': 'torchscript',
+    'onnx': 'onnx',
+    'openvino': 'openvino',
+}
+
+# Formats whose exported graph can take a variable batch size
+DYNAMIC_FORMATS = ('onnx', 'openvino')
+
+# Manifest parity value for exports that were loaded but could not be compared, because
+# pytorch found nothing in the sample; re-checked whenever a sample image is configured
+UNVERIFIED = 'unverified'
+
+
+class InferenceBackend:
+    """YOLO model loaded either from .pt weights or from an exported artifact
+
+    Every backend goes through ultralytics' AutoBackend, so predict() returns
+    the same Results objects (boxes, classes, confidences) whatever runtime
+    executes the graph.
+    """
+
+    def __init__(self, name, model_path):
+        # Imported here so ultralytics/torch load only when a model is actually needed
+        from ultralytics import YOLO
+        self.name = name
+        self.model_path = model_path
+        self.model = YOLO(model_path, task='detect')
+
+    def predict(self, source, **kwargs):
+        """Run inference and return the list of ultralytics Results"""
+        return self.model.predict(source=source, save=False, show=False, **kwargs)
+
+
+def weights_digest(weights_path, chunk_size=1 << 20):
+    """SHA-256 of the weights file, used to key every cached artifact"""
+    digest = hashlib.sha256()
+    with open(weights_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_entry_dir(weights_path, cache_dir):
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(weights_path)), "model_cache")
+    return os.path.join(cache_dir, weights_digest(weights_path)[:16])
+
+
+def _read_manifest(entry_dir):
+    try:
+        with open(os.path.join(entry_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(entry_dir, manifest):
+    os.makedirs(entry_dir, exist_ok=True)
+    tmp_path = os.path.join(entry_dir, "manifest.json.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(entry_dir, "manifest.json"))
+
+
+def export_model(weights_path, name, imgsz, cache_dir=None):
+    """
+    Return (artifact_path, manifest_entry, entry_dir) for this backend, exporting only on a cache miss
+
+    Artifacts live in <cache_dir>/<weights sha256 prefix>/, so identical
+    weights are never exported twice and retrained weights never reuse a
+    stale export.
+    """
+    entry_dir = _cache_entry_dir(weights_path, cache_dir)
+    manifest = _read_manifest(entry_dir)
+    entry = manifest.get(name)
+    if entry and entry.get('imgsz') == imgsz:
+        path = os.path.join(entry_dir, entry['artifact'])
+        if os.path.exists(path):
+            return path, entry, entry_dir
+
+    from ultralytics import YOLO
+    fmt = EXPORT_FORMATS[name]
+    print(f"Exporting {weights_path} to {fmt}, this only happens once per weights file")
+    exported = str(YOLO(weights_path).export(format=fmt, imgsz=imgsz, dynamic=fmt in DYNAMIC_FORMATS))
+
+    # ultralytics writes next to the weights; move the artifact into the cache entry
+    os.makedirs(entry_dir, exist_ok=True)
+    artifact = os.path.basename(os.path.normpath(exported))
+    path = os.path.join(entry_dir, artifact)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    shutil.move(exported, path)
+
+    entry = {'artifact': artifact, 'imgsz': imgsz, 'parity': None}
+    manifest[name] = entry
+    _write_manifest(entry_dir, manifest)
+    return path, entry, entry_dir
+
+
+def _result_arrays(result):
+    boxes = result.boxes
+    xyxy = boxes.xyxy.cpu().numpy()
+    cls = boxes.cls.cpu().numpy().astype(int)
+    conf = boxes.conf.cpu().numpy()
+    order = np.lexsort((-conf, cls))
+    return xyxy[order], cls[order], conf[order]
+
+
+def compare_results(reference, candidate, box_tolerance, conf_tolerance):
+    """Return None if two Results agree within tolerance, else a description of the mismatch"""
+    ref_xyxy, ref_cls, ref_conf = _result_arrays(reference)
+    cand_xyxy, cand_cls, cand_conf = _result_arrays(candidate)
+
+    if len(ref_cls) != len(cand_cls):
+        return f"{len(ref_cls)} boxes from pytorch vs {len(cand_cls)}"
+    if not np.array_equal(ref_cls, cand_cls):
+        return "class ids differ"
+    if len(ref_cls) == 0:
+        return None
+
+    box_error = float(np.abs(ref_xyxy - cand_xyxy).max())
+    conf_error = float(np.abs(ref_conf - cand_conf).max())
+    if box_error > box_tolerance:
+        return f"box coordinates differ by up to {box_error:.2f}px"
+    if conf_error > conf_tolerance:
+        return f"confidences differ by up to {conf_error:.3f}"
+    return None
+
+
+def _parity_sample(sample_path, imgsz):
+    if sample_path:
+        import cv2
+        image = cv2.imread(sample_path)
+        if image is not None:
+            return image
+        print(f"Warning: could not read parity sample {sample_path}, using a synthetic frame")
+    # Deterministic textured frame so the comparison is repeatable between runs
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(imgsz, imgsz, 3), dtype=np.uint8)
+
+
+def _resolve(weights_path, name, imgsz, parity_sample, box_tolerance, conf_tolerance, cache_dir):
+    """(backend name, model path, backend loaded by the parity check or None)"""
+    if name not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid inference backend. Choose from: {list(EXPORT_FORMATS.keys())}")
+    if EXPORT_FORMATS[name] is None:
+        return name, weights_path, None
+
+    path, entry, entry_dir = export_model(weights_path, name, imgsz, cache_dir)
+    parity = entry.get('parity')
+    if parity is False:
+        print(f"Warning: {name} export previously failed the parity check, using pytorch")
+        return 'pytorch', weights_path, None
+    if parity is True:
+        return name, path, None
+    if parity == UNVERIFIED and not parity_sample:
+        print(f"Warning: {name} export has not been verified against pytorch, "
+              f"configure a parity sample image that contains objects")
+        return name, path, None
+
+    backend = InferenceBackend(name, path)
+    reference = InferenceBackend('pytorch', weights_path)
+    sample = _parity_sample(parity_sample, imgsz)
+    expected = reference.predict(sample, imgsz=imgsz)[0]
+    if len(expected.boxes) == 0:
+        # Two empty results agree trivially; that proves nothing about the export
+        status, mismatch = UNVERIFIED, None
+    else:
+        mismatch = compare_results(expected, backend.predict(sample, imgsz=imgsz)[0],
+                                   box_tolerance, conf_tolerance)
+        status = mismatch is None
+    manifest = _read_manifest(entry_dir)
+    manifest.setdefault(name, entry)['parity'] = status
+    _write_manifest(entry_dir, manifest)
+    if mismatch is not None:
+        print(f"Warning: {name} backend failed the parity check ({mismatch}), using pytorch")
+        return 'pytorch', weights_path, reference
+    if status == UNVERIFIED:
+        print(f"Warning: pytorch found no objects in the parity sample, so the {name} export is unverified; "
+              f"configure a parity sample image that contains objects")
+    else:
+        print(f"{name} backend matches pytorch output")
+    return name, path, backend
+
+
+def resolve_backend(weights_path, name='pytorch', imgsz=640, parity_sample=None,
+                    box_tolerance=2.0, conf_tolerance=0.02, cache_dir=None):
+    """
+    Export and parity-check a backend once, so several processes can then load the result
+    Arguments as for load_backend.
+    Returns:
+        (backend name, model path) for InferenceBackend; falls back to ('pytorch', weights_path)
+    """
+    name, path, _ = _resolve(weights_path, name, imgsz, parity_sample, box_tolerance, conf_tolerance, cache_dir)
+    return name, path
+
+
+def load_backend(weights_path, name='pytorch', imgsz=640, parity_sample=None,
+                 box_tolerance=2.0, conf_tolerance=0.02, cache_dir=None):
+    """
+    Load the configured inference backend for a .pt weights file
+    Args:
+        weights_path: Trained ultralytics weights (best.pt)
+        name: One of EXPORT_FORMATS
+        imgsz: Input size used when exporting
+        parity_sample: Image containing objects, checked against PyTorch the first time an export is used
+            (without one a synthetic frame is tried, which usually leaves the export unverified)
+        box_tolerance: Max allowed box coordinate difference in pixels
+        conf_tolerance: Max allowed confidence difference
+        cache_dir: Where exported artifacts are kept (defaults to model_cache/ next to the weights)
+    """
+    name, path, backend = _resolve(weights_path, name, imgsz, parity_sample, box_tolerance,
+                                   conf_tolerance, cache_dir)
+    return backend if backend is not None else InferenceBackend(name, path)
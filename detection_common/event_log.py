@@ -0,0 +1,195 @@
+# detection_common/event_log.py
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+
+
+class EventLogReader:
+    """Read-only queries over a detection event log database"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: SQLite database file written by DetectionEventLog; it must already exist
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"No event log database at {path}")
+        self.path = path
+        self._uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+
+    def query(self, start=None, end=None, class_ids=None, source=None, limit=None):
+        """Detections in [start, end) as (ts, source, class_id, conf, x1, y1, x2, y2, frame_ref) rows"""
+        sql = "SELECT * FROM events WHERE 1=1"
+        params = []
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts < ?"
+            params.append(end)
+        if class_ids is not None:
+            class_ids = list(class_ids)
+            sql += f" AND class_id IN ({','.join('?' * len(class_ids))})"
+            params.extend(class_ids)
+        if source is not None:
+            sql += " AND source = ?"
+            params.append(source)
+        sql += " ORDER BY ts"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._read(sql, params)
+
+    def class_counts(self, start=None, end=None, source=None):
+        """{class_id: detections} within [start, end)"""
+        sql = "SELECT class_id, COUNT(*) FROM events WHERE 1=1"
+        params = []
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts < ?"
+            params.append(end)
+        if source is not None:
+            sql += " AND source = ?"
+            params.append(source)
+        sql += " GROUP BY class_id"
+        return dict(self._read(sql, params))
+
+    def hourly_counts(self, start=None, end=None, class_ids=None, source=None):
+        """(hour_start_ts, class_id, count) rows for shift reports"""
+        sql = "SELECT CAST(ts / 3600 AS INTEGER) * 3600 AS hour, class_id, COUNT(*) FROM events WHERE 1=1"
+        params = []
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts < ?"
+            params.append(end)
+        if class_ids is not None:
+            class_ids = list(class_ids)
+            sql += f" AND class_id IN ({','.join('?' * len(class_ids))})"
+            params.extend(class_ids)
+        if source is not None:
+            sql += " AND source = ?"
+            params.append(source)
+        sql += " GROUP BY hour, class_id ORDER BY hour, class_id"
+        return self._read(sql, params)
+
+    def _read(self, sql, params):
+        # Read-only, so queries never create or modify the database
+        db = sqlite3.connect(self._uri, uri=True, timeout=30)
+        try:
+            return db.execute(sql, params).fetchall()
+        finally:
+            db.close()
+
+
+class DetectionEventLog(EventLogReader):
+    """Append-only log of every detection in a SQLite database in WAL mode
+
+    log() only enqueues and by default never blocks the caller; a writer thread drains
+    the queue and inserts rows in batched transactions (row groups) of up to
+    batch_size rows or every flush_interval seconds, whichever comes first.
+    Readers use their own connection, which WAL lets run alongside the writer.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path, batch_size=500, flush_interval=1.0, max_queue=10000):
+        """
+        Args:
+            path: SQLite database file
+            batch_size: Rows per insert transaction
+            flush_interval: Longest time in seconds a row waits before being committed
+            max_queue: Frames that may wait for the writer before new ones are dropped
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.rows_written = 0
+        self.frames_dropped = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        db = self._connect()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "ts REAL NOT NULL, source TEXT, class_id INTEGER NOT NULL, conf REAL, "
+            "x1 REAL, y1 REAL, x2 REAL, y2 REAL, frame_ref TEXT)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_events_class_ts ON events(class_id, ts)")
+        db.commit()
+        db.close()
+        super().__init__(path)
+
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def log(self, source, class_ids, confs, boxes, frame_ref=None, timestamp=None, block=False):
+        """
+        Queue every detection of one frame; returns False if the frame was dropped
+        Args:
+            source: Camera or folder the frame came from
+            class_ids: (N,) class ids
+            confs: (N,) confidences
+            boxes: (N, 4) xyxy boxes in frame coordinates
+            frame_ref: Saved image path or other frame identifier
+            timestamp: Capture time (defaults to now)
+            block: Wait for queue space instead of dropping (for batch jobs that must not lose rows)
+        """
+        if len(class_ids) == 0:
+            return True
+        ts = time.time() if timestamp is None else timestamp
+        rows = [(ts, source, int(c), float(p), float(b[0]), float(b[1]), float(b[2]), float(b[3]), frame_ref)
+                for c, p, b in zip(class_ids, confs, boxes)]
+        try:
+            self._queue.put(rows, block=block)
+            return True
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+
+    def _run(self):
+        db = self._connect()
+        pending = []
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is self._STOP:
+                    stopping = True
+                else:
+                    pending.extend(item)
+                    if deadline is None:
+                        deadline = time.time() + self.flush_interval
+            except queue.Empty:
+                pass
+
+            if pending and (stopping or len(pending) >= self.batch_size or time.time() >= deadline):
+                try:
+                    with db:
+                        db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", pending)
+                    self.rows_written += len(pending)
+                except sqlite3.Error as e:
+                    print(f"Error writing {len(pending)} detection events: {e}")
+                pending = []
+                deadline = None
+        db.close()
+
+    def close(self, timeout=5.0):
+        """Commit everything still queued and stop the writer thread"""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
@@ -0,0 +1,233 @@
+# detection_common/metrics.py
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RollingHistogram:
+    """Latency samples over the last `window` observations plus lifetime totals"""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def quantiles(self, quantiles=QUANTILES):
+        """Nearest-rank quantiles of the current window (seconds)"""
+        if not self.samples:
+            return {q: 0.0 for q in quantiles}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(round(q * last)))] for q in quantiles}
+
+
+class FpsCounter:
+    """Events per second over a sliding time window"""
+
+    def __init__(self, window_seconds):
+        self.window_seconds = window_seconds
+        self.events = deque()
+        self.count = 0
+
+    def tick(self, now=None):
+        now = time.time() if now is None else now
+        self.events.append(now)
+        self.count += 1
+        self._trim(now)
+
+    def _trim(self, now):
+        while self.events and now - self.events[0] > self.window_seconds:
+            self.events.popleft()
+
+    def rate(self, now=None):
+        now = time.time() if now is None else now
+        self._trim(now)
+        if len(self.events) < 2:
+            return 0.0
+        span = now - self.events[0]
+        return (len(self.events) - 1) / span if span > 0 else 0.0
+
+
+class MetricsRegistry:
+    """Thread-safe stage timings, FPS counters and gauges with Prometheus/JSON export"""
+
+    def __init__(self, prefix, window=1024, fps_window_seconds=5.0):
+        """
+        Args:
+            prefix: Metric name prefix in the Prometheus output
+            window: Samples kept per stage for the rolling quantiles
+            fps_window_seconds: Time window the FPS counters average over
+        """
+        self.prefix = prefix
+        self.window = window
+        self.fps_window_seconds = fps_window_seconds
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._fps = {}
+        self._gauges = {}
+        self.enabled = True
+
+    def observe(self, stage, seconds):
+        """Record one duration for a stage"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = RollingHistogram(self.window)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        """Context manager timing the enclosed block as one observation of stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def tick(self, counter):
+        """Count one event (frame, image, ...) for an FPS counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            fps = self._fps.get(counter)
+            if fps is None:
+                fps = self._fps[counter] = FpsCounter(self.fps_window_seconds)
+            fps.tick()
+
+    def set_gauge(self, name, value):
+        """Set a point-in-time value such as a queue depth or skip ratio"""
+        with self._lock:
+            self._gauges[name] = float(value)
+
+    def fps(self, counter):
+        with self._lock:
+            fps = self._fps.get(counter)
+            return fps.rate() if fps else 0.0
+
+    def drain(self):
+        """Remove and return every stage's samples as {stage: [seconds, ...]}
+
+        Lets a worker process hand its timings to the parent, which replays
+        them with observe(). Only the last `window` samples per stage are
+        kept between drains.
+        """
+        with self._lock:
+            stages, self._stages = self._stages, {}
+        return {stage: list(histogram.samples) for stage, histogram in stages.items()}
+
+    def stage_quantiles(self, stage):
+        """{quantile: seconds} for one stage, zeros if it has no samples yet"""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            return histogram.quantiles() if histogram else {q: 0.0 for q in QUANTILES}
+
+    def snapshot(self):
+        """Plain dict of every metric, latencies in milliseconds"""
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._stages.items():
+                quantiles = histogram.quantiles()
+                stages[stage] = {
+                    'count': histogram.count,
+                    'mean_ms': 1000 * histogram.total / histogram.count if histogram.count else 0.0,
+                    **{f"p{int(q * 100)}_ms": 1000 * v for q, v in quantiles.items()},
+                }
+            return {
+                'timestamp': time.time(),
+                'stages': stages,
+                'fps': {name: fps.rate() for name, fps in self._fps.items()},
+                'counts': {name: fps.count for name, fps in self._fps.items()},
+                'gauges': dict(self._gauges),
+            }
+
+    def prometheus_text(self):
+        """Render the registry in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        with self._lock:
+            stages = {name: (h.quantiles(), h.total, h.count) for name, h in self._stages.items()}
+
+        p = self.prefix
+        lines = [f"# HELP {p}_stage_latency_seconds Rolling per-stage latency",
+                 f"# TYPE {p}_stage_latency_seconds summary"]
+        for stage, (quantiles, total, count) in sorted(stages.items()):
+            for q, value in quantiles.items():
+                lines.append(f'{p}_stage_latency_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{p}_stage_latency_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{p}_stage_latency_seconds_count{{stage="{stage}"}} {count}')
+
+        lines += [f"# HELP {p}_fps Events per second over the last window",
+                  f"# TYPE {p}_fps gauge"]
+        lines += [f'{p}_fps{{counter="{name}"}} {value:.3f}' for name, value in sorted(snapshot['fps'].items())]
+        lines += [f"# HELP {p}_events_total Events counted since start",
+                  f"# TYPE {p}_events_total counter"]
+        lines += [f'{p}_events_total{{counter="{name}"}} {value}' for name, value in sorted(snapshot['counts'].items())]
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines += [f"# TYPE {p}_{name} gauge", f"{p}_{name} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        """Atomically write the current snapshot as JSON"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def start_http_server(self, port, host='127.0.0.1'):
+        """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread"""
+        # http.server pulls in email and friends (~40 ms), so it is only imported when serving
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body = registry.prometheus_text().encode()
+                    content_type = 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body = json.dumps(registry.snapshot()).encode()
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep scrapes out of the console
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"Serving metrics on http://{host}:{port}/metrics")
+        return server
+
+    def start_snapshot_writer(self, path, interval):
+        """Rewrite the JSON snapshot file every `interval` seconds from a daemon thread"""
+        stop_event = threading.Event()
+
+        def loop():
+            while not stop_event.wait(interval):
+                try:
+                    self.write_json(path)
+                except OSError as e:
+                    print(f"Error writing metrics snapshot {path}: {e}")
+
+        threading.Thread(target=loop, name="metrics-snapshot", daemon=True).start()
+        return stop_event
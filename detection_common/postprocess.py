@@ -0,0 +1,89 @@
+# detection_common/postprocess.py
+from collections import namedtuple
+import numpy as np
+
+
+class Detections(namedtuple('Detections', ['xyxy', 'confs', 'class_ids'])):
+    """Boxes of one image as parallel numpy arrays: (N, 4) xyxy, (N,) confs, (N,) int class ids"""
+
+    __slots__ = ()
+
+    def counts(self, num_classes):
+        """Boxes per class id as a (num_classes,) array"""
+        return np.bincount(self.class_ids, minlength=num_classes)
+
+    def present_ids(self):
+        """Frozen set of the class ids present, for O(1) membership checks"""
+        return frozenset(np.unique(self.class_ids).tolist())
+
+
+class PostProcessor:
+    """Vectorised filtering of raw model output
+
+    Drops boxes whose class id is unknown, not in the allow-list, or below
+    that class's confidence threshold, all as boolean masks over the arrays.
+    """
+
+    def __init__(self, class_names, conf_thresholds=None, default_conf=0.0, allowed_classes=None):
+        """
+        Args:
+            class_names: Class names indexed by class id
+            conf_thresholds: {class_name: minimum confidence} overriding default_conf
+            default_conf: Minimum confidence for classes without their own threshold
+            allowed_classes: Class names to keep (None keeps every class)
+        """
+        self.class_names = list(class_names)
+        index = {name: class_id for class_id, name in enumerate(self.class_names)}
+        self.thresholds = np.full(len(self.class_names), default_conf, dtype=np.float32)
+        for name, conf in (conf_thresholds or {}).items():
+            if name in index:
+                self.thresholds[index[name]] = conf
+            else:
+                print(f"Warning: confidence threshold for unknown class {name} ignored")
+        self.allowed = np.ones(len(self.class_names), dtype=bool)
+        if allowed_classes is not None:
+            self.allowed[:] = False
+            self.allowed[[index[name] for name in allowed_classes if name in index]] = True
+
+    @property
+    def num_classes(self):
+        return len(self.class_names)
+
+    def __call__(self, xyxy, confs, class_ids, apply_thresholds=True):
+        """
+        Filter one image's arrays into Detections
+        Args:
+            apply_thresholds: False keeps low-confidence boxes (e.g. for the tracker's second association)
+        """
+        class_ids = np.asarray(class_ids).astype(np.int64, copy=False)
+        confs = np.asarray(confs, dtype=np.float32)
+        xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        known = (class_ids >= 0) & (class_ids < self.num_classes)
+        safe_ids = np.where(known, class_ids, 0)
+        keep = known & self.allowed[safe_ids]
+        if apply_thresholds:
+            keep &= confs >= self.thresholds[safe_ids]
+        if keep.all():
+            return Detections(xyxy, confs, class_ids)
+        return Detections(xyxy[keep], confs[keep], class_ids[keep])
+
+    def threshold(self, detections):
+        """Detections that pass their class's confidence threshold (for ones filtered without it)"""
+        keep = detections.confs >= self.thresholds[detections.class_ids]
+        if keep.all():
+            return detections
+        return Detections(detections.xyxy[keep], detections.confs[keep], detections.class_ids[keep])
+
+    def from_result(self, result, apply_thresholds=True):
+        """Filter an ultralytics Results object into Detections"""
+        boxes = result.boxes
+        return self(boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(),
+                    boxes.cls.cpu().numpy(), apply_thresholds)
+
+    def names(self, detections):
+        """Class name of every box, in box order"""
+        return [self.class_names[class_id] for class_id in detections.class_ids.tolist()]
+
+    def present_names(self, detections):
+        """Frozen set of the class names present"""
+        return frozenset(self.class_names[class_id] for class_id in detections.present_ids())
@@ -14,3 +14,8 @@ class TrainingConfig:
     
     # Device configuration
     FORCE_CPU = False  # Set to True to force CPU usage even if CUDA is available
+    
+    # Post-training INT8 quantization
+    QUANTIZE_AFTER_TRAINING = False  # Set to True to quantize best.pt once training finishes
+    QUANT_CALIBRATION_FRACTION = 0.1  # Share of the validation split used for calibration
+    QUANT_REPORT_NAME = "quantization_report.json"  # Written next to best.pt
@@ -1,6 +1,7 @@
 # main.py
 from utils.device_manager import DeviceManager
 from trainer.yolo_trainer import YOLOTrainer
+from trainer.yolo_quantizer import YOLOQuantizer
 from config.training_config import TrainingConfig
 
 def main():
@@ -19,7 +20,11 @@ def main():
         # Process results if needed
         if results:
             print("Training completed successfully!")
-            # Add any additional results processing here
+
+            # Optionally build an INT8 model and compare it with the FP32 baseline
+            best_weights = trainer.get_best_weights()
+            if TrainingConfig.QUANTIZE_AFTER_TRAINING and best_weights:
+                YOLOQuantizer(TrainingConfig).run(best_weights)
             
     except Exception as e:
         print(f"An error occurred during execution: {str(e)}")
@@ -0,0 +1,20 @@
+# quantize.py
+import argparse
+import logging
+from trainer.yolo_quantizer import YOLOQuantizer
+from config.training_config import TrainingConfig
+
+def main():
+    """Quantize an existing best.pt without retraining."""
+    parser = argparse.ArgumentParser(description="INT8 post-training quantization for trained YOLO weights")
+    parser.add_argument("weights", help="Path to the FP32 best.pt to quantize")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    YOLOQuantizer(TrainingConfig).run(args.weights)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# trainer/yolo_quantizer.py
+import json
+import logging
+import os
+from ultralytics import YOLO
+from config.training_config import TrainingConfig
+
+class YOLOQuantizer:
+    """Builds a static INT8 model from trained weights and measures it against FP32."""
+
+    def __init__(self, config: TrainingConfig):
+        """
+        Initialize the quantizer with configuration settings.
+
+        Args:
+            config: Training configuration object
+        """
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+    def quantize(self, weights_path):
+        """
+        Export weights to an INT8 OpenVINO model.
+
+        Calibration is static: activation ranges are collected by running a
+        fraction of the DATA_YAML_PATH validation split through the model.
+
+        Args:
+            weights_path: Path to the FP32 best.pt produced by training
+
+        Returns:
+            Path to the exported INT8 model directory
+        """
+        try:
+            self.logger.info(f"Quantizing {weights_path} to INT8")
+            self.logger.info(f"Calibration data: {self.config.DATA_YAML_PATH} "
+                             f"(fraction {self.config.QUANT_CALIBRATION_FRACTION} of the validation split)")
+            path = YOLO(weights_path).export(
+                format='openvino',
+                int8=True,
+                data=self.config.DATA_YAML_PATH,
+                fraction=self.config.QUANT_CALIBRATION_FRACTION,
+                imgsz=self.config.IMAGE_SIZE
+            )
+            self.logger.info(f"INT8 model written to {path}")
+            return str(path)
+        except Exception as e:
+            self.logger.error(f"Error during quantization: {str(e)}")
+            raise
+
+    def evaluate(self, model_path):
+        """
+        Validate a model on the validation split on CPU.
+
+        Args:
+            model_path: FP32 weights or exported INT8 model
+
+        Returns:
+            Dictionary with mAP scores and per-image latency in milliseconds
+        """
+        metrics = YOLO(model_path, task='detect').val(
+            data=self.config.DATA_YAML_PATH,
+            split='val',
+            imgsz=self.config.IMAGE_SIZE,
+            batch=1,
+            device='cpu',
+            plots=False
+        )
+        return {
+            'model': str(model_path),
+            'map50': float(metrics.box.map50),
+            'map50_95': float(metrics.box.map),
+            'latency_ms': {stage: float(ms) for stage, ms in metrics.speed.items()},
+        }
+
+    def build_report(self, weights_path, int8_path):
+        """
+        Compare the INT8 model with the FP32 baseline and write a JSON report.
+
+        Args:
+            weights_path: FP32 best.pt
+            int8_path: Exported INT8 model
+
+        Returns:
+            The report dictionary
+        """
+        fp32 = self.evaluate(weights_path)
+        int8 = self.evaluate(int8_path)
+        report = {
+            'fp32': fp32,
+            'int8': int8,
+            'map50_delta': int8['map50'] - fp32['map50'],
+            'map50_95_delta': int8['map50_95'] - fp32['map50_95'],
+            'inference_speedup': (fp32['latency_ms']['inference'] / int8['latency_ms']['inference']
+                                  if int8['latency_ms'].get('inference') else None),
+        }
+
+        report_path = os.path.join(os.path.dirname(os.path.abspath(weights_path)),
+                                   self.config.QUANT_REPORT_NAME)
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        self.logger.info("Quantization report (CPU, batch 1):")
+        for name in ('fp32', 'int8'):
+            result = report[name]
+            self.logger.info(f"  {name}: mAP50 {result['map50']:.4f}, mAP50-95 {result['map50_95']:.4f}, "
+                             f"inference {result['latency_ms'].get('inference', 0):.1f} ms/image")
+        self.logger.info(f"  mAP50-95 delta: {report['map50_95_delta']:+.4f}")
+        if report['inference_speedup']:
+            self.logger.info(f"  Inference speedup: {report['inference_speedup']:.2f}x")
+        self.logger.info(f"Report written to {report_path}")
+        return report
+
+    def run(self, weights_path):
+        """Quantize the weights and report INT8 vs FP32 accuracy and latency."""
+        int8_path = self.quantize(weights_path)
+        return self.build_report(weights_path, int8_path)
@@ -61,4 +61,11 @@ class YOLOTrainer:
             
         except Exception as e:
             self.logger.error(f"Error during training: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    def get_best_weights(self):
+        """Return the path of the best.pt written by the last training run."""
+        trainer = getattr(self.model, 'trainer', None)
+        if trainer is None or not getattr(trainer, 'best', None):
+            return None
+        return str(trainer.best)